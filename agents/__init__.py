@@ -1,24 +1,30 @@
 """
 TANGO Multi-Agent Pipeline - Agents Package
+
+The orchestrator entry points are loaded lazily: each name below is imported from its
+module on first use, so entry points only pay for the agents (and strands, boto3,
+requests) they use. Agent tools share their module's name and are imported from it,
+e.g. `from agents.discovery_agent import discovery_agent`.
 """
 
-from .discovery_agent import discovery_agent
-from .documentation_agent import documentation_agent
-from .terraform_agent import terraform_agent
-from .terraform_cleanup_agent import terraform_cleanup_agent
-from .validation_agent import validation_agent
-from .storage_agent import storage_agent
-from .cleanup_agent import cleanup_agent
-from .orchestrator_agent import orchestrator, run_pipeline
+import importlib
+
+_REGISTRY = {
+    'orchestrator': '.orchestrator_agent',
+    'run_pipeline': '.orchestrator_agent',
+    'run_resource': '.orchestrator_agent',
+    'run_batch': '.orchestrator_agent'
+}
+
+__all__ = list(_REGISTRY)
+
+def __getattr__(name):
+    module_name = _REGISTRY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-__all__ = [
-    'discovery_agent',
-    'documentation_agent', 
-    'terraform_agent',
-    'terraform_cleanup_agent',
-    'validation_agent',
-    'storage_agent',
-    'cleanup_agent',
-    'orchestrator',
-    'run_pipeline'
-]
+def __dir__():
+    return sorted(set(globals()) | set(_REGISTRY))
@@ -0,0 +1,151 @@
+"""
+TANGO Multi-Agent Pipeline - Agent Factory
+Reusable agents backed by a shared model client, boto3 session and client pool
+"""
+
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+import boto3
+from botocore.config import Config
+from strands import Agent
+from strands.models import BedrockModel, Model
+import config
+from .budget import BudgetHooks, current_budgets
+from .model_replay import wrap_model
+from .tracing import TracingHooks, current_stage, current_trace, record_agent_span
+
+_lock = threading.Lock()
+_session: Optional[boto3.Session] = None
+_clients: Dict[Tuple[str, str], object] = {}
+_model: Optional[Model] = None
+_idle_agents: Dict[Tuple, List[Agent]] = {}
+_agent_hooks: "weakref.WeakKeyDictionary[Agent, TracingHooks]" = weakref.WeakKeyDictionary()
+_budget_hooks: "weakref.WeakKeyDictionary[Agent, BudgetHooks]" = weakref.WeakKeyDictionary()
+
+def _client_config() -> Config:
+    return Config(
+        max_pool_connections=config.AWS_MAX_POOL_CONNECTIONS,
+        retries={'max_attempts': 10, 'mode': 'adaptive'}
+    )
+
+def get_session() -> boto3.Session:
+    """Return the process-wide boto3 session."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = boto3.Session(region_name=config.AWS_REGION)
+        return _session
+
+def get_client(service: str, region: Optional[str] = None):
+    """
+    Return a shared boto3 client for a service and region.
+
+    Clients are created once under a lock (sessions are not thread-safe) and then
+    shared freely, so connections and credentials are reused across calls.
+    """
+    region = region or config.AWS_REGION
+    session = get_session()
+    with _lock:
+        key = (service, region)
+        if key not in _clients:
+            _clients[key] = session.client(service, region_name=region, config=_client_config())
+        return _clients[key]
+
+def get_model() -> Model:
+    """Return the shared Bedrock model client (with record/replay if enabled) used by every agent."""
+    global _model
+    session = get_session()
+    with _lock:
+        if _model is None:
+            model_config = {'model_id': config.BEDROCK_MODEL_ID} if config.BEDROCK_MODEL_ID else {}
+            _model = wrap_model(BedrockModel(
+                boto_session=session,
+                boto_client_config=_client_config(),
+                **model_config
+            ))
+        return _model
+
+def set_model(model) -> None:
+    """Replace the shared model client, e.g. with a scripted model for offline benchmarks."""
+    global _model
+    with _lock:
+        _model = model
+
+def create_agent(name: str, system_prompt: str, tools: Optional[list] = None, hooks: Optional[list] = None) -> Agent:
+    """Create an agent that uses the shared model client, records tracing spans and charges budgets."""
+    tracing_hooks = TracingHooks(name)
+    tracing_hooks.bind(current_trace(), current_stage() or name)
+    budget_hooks = BudgetHooks()
+    budget_hooks.bind(current_budgets())
+    agent = Agent(
+        model=get_model(),
+        system_prompt=system_prompt,
+        tools=tools or [],
+        name=name,
+        hooks=[*(hooks or []), tracing_hooks, budget_hooks]
+    )
+    _agent_hooks[agent] = tracing_hooks
+    _budget_hooks[agent] = budget_hooks
+    return agent
+
+def _reset_conversation(agent: Agent) -> None:
+    """Clear per-call conversation state so a pooled agent starts fresh."""
+    agent.messages = []
+    try:
+        from strands.telemetry.metrics import EventLoopMetrics
+        agent.event_loop_metrics = EventLoopMetrics()
+    except ImportError:
+        pass
+
+def _pool_key(name: str, system_prompt: str, tools: list, hooks: list) -> Tuple:
+    tool_names = tuple(getattr(t, 'tool_name', None) or getattr(t, '__name__', repr(t)) for t in tools)
+    return name, system_prompt, tool_names, tuple(id(hook) for hook in hooks)
+
+@contextmanager
+def checkout_agent(name: str, system_prompt: str, tools: Optional[list] = None,
+                   hooks: Optional[list] = None) -> Iterator[Agent]:
+    """
+    Check out a pooled agent for one call.
+
+    Agents are not safe for concurrent use, so each checkout gets exclusive access to
+    an idle agent (or a new one) whose conversation has been reset.
+
+    Args:
+        name: Agent name
+        system_prompt: System prompt for the agent
+        tools: Tools available to the agent
+        hooks: Extra hook providers for the agent (shared by every pooled instance)
+
+    Yields:
+        An agent with an empty conversation
+    """
+    tools = tools or []
+    hooks = hooks or []
+    key = _pool_key(name, system_prompt, tools, hooks)
+    with _lock:
+        idle = _idle_agents.get(key)
+        agent = idle.pop() if idle else None
+
+    if agent is None:
+        agent = create_agent(name, system_prompt, tools, hooks)
+    _reset_conversation(agent)
+
+    # Spans recorded by the agent's hooks attach to the caller's trace and stage
+    trace, stage = current_trace(), current_stage() or name
+    _agent_hooks[agent].bind(trace, stage)
+    _budget_hooks[agent].bind(current_budgets())
+    start = time.time()
+    status = 'ok'
+    try:
+        yield agent
+    except Exception:
+        status = 'error'
+        raise
+    finally:
+        record_agent_span(name, agent, start, status, trace=trace, stage=stage)
+        _reset_conversation(agent)
+        with _lock:
+            _idle_agents.setdefault(key, []).append(agent)
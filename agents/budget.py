@@ -0,0 +1,240 @@
+"""
+TANGO Multi-Agent Pipeline - Budgets
+Wall-clock, token and apply-attempt limits per stage and per resource, charged by an
+agent hook that ends a stage's fix loop once a limit is exhausted
+"""
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Tuple
+import config
+from .hooks import (
+    HookProvider, HookRegistry, AfterInvocationEvent, BeforeModelCallEvent, BeforeToolCallEvent
+)
+
+BUDGET_EXHAUSTED = 'budget_exhausted'
+
+_current_budgets: contextvars.ContextVar = contextvars.ContextVar('tango_budgets', default=())
+
+def parse_limits(spec: str) -> Dict[str, float]:
+    """Parse "stage=limit,..." into a dict."""
+    limits = {}
+    for entry in spec.split(','):
+        stage, _, value = entry.partition('=')
+        if stage.strip() and value.strip():
+            limits[stage.strip()] = float(value)
+    return limits
+
+@dataclass
+class Budget:
+    """Limits and usage of one stage or resource; a limit of 0 is unlimited."""
+    name: str
+    max_seconds: float = 0
+    max_tokens: int = 0
+    max_apply_attempts: int = 0
+    started: float = field(default_factory=time.time)
+    tokens: int = 0
+    apply_attempts: int = 0
+    exhausted: Optional[str] = None
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.started
+
+    def exceeded(self) -> Optional[str]:
+        """Return the first exhausted limit ('wall_clock', 'tokens' or 'apply_attempts'), if any."""
+        if self.max_seconds and self.elapsed > self.max_seconds:
+            return 'wall_clock'
+        if self.max_tokens and self.tokens > self.max_tokens:
+            return 'tokens'
+        if self.max_apply_attempts and self.apply_attempts > self.max_apply_attempts:
+            return 'apply_attempts'
+        return None
+
+    def charge(self, tokens: int = 0, apply_attempts: int = 0) -> Optional[str]:
+        """Add usage and return the exhausted limit, remembering the first one."""
+        with self._lock:
+            self.tokens += tokens
+            self.apply_attempts += apply_attempts
+            self.exhausted = self.exhausted or self.exceeded()
+            return self.exhausted
+
+    def usage(self) -> Dict[str, Any]:
+        usage = {
+            'seconds': round(self.elapsed, 1),
+            'tokens': self.tokens,
+            'apply_attempts': self.apply_attempts,
+            'max_seconds': self.max_seconds,
+            'max_tokens': self.max_tokens,
+            'max_apply_attempts': self.max_apply_attempts
+        }
+        if self.exhausted:
+            usage['exhausted'] = self.exhausted
+        return usage
+
+    def format_usage(self) -> str:
+        def part(used, limit, unit: str) -> str:
+            return f"{used}/{limit:.0f} {unit}" if limit else f"{used} {unit}"
+
+        return ', '.join((
+            part(f"{self.elapsed:.0f}", self.max_seconds, 'seconds'),
+            part(self.tokens, self.max_tokens, 'tokens'),
+            part(self.apply_attempts, self.max_apply_attempts, 'applies')
+        ))
+
+class BudgetExhausted(Exception):
+    """A stage or resource ran out of budget; carries the stage that was running."""
+
+    def __init__(self, budget: Budget, stage: Optional[str] = None):
+        super().__init__(f"{budget.name} budget exhausted ({budget.exhausted}): {budget.format_usage()}")
+        self.budget = budget
+        self.stage = stage or budget.name
+
+def current_budgets() -> Tuple[Budget, ...]:
+    """Budgets that apply in the current context, innermost first."""
+    return _current_budgets.get()
+
+def exhausted_budget(budgets: Optional[Tuple[Budget, ...]] = None) -> Optional[Budget]:
+    """Return the first exhausted budget, checking the wall clock as well."""
+    for budget in current_budgets() if budgets is None else budgets:
+        if budget.charge():
+            return budget
+    return None
+
+@contextmanager
+def budget_scope(budget: Budget) -> Iterator[Budget]:
+    """Apply a budget to the agents checked out in this context, reporting its usage to enclosing budgets."""
+    parents = current_budgets()
+    token = _current_budgets.set((budget,) + parents)
+    try:
+        yield budget
+    finally:
+        _current_budgets.reset(token)
+        for parent in parents:
+            parent.stages[budget.name] = budget.usage()
+
+def resource_budget() -> Budget:
+    return Budget(
+        'resource',
+        max_seconds=config.BUDGET_RESOURCE_SECONDS,
+        max_tokens=config.BUDGET_RESOURCE_TOKENS,
+        max_apply_attempts=config.BUDGET_RESOURCE_APPLY_ATTEMPTS
+    )
+
+def stage_budget(stage: str) -> Budget:
+    return Budget(
+        stage,
+        max_seconds=parse_limits(config.BUDGET_STAGE_SECONDS).get(stage, 0),
+        max_tokens=int(parse_limits(config.BUDGET_STAGE_TOKENS).get(stage, 0)),
+        max_apply_attempts=int(parse_limits(config.BUDGET_STAGE_APPLY_ATTEMPTS).get(stage, 0))
+    )
+
+def _destroy(work_dir: str) -> None:
+    """Destroy whatever the stage deployed in its working directory."""
+    from .terraform_runner import build_args, command_timeout, terraform_runner
+
+    if not os.path.exists(os.path.join(work_dir, 'main.tf')):
+        return
+    print(f"🧹 Destroying resources in {work_dir}")
+    try:
+        result = terraform_runner.run_sync(work_dir, build_args('destroy'), command_timeout('destroy'))
+    except OSError as e:
+        print(f"Warning: Could not run terraform destroy in {work_dir}: {e}")
+        return
+    if not result.success:
+        print(f"Warning: terraform destroy failed in {work_dir} (log: {result.log_path})")
+
+@contextmanager
+def enforce_stage_budget(stage: str, work_dir: str) -> Iterator[Budget]:
+    """
+    Run a stage under its budget and the enclosing resource budget.
+
+    When a budget runs out, the stage's agent is stopped at its next model or tool
+    call, everything deployed in the working directory is destroyed and
+    BudgetExhausted is raised.
+    """
+    with budget_scope(stage_budget(stage)) as budget:
+        try:
+            yield budget
+            exhausted = exhausted_budget()
+        except Exception as e:
+            exhausted = exhausted_budget()
+            if exhausted is None:
+                raise
+            print(f"⏱️ {stage}: {BudgetExhausted(exhausted, stage)}")
+            _destroy(work_dir)
+            raise BudgetExhausted(exhausted, stage) from e
+        if exhausted:
+            # The limit ran out during the agent's last turn, after the hook's final check
+            print(f"⏱️ {stage}: {BudgetExhausted(exhausted, stage)}")
+            _destroy(work_dir)
+            raise BudgetExhausted(exhausted, stage)
+
+def format_report(usage: Dict[str, Dict[str, Any]]) -> str:
+    """Render budget usage per budget, one line each."""
+    lines = []
+    for name, entry in usage.items():
+        budget = Budget(name, entry['max_seconds'], entry['max_tokens'], entry['max_apply_attempts'],
+                        started=time.time() - entry['seconds'], tokens=entry['tokens'],
+                        apply_attempts=entry['apply_attempts'])
+        suffix = f" - exhausted ({entry['exhausted']})" if entry.get('exhausted') else ""
+        lines.append(f"{name}: {budget.format_usage()}{suffix}")
+    return '\n'.join(lines)
+
+def _usage_tokens(agent) -> int:
+    usage = getattr(getattr(agent, 'event_loop_metrics', None), 'accumulated_usage', None) or {}
+    return usage.get('inputTokens', 0) + usage.get('outputTokens', 0)
+
+class BudgetHooks(HookProvider):
+    """
+    Charges one pooled agent's tokens and terraform apply attempts to the budgets bound
+    at checkout, and raises BudgetExhausted before the next model or tool call once a
+    limit is exhausted.
+    """
+
+    def __init__(self):
+        self.budgets: Tuple[Budget, ...] = ()
+        self._tokens_mark = 0
+
+    def bind(self, budgets: Tuple[Budget, ...]) -> None:
+        """Charge the agent's usage to these budgets for the current checkout."""
+        self.budgets = budgets
+        self._tokens_mark = 0
+
+    def register_hooks(self, registry: HookRegistry, **kwargs) -> None:
+        registry.add_callback(BeforeModelCallEvent, self._before_model)
+        registry.add_callback(BeforeToolCallEvent, self._before_tool)
+        registry.add_callback(AfterInvocationEvent, self._after_invocation)
+
+    def _charge(self, agent, apply_attempts: int = 0) -> Optional[Budget]:
+        tokens = _usage_tokens(agent)
+        delta, self._tokens_mark = tokens - self._tokens_mark, tokens
+        exhausted = None
+        for budget in self.budgets:
+            if budget.charge(delta, apply_attempts) and exhausted is None:
+                exhausted = budget
+        return exhausted
+
+    def _before_model(self, event) -> None:
+        exhausted = self._charge(event.agent)
+        if exhausted:
+            raise BudgetExhausted(exhausted)
+
+    def _before_tool(self, event) -> None:
+        tool_use = event.tool_use
+        # Agents only reach terraform through the terraform tool
+        is_apply = tool_use.get('name') == 'terraform' and (tool_use.get('input') or {}).get('command') == 'apply'
+        exhausted = self._charge(event.agent, 1 if is_apply else 0)
+        if exhausted:
+            raise BudgetExhausted(exhausted)
+
+    def _after_invocation(self, event) -> None:
+        self._charge(event.agent)
@@ -3,20 +3,26 @@ TANGO Multi-Agent Pipeline - Cleanup Agent
 Specialized agent for cleaning up orphaned AWS resources from failed executions
 """
 
-from strands import Agent, tool
+from strands import tool
 from strands_tools import use_aws, python_repl
+from .agent_factory import checkout_agent
+from .sweeper import format_sweep_report, sweep
 
 CLEANUP_SYSTEM_PROMPT = """
 You are a cleanup agent for orphaned AWS resources from failed pipeline executions.
 
 YOUR TASK:
-Find and delete AWS resources that were left behind when pipeline executions failed.
+Delete the AWS resources that the automated sweeper could not delete. You are given the
+sweeper report listing each leftover resource ARN, why it was left over and its last error.
 
 WORKFLOW:
-1. Find AWS resources by tags (Environment=example, Name contains "example-")
-2. Delete resources in safe order: instances first, then networking
+1. For each leftover resource, find out why it could not be deleted (e.g. a non-empty bucket,
+   an attached internet gateway, a resource type the sweeper does not support)
+2. Resolve the blocker and delete the resource, dependent resources first: instances first, then networking
 
-SAFETY: Only delete resources tagged with Environment=example and Name starting with "example-"
+SAFETY: Only delete resources tagged with Environment=example and Name starting with "example-".
+Never delete resources tagged with tango:fixture. Never touch resources the report lists as
+in_use or too_recent: they may belong to a deployment that is still running.
 """
 
 @tool
@@ -24,6 +30,9 @@ def cleanup_agent(cleanup_request: str) -> str:
     """
     Clean up orphaned AWS resources from failed executions.
     
+    The sweeper deletes tagged example resources programmatically; the cleanup model
+    only handles what the sweeper leaves over.
+    
     Args:
         cleanup_request: What to clean up (e.g., "Clean up execution exec-12345")
     
@@ -31,12 +40,14 @@ def cleanup_agent(cleanup_request: str) -> str:
         Simple cleanup report
     """
     try:
-        agent = Agent(
-            system_prompt=CLEANUP_SYSTEM_PROMPT,
-            tools=[use_aws, python_repl]
-        )
+        run = sweep()
+        report = format_sweep_report(run)
+        if not run.leftovers():
+            return report
         
-        response = agent(cleanup_request)
-        return str(response)
+        print(f"🧹 {len(run.leftovers())} resources left over after the sweep, handing them to the cleanup model")
+        with checkout_agent("cleanup", CLEANUP_SYSTEM_PROMPT, [use_aws, python_repl]) as agent:
+            response = agent(f"{cleanup_request}\n\nSweeper report:\n{report}")
+        return f"{report}\n\n{response}"
     except Exception as e:
         return f"Cleanup error: {str(e)}"
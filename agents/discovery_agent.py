@@ -6,42 +6,189 @@ Direct API-based discovery for finding unprocessed AWS CloudControl resources
 import json
 import os
 import re
-import boto3
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from strands import tool
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
 import config
+from .agent_factory import get_client
+from .latest_status import query_processed_resources
+from .leases import lease_manager
+from .local_store import load_json, save_json
 
-def get_processed_resources() -> Set[str]:
-    """Get list of processed resources from DynamoDB."""
-    try:
-        dynamodb = boto3.client('dynamodb', region_name=config.AWS_REGION)
-        
-        response = dynamodb.scan(
-            TableName=config.DYNAMODB_TABLE,
-            ProjectionExpression='resource_name'
-        )
-        
-        processed = set()
+def _scan_segment(dynamodb, segment: int, total_segments: int, since: Optional[int] = None) -> Tuple[Set[str], int]:
+    """Scan one table segment, following LastEvaluatedKey until the segment is exhausted."""
+    scan_kwargs = {
+        'TableName': config.DYNAMODB_TABLE,
+        'ProjectionExpression': 'resource_name, #ts',
+        'ExpressionAttributeNames': {'#ts': 'timestamp'},
+        'Segment': segment,
+        'TotalSegments': total_segments
+    }
+    if since is not None:
+        scan_kwargs['FilterExpression'] = '#ts >= :since'
+        scan_kwargs['ExpressionAttributeValues'] = {':since': {'N': str(since)}}
+    
+    processed = set()
+    newest = 0
+    while True:
+        response = dynamodb.scan(**scan_kwargs)
         for item in response.get('Items', []):
             if 'resource_name' in item and 'S' in item['resource_name']:
                 processed.add(item['resource_name']['S'])
+            if 'timestamp' in item and 'N' in item['timestamp']:
+                newest = max(newest, int(float(item['timestamp']['N'])))
         
-        return processed
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return processed, newest
+        scan_kwargs['ExclusiveStartKey'] = last_key
+
+def scan_processed_resources(since: Optional[int] = None) -> Tuple[Set[str], int]:
+    """
+    Scan DynamoDB for processed resources using a paginated, parallel-segment scan.
+    
+    Args:
+        since: Only return rows with a timestamp at or after this value
+        
+    Returns:
+        Tuple of (processed resource names, newest timestamp seen)
+    """
+    dynamodb = get_client('dynamodb')
+    total_segments = max(1, config.DYNAMODB_SCAN_SEGMENTS)
+    
+    processed = set()
+    newest = 0
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        futures = [
+            executor.submit(_scan_segment, dynamodb, segment, total_segments, since)
+            for segment in range(total_segments)
+        ]
+        for future in futures:
+            names, segment_newest = future.result()
+            processed |= names
+            newest = max(newest, segment_newest)
+    
+    return processed, newest
+
+def _read_processed_resources(since: Optional[int] = None) -> Tuple[Set[str], int]:
+    """Read processed resources from the latest-index GSI, scanning the table if it has none."""
+    if config.DYNAMODB_LATEST_INDEX:
+        try:
+            return query_processed_resources(since)
+        except Exception as e:
+            print(f"Warning: Could not query {config.DYNAMODB_LATEST_INDEX} ({e}), scanning the table instead")
+    return scan_processed_resources(since)
+
+def get_processed_resources() -> Set[str]:
+    """
+    Get list of processed resources from DynamoDB.
+    
+    Keeps a local index of processed resource names and only reads resources whose
+    latest run is newer than the newest indexed timestamp (minus a safety overlap for
+    late writers). The index records the table and region it was built from and is
+    discarded when either changes.
+    """
+    source = {'table': config.DYNAMODB_TABLE, 'region': config.AWS_REGION}
+    index = load_json(config.PROCESSED_INDEX_PATH, {})
+    if index and {key: index.get(key) for key in source} != source:
+        print(f"ℹ️ Processed index was built from {index.get('table')} in {index.get('region')}, rebuilding it")
+        index = {}
+    indexed = set(index.get('resources', []))
+    last_timestamp = index.get('last_timestamp')
+    
+    since = None
+    if indexed and last_timestamp is not None:
+        since = max(0, last_timestamp - config.PROCESSED_INDEX_OVERLAP_SECONDS)
+    
+    try:
+        processed, newest = _read_processed_resources(since)
     except Exception as e:
         print(f"Warning: Could not access DynamoDB: {e}")
-        return set()
+        return indexed
+    
+    processed |= indexed
+    save_json(config.PROCESSED_INDEX_PATH, {
+        **source,
+        'resources': sorted(processed),
+        'last_timestamp': max(newest, last_timestamp or 0)
+    })
+    return processed
+
+_github_session = requests.Session()
+
+def _github_headers() -> Dict[str, str]:
+    """Build GitHub API request headers, authenticating when a token is configured."""
+    headers = {'Accept': 'application/vnd.github+json'}
+    if config.GITHUB_TOKEN:
+        headers['Authorization'] = f"Bearer {config.GITHUB_TOKEN}"
+    return headers
+
+def _index_release(release: Dict) -> Dict:
+    """Reduce a GitHub release to the fields discovery needs."""
+    resources, version = extract_resources_from_release(release)
+    return {
+        'tag_name': release.get('tag_name', ''),
+        'version': version,
+        'published_at': release.get('published_at') or '',
+        'resources': resources
+    }
+
+def refresh_release_index() -> Dict:
+    """
+    Refresh the on-disk release index.
+    
+    The first page is requested with If-None-Match so an unchanged release list costs
+    a single 304 response. Otherwise pages are followed until a page containing an
+    already indexed release, so the first run fetches every release and later runs
+    only fetch what is new.
+    """
+    index = load_json(config.RELEASE_INDEX_PATH, {})
+    releases = {release['tag_name']: release for release in index.get('releases', [])}
+    
+    headers = _github_headers()
+    if index.get('etag') and releases:
+        headers['If-None-Match'] = index['etag']
+    
+    response = _github_session.get(
+        config.GITHUB_RELEASES_URL, headers=headers, timeout=30, params={'per_page': 100}
+    )
+    if response.status_code == 304:
+        return index
+    response.raise_for_status()
+    etag = response.headers.get('ETag')
+    
+    page = response
+    while True:
+        reached_known = False
+        for release in page.json():
+            if release.get('draft'):
+                continue
+            if release.get('tag_name') in releases:
+                reached_known = True
+            releases[release.get('tag_name', '')] = _index_release(release)
+        
+        next_url = page.links.get('next', {}).get('url')
+        if reached_known or not next_url:
+            break
+        page = _github_session.get(next_url, headers=_github_headers(), timeout=30)
+        page.raise_for_status()
+    
+    index = {
+        'etag': etag,
+        'releases': sorted(releases.values(), key=lambda release: release['published_at'], reverse=True)
+    }
+    save_json(config.RELEASE_INDEX_PATH, index)
+    return index
 
 def get_github_releases() -> List[Dict]:
-    """Get recent releases from terraform-provider-awscc GitHub repository."""
+    """Get indexed releases (newest first) from terraform-provider-awscc GitHub repository."""
     try:
-        url = "https://api.github.com/repos/hashicorp/terraform-provider-awscc/releases"
-        response = requests.get(url, timeout=30, params={'per_page': 10})
-        response.raise_for_status()
-        return response.json()
+        return refresh_release_index().get('releases', [])
     except Exception as e:
-        print(f"Error fetching GitHub releases: {e}")
-        return []
+        print(f"Error refreshing GitHub releases: {e}")
+        # Fall back to the last known index so discovery still works offline
+        return load_json(config.RELEASE_INDEX_PATH, {}).get('releases', [])
 
 def extract_resources_from_release(release: Dict) -> tuple[List[str], str]:
     """Extract new resources and provider version from a release."""
@@ -57,8 +204,37 @@ def extract_resources_from_release(release: Dict) -> tuple[List[str], str]:
     
     return resources, version
 
-def find_unprocessed_resource() -> Dict[str, str]:
-    """Find the next unprocessed AWS CloudControl resource."""
+def has_processed_row(resource_name: str) -> bool:
+    """Check the state table directly for a row of this resource (bypassing the local index)."""
+    response = get_client('dynamodb').query(
+        TableName=config.DYNAMODB_TABLE,
+        KeyConditionExpression='resource_name = :name',
+        ExpressionAttributeValues={':name': {'S': resource_name}},
+        ProjectionExpression='resource_name',
+        ConsistentRead=True,
+        Limit=1
+    )
+    return bool(response.get('Items'))
+
+def _claim(resource_name: str) -> bool:
+    """Lease a resource for this worker so no other node processes it at the same time."""
+    if not lease_manager.claim(resource_name):
+        print(f"⏭️ Skipping {resource_name}: leased by another worker")
+        return False
+    # Another node may have stored it and released its lease since the processed scan
+    if has_processed_row(resource_name):
+        lease_manager.release(resource_name)
+        print(f"⏭️ Skipping {resource_name}: processed by another worker")
+        return False
+    return True
+
+def find_unprocessed_resources(limit: int = 1) -> List[Dict[str, str]]:
+    """
+    Find up to `limit` distinct unprocessed AWS CloudControl resources.
+    
+    When LEASE_TABLE is set, each returned resource is leased to this worker; release
+    the lease with lease_manager.release once the resource's results are stored.
+    """
     print("🔍 Checking processed resources...")
     processed_resources = get_processed_resources()
     print(f"Found {len(processed_resources)} processed resources")
@@ -67,25 +243,40 @@ def find_unprocessed_resource() -> Dict[str, str]:
     releases = get_github_releases()
     
     if not releases:
-        return {"resource_name": "NONE", "provider_version": "NONE"}
+        return []
     
     # Get latest version from the most recent release
-    latest_version = releases[0].get('tag_name', '').lstrip('v') if releases else "unknown"
+    latest_version = releases[0].get('version', 'unknown')
     print(f"🔄 Using latest provider version: {latest_version}")
+    print(f"Indexed {len(releases)} releases, {sum(len(release['resources']) for release in releases)} new resources")
     
     # Check releases from newest to oldest for unprocessed resources
+    found = []
+    seen = set()
     for release in releases:
-        resources, _ = extract_resources_from_release(release)  # Ignore original version
-        print(f"Release {release.get('tag_name', 'unknown')}: {len(resources)} resources")
+        resources = release['resources']
         
-        # Find first unprocessed resource
         for resource in resources:
-            if resource not in processed_resources:
-                print(f"✅ Found unprocessed resource: {resource} (using latest version {latest_version})")
-                return {"resource_name": resource, "provider_version": latest_version}
+            if resource in processed_resources or resource in seen:
+                continue
+            seen.add(resource)
+            if lease_manager.enabled and not _claim(resource):
+                continue
+            print(f"✅ Found unprocessed resource: {resource} (using latest version {latest_version})")
+            found.append({"resource_name": resource, "provider_version": latest_version})
+            if len(found) >= limit:
+                return found
     
-    print("ℹ️ All resources are processed")
-    return {"resource_name": "NONE", "provider_version": "NONE"}
+    if not found:
+        print("ℹ️ All resources are processed")
+    return found
+
+def find_unprocessed_resource() -> Dict[str, str]:
+    """Find the next unprocessed AWS CloudControl resource."""
+    found = find_unprocessed_resources(limit=1)
+    if not found:
+        return {"resource_name": "NONE", "provider_version": "NONE"}
+    return found[0]
 
 @tool
 def discovery_agent(query: str) -> str:
@@ -3,9 +3,13 @@ TANGO Multi-Agent Pipeline - Documentation Agent
 Specialized agent for generating Terraform code for AWS CloudControl resources
 """
 
-from strands import Agent, tool
+from strands import tool
 from strands_tools import python_repl, use_llm, http_request
+import re
 import config
+from .agent_factory import checkout_agent
+from .provider_schema import format_schema_for_prompt, get_resource_schema
+from .terraform_workspace import extract_provider_version
 
 DOCUMENTATION_SYSTEM_PROMPT = """
 You are a specialized Terraform documentation generator for AWS CloudControl resources.
@@ -29,6 +33,22 @@ OUTPUT STYLE:
 - If supporting resources are absolutely required, keep them minimal
 
 OUTPUT: Valid Terraform .tf file content starting with resources.
+
+PROVIDER SCHEMA:
+When the input includes the resource's provider schema, treat it as authoritative: set every
+required argument, only use argument names listed in it, and never set read-only attributes.
+Do not look up the resource documentation online when the schema is given.
+
+PRE-FLIGHT FINDINGS:
+When the input includes rejected_code and preflight_findings, a previous attempt failed the local
+pre-flight checks. Return a corrected version of the rejected code that fixes every [error] finding:
+declare the target resource, replace placeholder values with created or referenced resources, and
+use only arguments from the schema.
+"""
+
+SCHEMA_PROMPT_TEMPLATE = """
+Provider schema for the target resource:
+{schema}
 """
 
 @tool
@@ -48,18 +68,24 @@ def documentation_agent(resource_data: str) -> str:
             "{config.AWS_REGION}", config.AWS_REGION
         )
         
-        agent = Agent(
-            system_prompt=system_prompt,
-            tools=[http_request, use_llm, python_repl]
-        )
-        
         documentation_query = f"""
         Generate complete Terraform configuration using this resource information:
         
         {resource_data}
         """
         
-        response = agent(documentation_query)
+        # Inject the locally cached schema so the agent does not need to fetch documentation
+        resource = re.search(r'awscc_\w+', resource_data)
+        if resource:
+            provider_version = extract_provider_version(resource_data)
+            schema = get_resource_schema(resource.group(), provider_version)
+            if schema:
+                documentation_query += SCHEMA_PROMPT_TEMPLATE.format(
+                    schema=format_schema_for_prompt(schema, provider_version)
+                )
+        
+        with checkout_agent("documentation", system_prompt, [http_request, use_llm, python_repl]) as agent:
+            response = agent(documentation_query)
         return str(response)
     except Exception as e:
         return f"Error in documentation agent: {str(e)}"
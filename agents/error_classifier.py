@@ -0,0 +1,135 @@
+"""
+TANGO Multi-Agent Pipeline - Error Classifier
+Rule-based classification of terraform and CloudControl failures as retryable (try the
+same command again), fixable (change the code) or terminal (no code change can help),
+and a registry of the failures seen per working directory
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+RETRYABLE = 'retryable'
+FIXABLE = 'fixable'
+TERMINAL = 'terminal'
+# Most severe first: a terminal line anywhere in the output decides the class
+SEVERITY = (TERMINAL, FIXABLE, RETRYABLE)
+
+# (error class, code, pattern, hint). Each line takes the first rule it matches, so the
+# narrow rules (throttling, permission problems the example's own code causes) come before
+# the broad terminal ones; across lines the most severe class wins.
+RULE_SPECS = (
+    (RETRYABLE, 'Throttling', r'Throttl|Rate exceeded|RequestLimitExceeded|TooManyRequests|SlowDown',
+     'The API throttled the request'),
+    (FIXABLE, 'PolicyConfiguration',
+     r'iam:PassRole|no resource-based policy allows|deny in a resource-based policy|cannot be assumed|'
+     r'trust (relationship|policy)|Invalid principal|MalformedPolicyDocument|execution role does not have permissions',
+     'A role, trust policy or resource policy in the code is wrong; fix the IAM resources the example creates'),
+    (TERMINAL, 'TypeNotFound', r'TypeNotFoundException',
+     'The resource type is not available through CloudControl'),
+    (TERMINAL, 'UnsupportedAction',
+     r'UnsupportedActionException|handler .* not (supported|found)|does not support (the )?(create|read|update|delete|list)',
+     'CloudControl does not support this operation for the resource type'),
+    (TERMINAL, 'UnsupportedRegion',
+     r'not (supported|available) in (this|the|your) region|UnsupportedRegion|is not supported in [a-z]{2}-[a-z]+-\d',
+     'The service or resource is not available in this region'),
+    (TERMINAL, 'OptInRequired',
+     r'OptInRequired|SubscriptionRequiredException|not subscribed|must (first )?(opt in|accept|enable)|'
+     r'account is not (authorized|enabled|onboarded)',
+     'The account needs an opt-in or subscription that the pipeline cannot grant'),
+    (TERMINAL, 'QuotaExceeded',
+     r'ServiceQuotaExceededException|quota (has been |was )?exceeded|exceeds? (the|your) .*quota|'
+     r'maximum number of .* (reached|exceeded|allowed)',
+     'An account quota is exhausted'),
+    (TERMINAL, 'AccessDenied', r'AccessDenied(Exception)?|is not authorized to perform|UnauthorizedOperation',
+     'The pipeline credentials lack a permission'),
+    (RETRYABLE, 'ServiceUnavailable',
+     r'ServiceUnavailable|InternalFailure|InternalError|InternalServerError|ServiceInternalError|503 Service',
+     'The service had a transient failure'),
+    (RETRYABLE, 'NetworkFailure', r'NetworkFailure|connection reset|i/o timeout|TLS handshake timeout|no such host',
+     'A network call failed'),
+    (RETRYABLE, 'ConcurrentModification',
+     r'ConcurrentModification|ResourceConflict|OperationAborted|another operation is in progress',
+     'Another operation on the same resource was in progress'),
+    (FIXABLE, 'InvalidConfiguration',
+     r'InvalidRequest|ValidationException|InvalidParameter|Unsupported argument|Missing required argument|'
+     r'Invalid value|Incorrect attribute value type',
+     'The configuration is invalid; fix the attribute values'),
+    (FIXABLE, 'DependencyNotFound', r'NotFound|does not exist|InvalidVpcID|InvalidSubnetID|InvalidGroup',
+     'A referenced resource does not exist; create it or reference a real one'),
+)
+RULES: List[Tuple[str, str, re.Pattern, str]] = [
+    (error_class, code, re.compile(pattern, re.IGNORECASE), hint) for error_class, code, pattern, hint in RULE_SPECS
+]
+
+@dataclass
+class Classification:
+    """Class, rule code and matching line of a failure."""
+    error_class: str
+    code: str
+    hint: str
+    evidence: str
+
+    def format(self) -> str:
+        return f"Error class: {self.error_class.upper()} ({self.code}) - {self.hint}. Evidence: {self.evidence}"
+
+# Parses Classification.format() back, e.g. from a stage's final response
+FORMATTED_PATTERN = re.compile(r'Error class: ([A-Z]+) \((\w+)\) - (.*?)\. Evidence: (.*)')
+
+def classify(output: str) -> Classification:
+    """
+    Classify failed terraform or CloudControl output.
+
+    Returns:
+        The most severe matching classification; output no rule matches is fixable
+    """
+    matches: Dict[str, Classification] = {}
+    for line in output.splitlines():
+        rule = next((rule for rule in RULES if rule[2].search(line)), None)
+        if rule and rule[0] not in matches:
+            error_class, code, _, hint = rule
+            matches[error_class] = Classification(error_class, code, hint, line.strip(' │')[:300])
+    for error_class in SEVERITY:
+        if error_class in matches:
+            return matches[error_class]
+    return Classification(FIXABLE, 'Unclassified', 'No rule matched; inspect the error and fix the code', '')
+
+def most_severe(classifications: List[Classification]) -> Optional[Classification]:
+    for error_class in SEVERITY:
+        for classification in classifications:
+            if classification.error_class == error_class:
+                return classification
+    return None
+
+_lock = threading.Lock()
+_failures: Dict[str, List[Classification]] = {}
+
+def record_failure(work_dir: str, classification: Classification) -> None:
+    """Remember a classified failure for a working directory."""
+    with _lock:
+        _failures.setdefault(work_dir, []).append(classification)
+
+def terminal_failure(work_dir: str) -> Optional[Classification]:
+    """Return the terminal failure recorded for a working directory, if any."""
+    with _lock:
+        return next((c for c in _failures.get(work_dir, []) if c.error_class == TERMINAL), None)
+
+def pop_failures(work_dir: str) -> Optional[Classification]:
+    """Forget the failures recorded for a working directory, returning the most severe."""
+    with _lock:
+        return most_severe(_failures.pop(work_dir, []))
+
+def classify_failure(details: str) -> Classification:
+    """
+    Classify a failed stage from its details.
+
+    Classifications the terraform tool already reported ("Error class: ..." lines) are
+    preferred; otherwise the details are classified directly.
+    """
+    reported = [
+        Classification(match.group(1).lower(), match.group(2), match.group(3), match.group(4))
+        for match in FORMATTED_PATTERN.finditer(details)
+        if match.group(1).lower() in SEVERITY
+    ]
+    return most_severe(reported) or classify(details)
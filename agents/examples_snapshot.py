@@ -0,0 +1,121 @@
+"""
+TANGO Multi-Agent Pipeline - Official Examples Snapshot
+Local copy of terraform-provider-awscc/examples/resources fetched as one repository
+tarball, indexed by resource and refreshed with a conditional request
+
+Usage:
+    python -m agents.examples_snapshot [--force]
+"""
+
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+from typing import Dict, List, Optional
+import requests
+import config
+from .local_store import load_json, save_json
+
+EXAMPLES_PATH = 'examples/resources/'
+INDEX_FILE = 'index.json'
+
+def _index_path() -> str:
+    return os.path.join(config.EXAMPLES_SNAPSHOT_DIR, INDEX_FILE)
+
+def _headers() -> Dict[str, str]:
+    headers = {'Accept': 'application/vnd.github+json'}
+    if config.GITHUB_TOKEN:
+        headers['Authorization'] = f"Bearer {config.GITHUB_TOKEN}"
+    return headers
+
+def _extract_examples(stream, target_dir: str) -> Dict[str, List[str]]:
+    """Stream a gzipped repository tarball, keeping only examples/resources/<resource>/<file>."""
+    resources: Dict[str, List[str]] = {}
+    with tarfile.open(fileobj=stream, mode='r|gz') as archive:
+        for member in archive:
+            # Members are "<owner>-<repo>-<sha>/examples/resources/<resource>/<file>"
+            _, _, path = member.name.partition('/')
+            if not member.isfile() or not path.startswith(EXAMPLES_PATH):
+                continue
+            parts = path[len(EXAMPLES_PATH):].split('/')
+            if len(parts) != 2 or '..' in parts:
+                continue
+            resource_name, file_name = parts
+            source = archive.extractfile(member)
+            if source is None:
+                continue
+            os.makedirs(os.path.join(target_dir, resource_name), exist_ok=True)
+            with open(os.path.join(target_dir, resource_name, file_name), 'wb') as f:
+                shutil.copyfileobj(source, f)
+            resources.setdefault(resource_name, []).append(file_name)
+    return {name: sorted(files) for name, files in sorted(resources.items())}
+
+def refresh_snapshot(force: bool = False) -> Dict:
+    """
+    Refresh the local examples snapshot when it is older than EXAMPLES_SNAPSHOT_MAX_AGE_SECONDS.
+
+    The tarball is requested with If-None-Match, so an unchanged repository costs one
+    304 response. A new snapshot is extracted next to the old one and swapped in once
+    complete.
+
+    Returns:
+        The snapshot index ({etag, fetched_at, resources: {resource_name: [files]}})
+    """
+    index = load_json(_index_path(), {})
+    if index and not force and time.time() - index.get('fetched_at', 0) < config.EXAMPLES_SNAPSHOT_MAX_AGE_SECONDS:
+        return index
+
+    headers = _headers()
+    if index.get('etag') and not force:
+        headers['If-None-Match'] = index['etag']
+    print("📦 Fetching awscc examples snapshot...")
+    with requests.get(config.EXAMPLES_TARBALL_URL, headers=headers, stream=True, timeout=120) as response:
+        if response.status_code == 304:
+            index['fetched_at'] = int(time.time())
+            save_json(_index_path(), index)
+            return index
+        response.raise_for_status()
+        response.raw.decode_content = True
+
+        os.makedirs(config.EXAMPLES_SNAPSHOT_DIR, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.resources-', dir=config.EXAMPLES_SNAPSHOT_DIR)
+        try:
+            resources = _extract_examples(response.raw, staging)
+        except (tarfile.TarError, OSError):
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    resources_dir = os.path.join(config.EXAMPLES_SNAPSHOT_DIR, 'resources')
+    shutil.rmtree(resources_dir, ignore_errors=True)
+    os.replace(staging, resources_dir)
+    index = {'etag': response.headers.get('ETag'), 'fetched_at': int(time.time()), 'resources': resources}
+    save_json(_index_path(), index)
+    print(f"📦 Snapshot has examples for {len(resources)} resources")
+    return index
+
+def get_snapshot() -> Dict:
+    """Return the snapshot index, falling back to the existing snapshot if the refresh fails."""
+    try:
+        return refresh_snapshot()
+    except (requests.RequestException, tarfile.TarError, OSError) as e:
+        index = load_json(_index_path(), {})
+        if not index:
+            raise
+        print(f"Warning: Could not refresh examples snapshot ({e}), using the one from {time.ctime(index['fetched_at'])}")
+        return index
+
+def read_examples(resource_name: str, index: Optional[Dict] = None) -> Dict[str, str]:
+    """Return the official example files of a resource as {file name: content}."""
+    index = index or get_snapshot()
+    examples = {}
+    for file_name in index.get('resources', {}).get(resource_name, []):
+        path = os.path.join(config.EXAMPLES_SNAPSHOT_DIR, 'resources', resource_name, file_name)
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            examples[file_name] = f.read()
+    return examples
+
+if __name__ == '__main__':
+    snapshot = refresh_snapshot(force='--force' in sys.argv[1:])
+    print(f"✅ {len(snapshot.get('resources', {}))} resources in {config.EXAMPLES_SNAPSHOT_DIR}")
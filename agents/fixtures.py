@@ -0,0 +1,411 @@
+"""
+TANGO Multi-Agent Pipeline - Shared Fixtures
+Long-lived, tagged dependency resources (VPC, subnets, security group, IAM role,
+KMS key, S3 bucket) provisioned once per region and passed to the terraform and
+validation workspaces as variables instead of being created and destroyed per run
+
+Usage:
+    python -m agents.fixtures ensure|destroy|gc|index [--region REGION] [--provider-version VERSION]
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+import config
+from .local_store import load_json, save_json
+
+FIXTURE_TAG_KEY = "tango:fixture"
+STATE_FILE = 'fixtures.json'
+
+# Fixture ID -> (variable type, description used when publishing examples)
+FIXTURES = {
+    'vpc_id': ('string', 'ID of an existing VPC'),
+    'subnet_ids': ('list(string)', 'IDs of existing subnets in the VPC'),
+    'security_group_id': ('string', 'ID of an existing security group'),
+    'iam_role_arn': ('string', 'ARN of an existing IAM role the service can assume'),
+    'kms_key_arn': ('string', 'ARN of an existing KMS key'),
+    's3_bucket_name': ('string', 'Name of an existing S3 bucket'),
+}
+
+# Required schema attributes that a fixture can satisfy
+ATTRIBUTE_FIXTURES = [
+    (re.compile(r'(^|_)vpc_id$'), 'vpc_id'),
+    (re.compile(r'(^|_)subnet_ids?$'), 'subnet_ids'),
+    (re.compile(r'(^|_)security_group_ids?$'), 'security_group_id'),
+    (re.compile(r'(^|_)(role|role_arn|execution_role_arn|service_role)$'), 'iam_role_arn'),
+    (re.compile(r'(^|_)kms_key_(id|arn)$'), 'kms_key_arn'),
+    (re.compile(r'(^|_)(bucket|bucket_name|s3_bucket)$'), 's3_bucket_name'),
+]
+
+FIXTURE_TEMPLATE = """
+terraform {
+  required_providers {
+    awscc = {
+      source = "hashicorp/awscc"
+    }
+    aws = {
+      source = "hashicorp/aws"
+    }
+  }
+}
+
+provider "awscc" {
+  region = "{region}"
+}
+
+provider "aws" {
+  region = "{region}"
+}
+
+locals {
+  name = "{stack_name}"
+  tags = [
+    { key = "tango:fixture", value = "true" },
+    { key = "Name", value = "{stack_name}" }
+  ]
+}
+
+data "aws_caller_identity" "current" {}
+
+data "aws_availability_zones" "available" {
+  state = "available"
+}
+
+resource "awscc_ec2_vpc" "fixture" {
+  cidr_block           = "10.250.0.0/16"
+  enable_dns_hostnames = true
+  enable_dns_support   = true
+  tags                 = local.tags
+}
+
+resource "awscc_ec2_subnet" "fixture" {
+  count             = 2
+  vpc_id            = awscc_ec2_vpc.fixture.id
+  cidr_block        = cidrsubnet("10.250.0.0/16", 8, count.index)
+  availability_zone = data.aws_availability_zones.available.names[count.index]
+  tags              = local.tags
+}
+
+resource "awscc_ec2_security_group" "fixture" {
+  group_name        = local.name
+  group_description = "TANGO shared fixture security group"
+  vpc_id            = awscc_ec2_vpc.fixture.id
+  tags              = local.tags
+}
+
+resource "awscc_iam_role" "fixture" {
+  role_name = "${local.name}-{region}"
+  assume_role_policy_document = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect = "Allow"
+      Action = "sts:AssumeRole"
+      Principal = {
+        Service = [
+          "lambda.amazonaws.com", "ecs-tasks.amazonaws.com", "states.amazonaws.com",
+          "events.amazonaws.com", "scheduler.amazonaws.com", "pipes.amazonaws.com",
+          "glue.amazonaws.com", "codebuild.amazonaws.com", "firehose.amazonaws.com",
+          "sagemaker.amazonaws.com"
+        ]
+      }
+    }]
+  })
+  tags = local.tags
+}
+
+resource "awscc_kms_key" "fixture" {
+  description         = "TANGO shared fixture key"
+  enable_key_rotation = true
+  key_policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Sid       = "AccountAdministration"
+      Effect    = "Allow"
+      Principal = { AWS = "arn:aws:iam::${data.aws_caller_identity.current.account_id}:root" }
+      Action    = "kms:*"
+      Resource  = "*"
+    }]
+  })
+  tags = local.tags
+}
+
+resource "awscc_s3_bucket" "fixture" {
+  bucket_name = "${local.name}-${data.aws_caller_identity.current.account_id}-{region}"
+  tags        = local.tags
+}
+
+output "vpc_id" {
+  value = awscc_ec2_vpc.fixture.vpc_id
+}
+
+output "subnet_ids" {
+  value = awscc_ec2_subnet.fixture[*].subnet_id
+}
+
+output "security_group_id" {
+  value = awscc_ec2_security_group.fixture.group_id
+}
+
+output "iam_role_arn" {
+  value = awscc_iam_role.fixture.arn
+}
+
+output "kms_key_arn" {
+  value = awscc_kms_key.fixture.arn
+}
+
+output "s3_bucket_name" {
+  value = awscc_s3_bucket.fixture.bucket_name
+}
+"""
+
+FIXTURE_PROMPT_TEMPLATE = """
+Shared fixtures (long-lived supporting resources managed outside this workspace) are declared
+as variables in fixtures.tf and already set in fixtures.auto.tfvars.json:
+{variables}
+Reference these variables in main.tf instead of creating the supporting resources yourself.
+Do not declare them in main.tf, and never modify or destroy the fixtures.
+"""
+
+_lock = threading.Lock()
+
+def _stack_dir(region: str) -> str:
+    return os.path.join(config.FIXTURE_DIR, region)
+
+@contextmanager
+def _stack_lock(region: str) -> Iterator[None]:
+    """Serialize fixture changes for a region across threads and processes."""
+    os.makedirs(_stack_dir(region), exist_ok=True)
+    with _lock, open(os.path.join(_stack_dir(region), '.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _terraform(region: str, *args: str) -> str:
+    result = subprocess.run(
+        ['terraform', *args, '-no-color'],
+        cwd=_stack_dir(region), check=True, capture_output=True, text=True
+    )
+    return result.stdout
+
+def load_fixtures(region: Optional[str] = None) -> Optional[Dict]:
+    """Return the recorded fixture stack for a region ({region, created_at, last_used, outputs})."""
+    return load_json(os.path.join(_stack_dir(region or config.AWS_REGION), STATE_FILE))
+
+def ensure(region: Optional[str] = None) -> Optional[Dict]:
+    """
+    Provision the fixture stack for a region if it does not exist yet.
+
+    Returns:
+        The fixture state, or None if provisioning failed
+    """
+    # Imported for its side effect of pointing terraform at the shared plugin cache
+    from . import terraform_workspace  # noqa: F401
+
+    region = region or config.AWS_REGION
+    fixtures = load_fixtures(region)
+    if fixtures:
+        return fixtures
+
+    with _stack_lock(region):
+        fixtures = load_fixtures(region)
+        if fixtures:
+            return fixtures
+
+        print(f"🏗️ Provisioning shared fixtures in {region}...")
+        with open(os.path.join(_stack_dir(region), 'main.tf'), 'w', encoding='utf-8') as f:
+            f.write(FIXTURE_TEMPLATE.replace('{region}', region).replace('{stack_name}', config.FIXTURE_STACK_NAME))
+        try:
+            _terraform(region, 'init', '-input=false')
+            _terraform(region, 'apply', '-auto-approve', '-input=false')
+            outputs = json.loads(_terraform(region, 'output', '-json'))
+        except (OSError, subprocess.CalledProcessError, ValueError) as e:
+            details = getattr(e, 'stderr', '') or str(e)
+            print(f"Warning: Could not provision shared fixtures in {region}: {details}")
+            return None
+
+        now = int(time.time())
+        fixtures = {
+            'region': region,
+            'created_at': now,
+            'last_used': now,
+            'outputs': {name: output['value'] for name, output in outputs.items()}
+        }
+        save_json(os.path.join(_stack_dir(region), STATE_FILE), fixtures)
+        print(f"✅ Shared fixtures ready in {region}")
+        return fixtures
+
+def destroy(region: Optional[str] = None) -> bool:
+    """Destroy the fixture stack for a region and forget it."""
+    region = region or config.AWS_REGION
+    if not os.path.exists(os.path.join(_stack_dir(region), 'main.tf')):
+        return True
+
+    with _stack_lock(region):
+        print(f"🗑️ Destroying shared fixtures in {region}...")
+        try:
+            _terraform(region, 'init', '-input=false')
+            _terraform(region, 'destroy', '-auto-approve', '-input=false')
+        except (OSError, subprocess.CalledProcessError) as e:
+            details = getattr(e, 'stderr', '') or str(e)
+            print(f"❌ Could not destroy shared fixtures in {region}: {details}")
+            return False
+        state_path = os.path.join(_stack_dir(region), STATE_FILE)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
+    shutil.rmtree(_stack_dir(region), ignore_errors=True)
+    print(f"✅ Shared fixtures destroyed in {region}")
+    return True
+
+def gc(max_idle_seconds: Optional[int] = None) -> List[str]:
+    """Destroy fixture stacks that have not been used for max_idle_seconds; returns their regions."""
+    max_idle_seconds = config.FIXTURE_MAX_IDLE_SECONDS if max_idle_seconds is None else max_idle_seconds
+    if not os.path.isdir(config.FIXTURE_DIR):
+        return []
+
+    destroyed = []
+    for region in sorted(os.listdir(config.FIXTURE_DIR)):
+        if not os.path.isdir(_stack_dir(region)):
+            continue
+        fixtures = load_fixtures(region)
+        idle = time.time() - (fixtures or {}).get('last_used', 0)
+        if idle > max_idle_seconds and destroy(region):
+            destroyed.append(region)
+    return destroyed
+
+def _required_fixtures(attributes: Dict[str, Dict]) -> List[str]:
+    """Walk required schema attributes (and their required nested attributes) for fixture matches."""
+    needed = []
+    for name, entry in attributes.items():
+        if not entry.get('required'):
+            continue
+        for pattern, fixture_id in ATTRIBUTE_FIXTURES:
+            if pattern.search(name) and fixture_id not in needed:
+                needed.append(fixture_id)
+        for fixture_id in _required_fixtures(entry.get('nested') or {}):
+            if fixture_id not in needed:
+                needed.append(fixture_id)
+    return needed
+
+def build_fixture_index(provider_version: str) -> Dict[str, List[str]]:
+    """
+    Build the index of which fixture IDs each awscc resource type needs, from the
+    provider schema cache, and store it next to the fixture stacks.
+    """
+    from .provider_schema import build_schema_index, get_resource_schema
+
+    index_path = os.path.join(config.FIXTURE_DIR, f"index-{provider_version}.json")
+    index = load_json(index_path)
+    if index:
+        return index
+
+    schema_index = build_schema_index(provider_version)
+    if not schema_index or not schema_index.get('resource_types'):
+        return {}
+    index = {}
+    for resource_type in schema_index['resource_types']:
+        schema = get_resource_schema(resource_type, provider_version)
+        needed = _required_fixtures(schema['attributes']) if schema else []
+        if needed:
+            index[resource_type] = needed
+    save_json(index_path, index)
+    return index
+
+def fixtures_for(resource_type: str, provider_version: str) -> List[str]:
+    """Return the fixture IDs a resource type needs."""
+    return build_fixture_index(provider_version).get(resource_type, [])
+
+def prepare_workspace(work_dir: str, resource_type: Optional[str], provider_version: str,
+                      region: Optional[str] = None) -> str:
+    """
+    Make the fixtures a resource type needs available in a workspace.
+
+    Writes fixtures.tf (variable declarations) and fixtures.auto.tfvars.json (values).
+
+    Returns:
+        Prompt text describing the fixture variables, or '' when none apply
+    """
+    if not config.FIXTURES_ENABLED or not resource_type:
+        return ''
+    needed = fixtures_for(resource_type, provider_version)
+    if not needed:
+        return ''
+    region = region or config.AWS_REGION
+    fixtures = ensure(region)
+    if not fixtures:
+        return ''
+    needed = [fixture_id for fixture_id in needed if fixture_id in fixtures['outputs']]
+
+    fixtures['last_used'] = int(time.time())
+    save_json(os.path.join(_stack_dir(region), STATE_FILE), fixtures)
+
+    values = {f"fixture_{fixture_id}": fixtures['outputs'][fixture_id] for fixture_id in needed}
+    with open(os.path.join(work_dir, 'fixtures.tf'), 'w', encoding='utf-8') as f:
+        for fixture_id in needed:
+            variable_type, description = FIXTURES[fixture_id]
+            f.write(f'variable "fixture_{fixture_id}" {{\n  type        = {variable_type}\n'
+                    f'  description = "{description} (shared fixture)"\n}}\n\n')
+    with open(os.path.join(work_dir, 'fixtures.auto.tfvars.json'), 'w', encoding='utf-8') as f:
+        json.dump(values, f, indent=2)
+
+    variables = '\n'.join(f"- var.{name} = {json.dumps(value)}" for name, value in values.items())
+    return FIXTURE_PROMPT_TEMPLATE.format(variables=variables)
+
+def publish_fixture_variables(terraform_code: str) -> str:
+    """
+    Turn fixture variable references into plain input variables for published examples.
+
+    `var.fixture_vpc_id` becomes `var.vpc_id`, and a declaration is appended for every
+    referenced fixture variable the code does not declare itself.
+    """
+    referenced = sorted(set(re.findall(r'\bvar\.fixture_(\w+)', terraform_code)))
+    if not referenced:
+        return terraform_code
+
+    code = re.sub(r'\bvar\.fixture_(\w+)', r'var.\1', terraform_code)
+    code = re.sub(r'(variable\s+")fixture_(\w+)"', r'\1\2"', code)
+    declarations = []
+    for name in referenced:
+        if re.search(r'variable\s+"' + re.escape(name) + r'"', code) or name not in FIXTURES:
+            continue
+        variable_type, description = FIXTURES[name]
+        declarations.append(f'variable "{name}" {{\n  type        = {variable_type}\n  description = "{description}"\n}}\n')
+    if not declarations:
+        return code
+    return '\n'.join(declarations) + '\n' + code
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the shared TANGO fixture stacks")
+    parser.add_argument('command', choices=['ensure', 'destroy', 'gc', 'index'])
+    parser.add_argument('--region', default=config.AWS_REGION, help=f"AWS region (default: {config.AWS_REGION})")
+    parser.add_argument('--provider-version', default=config.DEFAULT_PROVIDER_VERSION,
+                        help=f"awscc provider version for the index (default: {config.DEFAULT_PROVIDER_VERSION})")
+    args = parser.parse_args()
+
+    if args.command == 'ensure':
+        fixtures = ensure(args.region)
+        print(json.dumps(fixtures, indent=2) if fixtures else "❌ Fixtures are not available")
+    elif args.command == 'destroy':
+        destroy(args.region)
+    elif args.command == 'gc':
+        destroyed = gc()
+        print(f"🧹 Destroyed idle fixtures in: {', '.join(destroyed) or 'none'}")
+    else:
+        index = build_fixture_index(args.provider_version)
+        print(f"📇 {len(index)} resource types use shared fixtures")
+        for resource_type, needed in sorted(index.items()):
+            print(f"  {resource_type}: {', '.join(needed)}")
+
+if __name__ == '__main__':
+    main()
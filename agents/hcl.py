@@ -0,0 +1,332 @@
+"""
+TANGO Multi-Agent Pipeline - HCL Parser
+Lightweight, offset-preserving HCL parser used to inspect and rewrite Terraform code
+without a model round trip
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_-]*')
+HEREDOC_START = re.compile(r'<<(-?)([A-Za-z_][A-Za-z0-9_]*)[ \t]*\r?\n')
+TOP_LEVEL_KEYWORDS = ('terraform', 'provider', 'resource', 'data', 'variable', 'output', 'locals', 'module')
+
+class HCLParseError(ValueError):
+    """Raised when Terraform code cannot be parsed."""
+
+@dataclass
+class Attribute:
+    """An `name = expression` attribute. Offsets index into the parsed text."""
+    name: str
+    value: str
+    start: int
+    end: int
+    value_start: int
+    value_end: int
+
+@dataclass
+class Block:
+    """A `type "label" ... { ... }` block. `start`/`end` cover leading comments and the trailing newline."""
+    type: str
+    labels: List[str]
+    start: int
+    end: int
+    body_start: int
+    body_end: int
+    items: List[Union[Attribute, 'Block']] = field(default_factory=list)
+
+    @property
+    def attributes(self) -> List[Attribute]:
+        return [item for item in self.items if isinstance(item, Attribute)]
+
+    @property
+    def blocks(self) -> List['Block']:
+        return [item for item in self.items if isinstance(item, Block)]
+
+def _line_end(text: str, i: int) -> int:
+    """Index of the newline ending the line containing i (or len(text))."""
+    end = text.find('\n', i)
+    return len(text) if end == -1 else end
+
+def _line_start(text: str, i: int) -> int:
+    return text.rfind('\n', 0, i) + 1
+
+def _skip_comment(text: str, i: int) -> Optional[int]:
+    """If a comment starts at i, return the index after it."""
+    if text[i] == '#' or text.startswith('//', i):
+        return _line_end(text, i)
+    if text.startswith('/*', i):
+        end = text.find('*/', i + 2)
+        if end == -1:
+            raise HCLParseError(f"Unterminated block comment at offset {i}")
+        return end + 2
+    return None
+
+def _skip_heredoc(text: str, i: int) -> Optional[int]:
+    """If a heredoc starts at i, return the index after its closing marker."""
+    match = HEREDOC_START.match(text, i)
+    if not match:
+        return None
+    closing = re.compile(r'^[ \t]*' + re.escape(match.group(2)) + r'[ \t]*$', re.MULTILINE)
+    end = closing.search(text, match.end())
+    if not end:
+        raise HCLParseError(f"Unterminated heredoc {match.group(2)} at offset {i}")
+    return end.end()
+
+def _skip_string(text: str, i: int) -> int:
+    """Skip a quoted string starting at i, including nested template interpolations."""
+    i += 1
+    while i < len(text):
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '"':
+            return i + 1
+        if c == '\n':
+            break
+        if text.startswith('$${', i) or text.startswith('%%{', i):
+            i += 3
+            continue
+        if text.startswith('${', i) or text.startswith('%{', i):
+            i = _skip_balanced(text, i + 2, '}')
+            continue
+        i += 1
+    raise HCLParseError(f"Unterminated string at offset {i}")
+
+def _skip_balanced(text: str, i: int, closer: str) -> int:
+    """Skip an expression up to the matching closer at depth zero; returns the index after it."""
+    depth = 0
+    while i < len(text):
+        c = text[i]
+        if c == '"':
+            i = _skip_string(text, i)
+            continue
+        skipped = _skip_comment(text, i) or _skip_heredoc(text, i)
+        if skipped:
+            i = skipped
+            continue
+        if c in '{[(':
+            depth += 1
+        elif c in '}])':
+            if depth == 0:
+                if c != closer:
+                    raise HCLParseError(f"Unexpected '{c}' at offset {i}")
+                return i + 1
+            depth -= 1
+        i += 1
+    raise HCLParseError(f"Missing '{closer}'")
+
+def _expression_end(text: str, i: int) -> int:
+    """Find where an attribute expression starting at i ends (newline, comment or closing brace at depth zero)."""
+    depth = 0
+    while i < len(text):
+        c = text[i]
+        if c == '"':
+            i = _skip_string(text, i)
+            continue
+        heredoc = _skip_heredoc(text, i)
+        if heredoc:
+            i = heredoc
+            continue
+        comment = _skip_comment(text, i)
+        if depth == 0 and (c == '\n' or c == '}' or comment):
+            break
+        if comment:
+            i = comment
+            continue
+        if c in '{[(':
+            depth += 1
+        elif c in '}])':
+            depth -= 1
+        i += 1
+    if depth > 0:
+        raise HCLParseError("Unbalanced brackets in expression")
+    return i
+
+def _skip_trivia(text: str, i: int, end: int) -> int:
+    """Skip whitespace and comments."""
+    while i < end:
+        if text[i].isspace():
+            i += 1
+            continue
+        comment = _skip_comment(text, i)
+        if comment is None:
+            break
+        i = comment
+    return i
+
+def _leading_comment_start(text: str, line_start: int) -> int:
+    """Extend a block start backwards over comment lines directly above it."""
+    start = line_start
+    while start > 0:
+        previous = _line_start(text, start - 1)
+        line = text[previous:start - 1].strip()
+        if not (line.startswith('#') or line.startswith('//')):
+            break
+        start = previous
+    return start
+
+def _consume_line(text: str, i: int) -> int:
+    """Move past trailing spaces and the newline after i, if the rest of the line is blank."""
+    end = _line_end(text, i)
+    if text[i:end].strip():
+        return i
+    return min(end + 1, len(text))
+
+def _parse_item(text: str, i: int, end: int) -> Tuple[Union[Attribute, Block], int]:
+    """Parse one attribute or block starting at i; returns the item and the index after it."""
+    match = IDENTIFIER.match(text, i)
+    if not match:
+        raise HCLParseError(f"Expected attribute or block at offset {i}: {text[i:i + 20]!r}")
+    name = match.group()
+    j = match.end()
+    while j < end and text[j] in ' \t':
+        j += 1
+
+    if text.startswith('=', j) and not text.startswith('==', j):
+        value_start = j + 1
+        while value_start < end and text[value_start] in ' \t':
+            value_start += 1
+        value_end = _expression_end(text, value_start)
+        value = text[value_start:value_end].rstrip()
+        return Attribute(
+            name=name,
+            value=value,
+            start=_line_start(text, i),
+            end=_consume_line(text, value_end),
+            value_start=value_start,
+            value_end=value_start + len(value)
+        ), value_end
+
+    labels = []
+    while j < end and text[j] != '{':
+        if text[j].isspace():
+            j += 1
+        elif text[j] == '"':
+            label_end = _skip_string(text, j)
+            labels.append(text[j + 1:label_end - 1])
+            j = label_end
+        else:
+            label = IDENTIFIER.match(text, j)
+            if not label:
+                raise HCLParseError(f"Invalid block header for '{name}' at offset {j}")
+            labels.append(label.group())
+            j = label.end()
+    if j >= end:
+        raise HCLParseError(f"Block '{name}' has no body")
+
+    body_start = j + 1
+    body_end = _skip_balanced(text, body_start, '}') - 1
+    return Block(
+        type=name,
+        labels=labels,
+        start=_leading_comment_start(text, _line_start(text, i)),
+        end=_consume_line(text, body_end + 1),
+        body_start=body_start,
+        body_end=body_end,
+        items=_parse_body(text, body_start, body_end)
+    ), body_end + 1
+
+def _parse_body(text: str, i: int, end: int) -> List[Union[Attribute, Block]]:
+    items: List[Union[Attribute, Block]] = []
+    while True:
+        i = _skip_trivia(text, i, end)
+        if i >= end:
+            return items
+        item, i = _parse_item(text, i, end)
+        items.append(item)
+
+def parse(text: str) -> List[Union[Attribute, Block]]:
+    """Parse Terraform code into top-level attributes and blocks."""
+    return _parse_body(text, 0, len(text))
+
+def parse_blocks(text: str) -> List[Block]:
+    """Parse Terraform code and return its top-level blocks."""
+    return [item for item in parse(text) if isinstance(item, Block)]
+
+def walk(items: List[Union[Attribute, Block]]) -> Iterator[Union[Attribute, Block]]:
+    """Yield every attribute and block, depth first."""
+    for item in items:
+        yield item
+        if isinstance(item, Block):
+            yield from walk(item.items)
+
+def remove_spans(text: str, spans: List[tuple]) -> str:
+    """Remove (start, end) spans from text."""
+    for start, end in sorted(spans, reverse=True):
+        text = text[:start] + text[end:]
+    return text
+
+def rewrite_strings(text: str, rewrite: Callable[[str], str]) -> str:
+    """Apply rewrite to the content of every quoted string outside comments and heredocs."""
+    out = []
+    i = 0
+    last = 0
+    while i < len(text):
+        c = text[i]
+        if c == '"':
+            end = _skip_string(text, i)
+            out.append(text[last:i + 1])
+            out.append(rewrite(text[i + 1:end - 1]))
+            out.append('"')
+            i = last = end
+            continue
+        skipped = _skip_comment(text, i) or _skip_heredoc(text, i)
+        i = skipped if skipped else i + 1
+    out.append(text[last:])
+    return ''.join(out)
+
+def strip_comments(text: str) -> str:
+    """Remove comments, keeping strings and heredocs intact."""
+    out = []
+    i = 0
+    last = 0
+    while i < len(text):
+        c = text[i]
+        if c == '"':
+            i = _skip_string(text, i)
+            continue
+        heredoc = _skip_heredoc(text, i)
+        if heredoc:
+            i = heredoc
+            continue
+        comment = _skip_comment(text, i)
+        if comment:
+            out.append(text[last:i])
+            i = last = comment
+            continue
+        i += 1
+    out.append(text[last:])
+    return ''.join(out)
+
+def extract_terraform_code(text: str) -> str:
+    """
+    Extract Terraform code from agent output that may wrap it in prose or markdown fences.
+
+    Without fences, the code runs from the first top-level block keyword through the
+    last top-level block that parses, so trailing prose is dropped.
+    """
+    fences = re.findall(r'```(?:hcl|terraform|tf)?[ \t]*\n(.*?)```', text, re.DOTALL | re.IGNORECASE)
+    if fences:
+        return max(fences, key=len).strip() + '\n'
+
+    start = re.search(r'^(?:' + '|'.join(TOP_LEVEL_KEYWORDS) + r')\b', text, re.MULTILINE)
+    if not start:
+        return text.strip() + '\n'
+
+    i = end = start.start()
+    while True:
+        i = _skip_trivia(text, i, len(text))
+        keyword = IDENTIFIER.match(text, i)
+        if not keyword or keyword.group() not in TOP_LEVEL_KEYWORDS:
+            break
+        try:
+            item, i = _parse_item(text, i, len(text))
+        except HCLParseError:
+            break
+        if not isinstance(item, Block):
+            break
+        end = i
+    return text[start.start():end].strip() + '\n'
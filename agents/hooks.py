@@ -0,0 +1,42 @@
+"""
+TANGO Multi-Agent Pipeline - Agent Hook Events
+Strands hook event imports, covering the renamed model/tool events across strands versions,
+and helpers for inspecting tool calls inside hooks
+"""
+
+from typing import Any, Dict, Optional
+from strands.hooks import HookProvider, HookRegistry, BeforeInvocationEvent, AfterInvocationEvent
+
+try:
+    from strands.hooks import BeforeModelCallEvent, AfterModelCallEvent, BeforeToolCallEvent, AfterToolCallEvent
+except ImportError:
+    from strands.experimental.hooks import (
+        BeforeModelInvocationEvent as BeforeModelCallEvent,
+        AfterModelInvocationEvent as AfterModelCallEvent,
+        BeforeToolInvocationEvent as BeforeToolCallEvent,
+        AfterToolInvocationEvent as AfterToolCallEvent,
+    )
+
+def tool_command(tool_use: Dict[str, Any]) -> str:
+    """Return the command a shell tool call runs ('' for other tools)."""
+    command = (tool_use.get('input') or {}).get('command', '')
+    if isinstance(command, list):
+        command = ' && '.join(str(part) for part in command)
+    return str(command)
+
+def tool_result_text(result: Optional[Dict[str, Any]]) -> str:
+    """Join the text content of a tool result."""
+    return '\n'.join(item.get('text', '') for item in (result or {}).get('content', []) if isinstance(item, dict))
+
+__all__ = [
+    'HookProvider',
+    'HookRegistry',
+    'BeforeInvocationEvent',
+    'AfterInvocationEvent',
+    'BeforeModelCallEvent',
+    'AfterModelCallEvent',
+    'BeforeToolCallEvent',
+    'AfterToolCallEvent',
+    'tool_command',
+    'tool_result_text'
+]
@@ -0,0 +1,191 @@
+"""
+TANGO Multi-Agent Pipeline - Latest Status Items
+One "latest" pointer item per resource (timestamp 0, item_type "latest") holding the
+outcome of its most recent run, kept in step with the history rows and indexed by a
+sparse GSI so discovery and reporting read one small projection instead of scanning
+
+Usage:
+    python -m agents.latest_status backfill
+    python -m agents.latest_status show RESOURCE_NAME
+"""
+
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+import config
+from .agent_factory import get_client
+
+LATEST_TIMESTAMP = 0
+LATEST_ITEM_TYPE = 'latest'
+LATEST_FIELDS = (
+    'status', 'provider_version', 's3_terraform_link', 's3_template_link', 's3_analysis_link', 'failed_agent', 'error_class',
+    'failure_reason'
+)
+
+def latest_item(record: Dict) -> Dict[str, Dict]:
+    """Build the pointer item for a stored record (the plain-value dict written by storage)."""
+    item = {
+        'resource_name': {'S': record['resource_name']},
+        'timestamp': {'N': str(LATEST_TIMESTAMP)},
+        'item_type': {'S': LATEST_ITEM_TYPE},
+        'last_timestamp': {'N': str(record['timestamp'])}
+    }
+    for field in LATEST_FIELDS:
+        if record.get(field):
+            item[field] = {'S': str(record[field])}
+    return item
+
+def write_with_history(history_item: Dict[str, Dict], record: Dict) -> bool:
+    """
+    Write a history row and update the resource's pointer item in one transaction.
+
+    The pointer is only replaced when the new row is at least as recent as the one it
+    points to, so a slow writer never rolls it back. In that case only the history row
+    is written.
+
+    Returns:
+        True if the pointer item was updated
+    """
+    dynamodb = get_client('dynamodb')
+    try:
+        dynamodb.transact_write_items(TransactItems=[
+            {'Put': {'TableName': config.DYNAMODB_TABLE, 'Item': history_item}},
+            {'Put': {
+                'TableName': config.DYNAMODB_TABLE,
+                'Item': latest_item(record),
+                'ConditionExpression': 'attribute_not_exists(last_timestamp) OR last_timestamp <= :ts',
+                'ExpressionAttributeValues': {':ts': {'N': str(record['timestamp'])}}
+            }}
+        ])
+        return True
+    except dynamodb.exceptions.TransactionCanceledException as e:
+        reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+        if reasons[1:2] != ['ConditionalCheckFailed']:
+            raise
+    dynamodb.put_item(TableName=config.DYNAMODB_TABLE, Item=history_item)
+    return False
+
+def _plain(item: Dict[str, Dict]) -> Dict:
+    """Convert a pointer item to plain values."""
+    latest = {name: value['S'] for name, value in item.items() if 'S' in value}
+    latest['last_timestamp'] = int(item['last_timestamp']['N'])
+    latest.pop('item_type', None)
+    return latest
+
+def get_latest(resource_name: str, consistent: bool = False) -> Optional[Dict]:
+    """Read the latest status of one resource, or None if it was never processed."""
+    response = get_client('dynamodb').get_item(
+        TableName=config.DYNAMODB_TABLE,
+        Key={'resource_name': {'S': resource_name}, 'timestamp': {'N': str(LATEST_TIMESTAMP)}},
+        ConsistentRead=consistent
+    )
+    item = response.get('Item')
+    return _plain(item) if item and 'last_timestamp' in item else None
+
+def query_latest(since: Optional[int] = None, projection: Optional[str] = None) -> List[Dict]:
+    """
+    Read pointer items from the sparse latest-index GSI.
+
+    Args:
+        since: Only return resources whose last run is at or after this timestamp
+        projection: Optional ProjectionExpression; resource_name and last_timestamp are always included
+
+    Returns:
+        Latest status per resource, oldest run first
+    """
+    query_kwargs = {
+        'TableName': config.DYNAMODB_TABLE,
+        'IndexName': config.DYNAMODB_LATEST_INDEX,
+        'KeyConditionExpression': 'item_type = :type' + (' AND last_timestamp >= :since' if since is not None else ''),
+        'ExpressionAttributeValues': {':type': {'S': LATEST_ITEM_TYPE}}
+    }
+    if since is not None:
+        query_kwargs['ExpressionAttributeValues'][':since'] = {'N': str(since)}
+    if projection:
+        # DynamoDB rejects a projection that names the same attribute twice
+        fields = ['resource_name', 'last_timestamp', 'item_type'] + [name.strip() for name in projection.split(',')]
+        query_kwargs['ProjectionExpression'] = ', '.join(dict.fromkeys(fields))
+
+    dynamodb = get_client('dynamodb')
+    latest = []
+    while True:
+        response = dynamodb.query(**query_kwargs)
+        latest.extend(_plain(item) for item in response.get('Items', []))
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return latest
+        query_kwargs['ExclusiveStartKey'] = last_key
+
+def query_processed_resources(since: Optional[int] = None) -> Tuple[Set[str], int]:
+    """Processed resource names and the newest run timestamp, from the latest-index GSI."""
+    latest = query_latest(since, projection='resource_name')
+    names = {entry['resource_name'] for entry in latest}
+    newest = max((entry['last_timestamp'] for entry in latest), default=0)
+    return names, newest
+
+def backfill() -> int:
+    """
+    Create pointer items for resources stored before pointer items existed.
+
+    Scans the history rows once and writes a pointer for each resource's newest row,
+    unless a pointer for an equal or newer run already exists.
+
+    Returns:
+        Number of pointer items written
+    """
+    dynamodb = get_client('dynamodb')
+    newest: Dict[str, Dict] = {}
+    scan_kwargs = {'TableName': config.DYNAMODB_TABLE}
+    while True:
+        response = dynamodb.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            timestamp = int(float(item['timestamp']['N']))
+            if timestamp == LATEST_TIMESTAMP:
+                continue
+            name = item['resource_name']['S']
+            if name not in newest or timestamp > int(float(newest[name]['timestamp']['N'])):
+                newest[name] = item
+        if not response.get('LastEvaluatedKey'):
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    written = 0
+    for name, item in sorted(newest.items()):
+        record = {field: value['S'] for field, value in item.items() if 'S' in value}
+        record['timestamp'] = int(float(item['timestamp']['N']))
+        try:
+            dynamodb.put_item(
+                TableName=config.DYNAMODB_TABLE,
+                Item=latest_item(record),
+                ConditionExpression='attribute_not_exists(last_timestamp) OR last_timestamp < :ts',
+                ExpressionAttributeValues={':ts': {'N': str(record['timestamp'])}}
+            )
+            written += 1
+        except dynamodb.exceptions.ConditionalCheckFailedException:
+            continue
+    return written
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TANGO latest status items")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('backfill', help='Create pointer items from existing history rows')
+    show = subparsers.add_parser('show', help='Show the latest status of a resource')
+    show.add_argument('resource_name')
+    args = parser.parse_args(argv)
+
+    if args.command == 'backfill':
+        written = backfill()
+        print(f"✅ Wrote {written} latest status items")
+        return 0
+
+    latest = get_latest(args.resource_name, consistent=True)
+    if latest is None:
+        print(f"ℹ️ {args.resource_name} has not been processed")
+        return 1
+    for name, value in sorted(latest.items()):
+        print(f"{name}: {value}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
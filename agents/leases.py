@@ -0,0 +1,257 @@
+"""
+TANGO Multi-Agent Pipeline - Work Leases
+DynamoDB leases that let several machines drain the same backlog: discovery claims a
+resource with a conditional write, a heartbeat keeps the claim alive while it is being
+processed, and leases of crashed workers expire and go back to the pool
+
+Usage:
+    python -m agents.leases list
+"""
+
+import atexit
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Set
+import config
+from .agent_factory import get_client
+
+class LeaseLost(Exception):
+    """This worker's lease on a resource expired or was taken over by another worker."""
+
+def default_owner() -> str:
+    """Identify this worker process as <hostname>-<pid>."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class LeaseManager:
+    """
+    Claims, renews and releases resource leases in the lease table.
+
+    A claim succeeds only if the resource has no lease or its lease has expired, so
+    each resource is handed to exactly one worker at a time. Held leases are renewed
+    from a background thread every heartbeat interval; a worker that stops renewing
+    (crashed, killed or partitioned) loses its leases once they expire.
+
+    A lease found lost by the heartbeat is remembered until it is released, so the
+    worker can check() before each stage and before storing and abort instead of
+    writing results for a resource another worker now owns.
+    """
+
+    def __init__(self, table_name: str, ttl_seconds: int, heartbeat_seconds: int, owner: Optional[str] = None):
+        self.table_name = table_name
+        self.ttl_seconds = ttl_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.owner = owner or default_owner()
+        self._lock = threading.Lock()
+        self._held: Dict[str, int] = {}
+        self._lost: Set[str] = set()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.table_name)
+
+    def held(self) -> List[str]:
+        """Resource names this worker currently holds a lease on."""
+        with self._lock:
+            return sorted(self._held)
+
+    def claim(self, resource_name: str) -> bool:
+        """
+        Try to lease a resource for this worker.
+
+        Returns:
+            True if the lease was acquired (or is already held), False if another worker holds it
+        """
+        with self._lock:
+            if resource_name in self._held:
+                return True
+        dynamodb = get_client('dynamodb')
+        now = int(time.time())
+        try:
+            response = dynamodb.update_item(
+                TableName=self.table_name,
+                Key={'resource_name': {'S': resource_name}},
+                UpdateExpression='SET #owner = :owner, acquired_at = :now, heartbeat_at = :now, expires_at = :expires ADD claims :one',
+                ConditionExpression='attribute_not_exists(resource_name) OR expires_at < :now OR #owner = :owner',
+                ExpressionAttributeNames={'#owner': 'owner'},
+                ExpressionAttributeValues={
+                    ':owner': {'S': self.owner},
+                    ':now': {'N': str(now)},
+                    ':expires': {'N': str(now + self.ttl_seconds)},
+                    ':one': {'N': '1'}
+                },
+                ReturnValues='ALL_OLD'
+            )
+        except dynamodb.exceptions.ConditionalCheckFailedException:
+            return False
+
+        previous = response.get('Attributes', {})
+        previous_owner = previous.get('owner', {}).get('S')
+        if previous_owner and previous_owner != self.owner:
+            last_heartbeat = int(previous.get('heartbeat_at', {}).get('N', now))
+            print(
+                f"♻️ Reclaimed expired lease on {resource_name} from {previous_owner} "
+                f"(no heartbeat for {now - last_heartbeat}s, worker presumed crashed)"
+            )
+
+        with self._lock:
+            self._held[resource_name] = now + self.ttl_seconds
+            self._lost.discard(resource_name)
+        self._start_heartbeat()
+        return True
+
+    def lost(self, resource_name: str) -> bool:
+        """True if this worker held a lease on the resource and lost it (or let it expire)."""
+        with self._lock:
+            if resource_name in self._lost:
+                return True
+            expires_at = self._held.get(resource_name)
+        # Renewals failing with other errors keep the lease locally, but not past its expiry
+        return expires_at is not None and expires_at < time.time()
+
+    def check(self, resource_name: str) -> None:
+        """
+        Make sure this worker may still act on a resource; resources that were never
+        leased (leasing disabled, targeted runs) always pass.
+
+        Raises:
+            LeaseLost: If the lease was lost to another worker or expired
+        """
+        if self.lost(resource_name):
+            raise LeaseLost(f"Lease on {resource_name} was lost; another worker may be processing it")
+
+    def release(self, resource_name: str) -> None:
+        """Give up a lease, e.g. once the resource's results are stored."""
+        with self._lock:
+            self._lost.discard(resource_name)
+            if self._held.pop(resource_name, None) is None:
+                return
+        dynamodb = get_client('dynamodb')
+        try:
+            dynamodb.delete_item(
+                TableName=self.table_name,
+                Key={'resource_name': {'S': resource_name}},
+                ConditionExpression='#owner = :owner',
+                ExpressionAttributeNames={'#owner': 'owner'},
+                ExpressionAttributeValues={':owner': {'S': self.owner}}
+            )
+        except dynamodb.exceptions.ConditionalCheckFailedException:
+            # The lease expired and was taken over; nothing of ours to delete
+            pass
+        except Exception as e:
+            print(f"Warning: Could not release lease on {resource_name}: {e}")
+
+    def release_all(self) -> None:
+        """Release every held lease and stop the heartbeat (called at exit)."""
+        self._stop.set()
+        for resource_name in self.held():
+            self.release(resource_name)
+
+    def renew(self) -> List[str]:
+        """
+        Extend every held lease by the TTL.
+
+        Returns:
+            Resource names whose lease was lost to another worker
+        """
+        dynamodb = get_client('dynamodb')
+        lost = []
+        for resource_name in self.held():
+            now = int(time.time())
+            try:
+                dynamodb.update_item(
+                    TableName=self.table_name,
+                    Key={'resource_name': {'S': resource_name}},
+                    UpdateExpression='SET heartbeat_at = :now, expires_at = :expires',
+                    ConditionExpression='#owner = :owner',
+                    ExpressionAttributeNames={'#owner': 'owner'},
+                    ExpressionAttributeValues={
+                        ':owner': {'S': self.owner},
+                        ':now': {'N': str(now)},
+                        ':expires': {'N': str(now + self.ttl_seconds)}
+                    }
+                )
+            except dynamodb.exceptions.ConditionalCheckFailedException:
+                lost.append(resource_name)
+                continue
+            except Exception as e:
+                # Keep the lease; the next heartbeat retries before it expires
+                print(f"Warning: Could not renew lease on {resource_name}: {e}")
+                continue
+            with self._lock:
+                if resource_name in self._held:
+                    self._held[resource_name] = now + self.ttl_seconds
+
+        for resource_name in lost:
+            with self._lock:
+                self._held.pop(resource_name, None)
+                self._lost.add(resource_name)
+            print(f"⚠️ Lease on {resource_name} was lost to another worker; aborting its processing")
+        return lost
+
+    def _start_heartbeat(self) -> None:
+        with self._lock:
+            if self._heartbeat is not None:
+                return
+            self._heartbeat = threading.Thread(target=self._heartbeat_loop, name='lease-heartbeat', daemon=True)
+            self._heartbeat.start()
+        atexit.register(self.release_all)
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.heartbeat_seconds):
+            if self.held():
+                self.renew()
+
+    def list_leases(self) -> List[Dict]:
+        """Return every lease in the table, marking the ones that have expired."""
+        dynamodb = get_client('dynamodb')
+        now = int(time.time())
+        leases = []
+        scan_kwargs = {'TableName': self.table_name}
+        while True:
+            response = dynamodb.scan(**scan_kwargs)
+            for item in response.get('Items', []):
+                expires_at = int(item['expires_at']['N'])
+                leases.append({
+                    'resource_name': item['resource_name']['S'],
+                    'owner': item['owner']['S'],
+                    'heartbeat_at': int(item['heartbeat_at']['N']),
+                    'expires_at': expires_at,
+                    'claims': int(item.get('claims', {}).get('N', '1')),
+                    'expired': expires_at < now
+                })
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return sorted(leases, key=lambda lease: lease['resource_name'])
+            scan_kwargs['ExclusiveStartKey'] = last_key
+
+lease_manager = LeaseManager(
+    config.LEASE_TABLE, config.LEASE_TTL_SECONDS, config.LEASE_HEARTBEAT_SECONDS, config.LEASE_OWNER or None
+)
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TANGO work leases")
+    parser.add_argument('command', choices=['list'])
+    parser.parse_args(argv)
+
+    if not lease_manager.enabled:
+        print("ℹ️ LEASE_TABLE is not set, leasing is disabled")
+        return 1
+    now = int(time.time())
+    for lease in lease_manager.list_leases():
+        icon = "💀" if lease['expired'] else "🔒"
+        state = "expired" if lease['expired'] else f"expires in {lease['expires_at'] - now}s"
+        print(
+            f"{icon} {lease['resource_name']}: {lease['owner']}, last heartbeat {now - lease['heartbeat_at']}s ago, "
+            f"{state}, claimed {lease['claims']}x"
+        )
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
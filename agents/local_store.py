@@ -0,0 +1,31 @@
+"""
+TANGO Multi-Agent Pipeline - Local Store
+Small helpers for the JSON files kept in the local cache directory
+"""
+
+import json
+import os
+import tempfile
+from typing import Any
+
+def load_json(path: str, default: Any = None) -> Any:
+    """Load a JSON file, returning default when it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def save_json(path: str, data: Any) -> None:
+    """Atomically write data as JSON so concurrent readers never see a partial file."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,153 @@
+"""
+TANGO Multi-Agent Pipeline - Model Record/Replay
+Records model responses keyed by a hash of the system prompt, messages (including tool
+results) and tool specs, and replays them so repeated runs skip identical model calls
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+from strands.models import Model
+import config
+from .local_store import load_json, save_json
+
+REPLAY_MODES = ('record', 'replay', 'passthrough')
+
+class ReplayMissError(RuntimeError):
+    """Raised in replay mode when no recorded response matches the request."""
+
+def replay_key(system_prompt: Optional[str], messages: List[Dict], tool_specs: Optional[List[Dict]],
+               model_id: Optional[str] = None) -> str:
+    """Hash everything the model sees for one call."""
+    payload = json.dumps(
+        {'model_id': model_id, 'system_prompt': system_prompt, 'messages': messages, 'tool_specs': tool_specs or []},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ReplayStore:
+    """
+    On-disk store of recorded stream events, one JSON file per key.
+
+    Replays refresh a file's mtime, and once the store grows past max_bytes the least
+    recently used recordings are evicted.
+    """
+
+    def __init__(self, store_dir: str, max_bytes: int):
+        self.store_dir = store_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.store_dir, key[:2], f"{key}.json")
+
+    def _entries(self) -> List[os.DirEntry]:
+        entries = []
+        if not os.path.isdir(self.store_dir):
+            return entries
+        for shard in os.scandir(self.store_dir):
+            if shard.is_dir():
+                entries.extend(entry for entry in os.scandir(shard.path) if entry.name.endswith('.json'))
+        return entries
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the recorded events for a key, or None."""
+        path = self._path(key)
+        entry = load_json(path)
+        if entry is None:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry['events']
+
+    def put(self, key: str, events: List[Dict[str, Any]]) -> None:
+        """Record the events for a key and evict old recordings if the store is too large."""
+        path = self._path(key)
+        save_json(path, {'key': key, 'recorded_at': int(time.time()), 'events': events})
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(entry.stat().st_size for entry in self._entries())
+            else:
+                self._total_bytes += os.path.getsize(path)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used recordings until the store is back under 90% of max_bytes."""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        evicted = 0
+        for entry in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        self._total_bytes = total
+        print(f"🧹 Evicted {evicted} model recordings ({total // 1024} KiB kept)")
+
+class ReplayModel(Model):
+    """
+    Wraps a model with record/replay of its streamed responses.
+
+    - record: replay recorded responses, call the model and record on a miss
+    - replay: only replay; a miss raises ReplayMissError instead of calling the model
+    - passthrough: always call the model (the wrapper is not installed)
+    """
+
+    def __init__(self, model: Model, mode: str, store: ReplayStore):
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unknown model replay mode '{mode}', expected one of {', '.join(REPLAY_MODES)}")
+        self.model = model
+        self.mode = mode
+        self.store = store
+
+    def update_config(self, **model_config) -> None:
+        self.model.update_config(**model_config)
+
+    def get_config(self):
+        return self.model.get_config()
+
+    def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        return self.model.structured_output(output_model, prompt, system_prompt=system_prompt, **kwargs)
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        model_config = self.get_config() or {}
+        key = replay_key(system_prompt, messages, tool_specs, model_config.get('model_id'))
+
+        recorded = self.store.get(key) if self.mode != 'passthrough' else None
+        if recorded is not None:
+            for event in recorded:
+                yield event
+            return
+        if self.mode == 'replay':
+            raise ReplayMissError(f"No recorded model response for key {key} (MODEL_REPLAY_MODE=replay)")
+
+        events = []
+        async for event in self.model.stream(messages, tool_specs, system_prompt, **kwargs):
+            events.append(event)
+            yield event
+
+        if self.mode == 'record':
+            try:
+                self.store.put(key, events)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Warning: Could not record model response: {e}")
+
+def wrap_model(model: Model) -> Model:
+    """Install record/replay around a model according to MODEL_REPLAY_MODE."""
+    if config.MODEL_REPLAY_MODE == 'passthrough':
+        return model
+    store = ReplayStore(config.MODEL_REPLAY_DIR, config.MODEL_REPLAY_MAX_BYTES)
+    return ReplayModel(model, config.MODEL_REPLAY_MODE, store)
@@ -4,15 +4,15 @@ Main entry point that coordinates specialized agents using Strands Agent pattern
 """
 
 import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
 import config
-from strands import Agent
-from .discovery_agent import discovery_agent
-from .documentation_agent import documentation_agent
-from .terraform_agent import terraform_agent
-from .validation_agent import validation_agent
-from .terraform_cleanup_agent import terraform_cleanup_agent
-from .storage_agent import storage_agent
-from .cleanup_agent import cleanup_agent
+
+if TYPE_CHECKING:
+    from strands import Agent
 
 # Configuration
 os.environ['AWS_PROFILE'] = config.AWS_PROFILE
@@ -55,6 +55,8 @@ CRITICAL REQUIREMENTS:
 - ALWAYS call storage_agent regardless of success or failure
 - For failures: pass error details, failed agent name, and partial results to storage_agent
 - For success: pass cleaned terraform code, execution results, validation results, and timing to storage_agent
+- Call storage_agent with a JSON object: {"resource_name": ..., "status": "success" or "failed", "terraform_code": <cleaned code>, "s3_analysis_link": <from validation_agent>, "failed_agent": <on failure>, "error": <on failure>}
+- If a working directory is given, pass it to terraform_agent and validation_agent so all terraform files stay inside it
 
 DATA FLOW:
 discovery_agent → {resource_name, provider_version}
@@ -80,27 +82,198 @@ FAILURE HANDLING:
 Execute the complete pipeline workflow using the specialized agents and handle both success and failure cases.
 """
 
-# Create the orchestrator agent with specialized agents as tools
-orchestrator = Agent(
-    system_prompt=ORCHESTRATOR_SYSTEM_PROMPT,
-    tools=[discovery_agent, documentation_agent, terraform_agent, validation_agent, terraform_cleanup_agent, storage_agent, cleanup_agent],
-    name="TANGO Pipeline Orchestrator"
-)
+RESOURCE_PROMPT_TEMPLATE = """
+Execute the complete pipeline workflow for the AWS CloudControl resource: {resource_name}
+
+IMPORTANT: Skip the discovery step and use this resource information directly:
+{{
+  "resource_name": "{resource_name}",
+  "provider_version": "{provider_version}"
+}}
+
+Continue with the normal workflow from there:
+1. Generate Terraform code using the documentation_agent
+2. Validate with the terraform_agent
+3. Clean up the Terraform code with the terraform_cleanup_agent
+4. Store results with the storage_agent
+"""
+
+WORK_DIR_PROMPT_TEMPLATE = """
+{prefix} {work_dir}
+Create every terraform test directory inside this working directory and never outside it.
+"""
+
+ORCHESTRATOR_NAME = "TANGO Pipeline Orchestrator"
+
+_orchestrator_lock = threading.Lock()
+_orchestrator = None
+
+def orchestrator_tools() -> list:
+    """Import the specialized agents used as orchestrator tools"""
+    from .discovery_agent import discovery_agent
+    from .documentation_agent import documentation_agent
+    from .terraform_agent import terraform_agent
+    from .validation_agent import validation_agent
+    from .terraform_cleanup_agent import terraform_cleanup_agent
+    from .storage_agent import storage_agent
+    from .cleanup_agent import cleanup_agent
+    return [discovery_agent, documentation_agent, terraform_agent, validation_agent, terraform_cleanup_agent, storage_agent, cleanup_agent]
 
-def run_pipeline():
+def create_orchestrator() -> "Agent":
+    """Create a new orchestrator agent with the specialized agents as tools"""
+    from .agent_factory import create_agent
+    return create_agent(ORCHESTRATOR_NAME, ORCHESTRATOR_SYSTEM_PROMPT, orchestrator_tools())
+
+def get_orchestrator() -> "Agent":
+    """Return the shared orchestrator agent, creating it on first use"""
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is None:
+            _orchestrator = create_orchestrator()
+        return _orchestrator
+
+def __getattr__(name):
+    # The module-level orchestrator is built on first access rather than at import time
+    if name == 'orchestrator':
+        return get_orchestrator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _with_work_dir(prompt: str, work_dir: Optional[str]) -> str:
+    """Append the working directory instructions to a prompt"""
+    if not work_dir:
+        return prompt
+    from .terraform_workspace import WORK_DIR_PREFIX
+    return prompt + WORK_DIR_PROMPT_TEMPLATE.format(prefix=WORK_DIR_PREFIX, work_dir=work_dir)
+
+def run_pipeline(work_dir: Optional[str] = None):
     """Execute the TANGO multi-agent pipeline"""
     print("🚀 TANGO Multi-Agent Pipeline Starting")
     print("=" * 60)
     
     try:
+        if config.ORCHESTRATOR_MODE == "code":
+            from .pipeline import run_next_resource
+            
+            result = run_next_resource(work_dir)
+            print("\n🎉 Multi-agent pipeline execution completed!")
+            return result
+        
         pipeline_prompt = "Execute the complete pipeline workflow for the next AWS CloudControl resource."
         
-        result = orchestrator(pipeline_prompt)
+        result = get_orchestrator()(_with_work_dir(pipeline_prompt, work_dir))
         print("\n🎉 Multi-agent pipeline execution completed!")
         return result
     except Exception as e:
         print(f"\n❌ Pipeline error: {e}")
         return None
 
+def run_resource(resource_name: str, provider_version: str, work_dir: Optional[str] = None, agent: Optional["Agent"] = None):
+    """Run the orchestrator for a specific resource, skipping discovery"""
+    if config.ORCHESTRATOR_MODE == "code" and agent is None:
+        from .pipeline import run_resource_pipeline
+        
+        return run_resource_pipeline(resource_name, provider_version, work_dir)
+    
+    agent = agent or get_orchestrator()
+    prompt = RESOURCE_PROMPT_TEMPLATE.format(
+        resource_name=resource_name,
+        provider_version=provider_version
+    )
+    return agent(_with_work_dir(prompt, work_dir))
+
+def run_status(result) -> str:
+    """Return "success", "failed" or "no_resources" for a result of run_pipeline or run_resource"""
+    if config.ORCHESTRATOR_MODE == "code" and result is not None:
+        from .pipeline import PipelineRun
+        
+        if isinstance(result, PipelineRun):
+            return result.status if result.status in ("success", "no_resources") else "failed"
+    # The LLM orchestrator returns its final response, or None when it raised
+    return "success" if result else "failed"
+
+def _stored_status(resource_name: str, since: float) -> Optional[str]:
+    """Status the pipeline stored for a resource at or after since, or None if it stored nothing"""
+    from .latest_status import get_latest
+    
+    latest = get_latest(resource_name, consistent=True)
+    if latest and latest["last_timestamp"] >= int(since):
+        return latest.get("status")
+    return None
+
+def _process_in_workspace(resource: Dict[str, str]) -> Dict:
+    """Worker: run one resource with its own orchestrator and working directory"""
+    from .agent_factory import checkout_agent
+    from .leases import lease_manager
+    
+    resource_name = resource["resource_name"]
+    os.makedirs(config.WORKSPACE_ROOT, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix=f"{resource_name}-", dir=config.WORKSPACE_ROOT)
+    start = time.time()
+    
+    try:
+        if config.ORCHESTRATOR_MODE == "code":
+            run = run_resource(resource_name, resource["provider_version"], work_dir)
+            success, error = run.status == "success", run.error
+        else:
+            with checkout_agent(ORCHESTRATOR_NAME, ORCHESTRATOR_SYSTEM_PROMPT, orchestrator_tools()) as agent:
+                response = run_resource(resource_name, resource["provider_version"], work_dir, agent=agent)
+            # The LLM orchestrator's response does not say how the run ended, the stored status does
+            stored = _stored_status(resource_name, start)
+            success = run_status(response) == "success" and stored == "success"
+            error = None if success else f"Pipeline stored {f'status {stored}' if stored else 'no result'}"
+        if lease_manager.lost(resource_name):
+            success, error = False, f"Lease on {resource_name} was lost to another worker"
+    except Exception as e:
+        success, error = False, str(e)
+    finally:
+        lease_manager.release(resource_name)
+    
+    duration = time.time() - start
+    if success:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    return {
+        "resource_name": resource_name,
+        "success": success,
+        "error": error,
+        "duration": duration,
+        "work_dir": work_dir
+    }
+
+def run_batch(max_resources: int, workers: int) -> List[Dict]:
+    """Drain up to max_resources from the discovery backlog with a pool of workers"""
+    print(f"🚀 TANGO Batch Pipeline Starting ({max_resources} resources, {workers} workers)")
+    print("=" * 60)
+    
+    from .discovery_agent import find_unprocessed_resources
+    from .terraform_workspace import workspace_pool
+    from .scheduler import ResourceScheduler
+    
+    resources = find_unprocessed_resources(limit=max_resources)
+    if not resources:
+        print("ℹ️ No unprocessed resources found")
+        return []
+    
+    # Initialize the provider cache once and pre-create a workspace per worker
+    for provider_version in sorted({resource["provider_version"] for resource in resources}):
+        workspace_pool.warm(provider_version, min(workers, len(resources)))
+    
+    def report(result: Dict) -> None:
+        if result["success"]:
+            print(f"✅ {result['resource_name']} completed in {result['duration']:.0f}s")
+        else:
+            print(f"❌ {result['resource_name']} failed after {result.get('duration', 0):.0f}s: {result['error']}")
+            if result.get("work_dir"):
+                print(f"   Working directory kept for inspection: {result['work_dir']}")
+    
+    # Start resources under per-service and per-region rate limits, taking services in turn
+    scheduler = ResourceScheduler(workers)
+    results = scheduler.run(resources, _process_in_workspace, on_result=report)
+    scheduler.print_report()
+    
+    succeeded = sum(1 for result in results if result["success"])
+    print(f"\n🎉 Batch completed: {succeeded}/{len(results)} resources succeeded")
+    return results
+
 if __name__ == "__main__":
     run_pipeline()
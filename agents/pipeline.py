@@ -0,0 +1,328 @@
+"""
+TANGO Multi-Agent Pipeline - Code-Driven Orchestrator
+Runs the pipeline stages directly in the documented DATA FLOW order, passing typed
+payloads between them. Models are only used inside the generative stages.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional
+import config
+from .budget import BUDGET_EXHAUSTED, Budget, BudgetExhausted, budget_scope, format_report, resource_budget
+from .error_classifier import classify_failure
+from .hcl import extract_terraform_code
+from .tracing import Trace, span, start_trace
+from .terraform_workspace import WORK_DIR_PREFIX
+
+if TYPE_CHECKING:
+    from .preflight import PreflightResult
+
+@dataclass
+class ResourceTarget:
+    """discovery_agent → {resource_name, provider_version}"""
+    resource_name: str
+    provider_version: str
+
+@dataclass
+class GeneratedCode:
+    """documentation_agent(resource_name + provider_version) → terraform_code"""
+    target: ResourceTarget
+    terraform_code: str
+
+@dataclass
+class LifecycleResult:
+    """terraform_agent(terraform_code + provider_version) → corrected_code"""
+    target: ResourceTarget
+    success: bool
+    corrected_code: Optional[str]
+    details: str
+
+@dataclass
+class ValidationResult:
+    """validation_agent(corrected_code + resource_name) → validation_results"""
+    target: ResourceTarget
+    success: bool
+    s3_analysis_link: str
+    cached: bool
+    details: str
+
+@dataclass
+class PipelineRun:
+    """Results of every stage for one resource, as passed to storage"""
+    target: Optional[ResourceTarget]
+    status: str = "failed"
+    failed_agent: Optional[str] = None
+    error: Optional[str] = None
+    generated: Optional[GeneratedCode] = None
+    preflight: Optional["PreflightResult"] = None
+    regenerations: int = 0
+    error_class: Optional[str] = None
+    failure_reason: Optional[str] = None
+    lifecycle: Optional[LifecycleResult] = None
+    validation: Optional[ValidationResult] = None
+    cleaned_code: Optional[str] = None
+    storage_record: Optional[Dict[str, str]] = None
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    budget_usage: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    trace: Optional[Trace] = None
+
+class StageError(Exception):
+    """A pipeline stage failed; carries the agent name for the run record."""
+
+    def __init__(self, agent_name: str, message: str):
+        super().__init__(message)
+        self.agent_name = agent_name
+
+def _stage_input(target: ResourceTarget, terraform_code: str, work_dir: Optional[str]) -> str:
+    """Build the text input for the terraform and validation stages."""
+    lines = [
+        f"Resource name: {target.resource_name}",
+        f"Provider version: {target.provider_version}",
+    ]
+    if work_dir:
+        lines.append(f"{WORK_DIR_PREFIX} {work_dir}")
+    lines.append(f"```hcl\n{terraform_code}```")
+    return "\n".join(lines)
+
+def discover() -> Optional[ResourceTarget]:
+    """Find the next unprocessed resource."""
+    from .discovery_agent import find_unprocessed_resources
+
+    found = find_unprocessed_resources(limit=1)
+    if not found:
+        return None
+    return ResourceTarget(found[0]["resource_name"], found[0]["provider_version"])
+
+def generate(target: ResourceTarget, rejected: Optional[GeneratedCode] = None,
+             findings: Optional[str] = None) -> GeneratedCode:
+    """Generate Terraform code for the target resource, fixing a rejected attempt when given."""
+    from .documentation_agent import documentation_agent
+
+    request = {
+        "resource_name": target.resource_name,
+        "provider_version": target.provider_version
+    }
+    if rejected is not None:
+        request["rejected_code"] = rejected.terraform_code
+        request["preflight_findings"] = findings
+    response = documentation_agent(json.dumps(request))
+    if response.startswith("Error in documentation agent"):
+        raise StageError("documentation_agent", response)
+    return GeneratedCode(target, extract_terraform_code(response))
+
+def preflight(generated: GeneratedCode) -> "PreflightResult":
+    """Run the local pre-flight checks on generated code."""
+    from .preflight import run_preflight
+
+    return run_preflight(generated.terraform_code, generated.target.resource_name, generated.target.provider_version)
+
+def run_lifecycle(generated: GeneratedCode, work_dir: Optional[str] = None) -> LifecycleResult:
+    """Run the full terraform lifecycle and return the corrected code."""
+    from .terraform_agent import terraform_agent
+
+    response = terraform_agent(_stage_input(generated.target, generated.terraform_code, work_dir))
+    if "TERRAFORM_LIFECYCLE_FAILED" in response or response.startswith("Error in terraform agent"):
+        return LifecycleResult(generated.target, False, None, response)
+    return LifecycleResult(generated.target, True, extract_terraform_code(response), response)
+
+def validate(lifecycle: LifecycleResult, work_dir: Optional[str] = None) -> ValidationResult:
+    """Independently validate the corrected code."""
+    from .validation_agent import validation_agent, parse_validation_result
+
+    response = validation_agent(_stage_input(lifecycle.target, lifecycle.corrected_code, work_dir))
+    result = parse_validation_result(response) or {}
+    return ValidationResult(
+        target=lifecycle.target,
+        success=result.get("validation_result") == "success",
+        s3_analysis_link=result.get("s3_path") or "none",
+        cached=bool(result.get("cached")),
+        details=result.get("error") or response
+    )
+
+def clean(terraform_code: str) -> str:
+    """Clean Terraform code for publishing."""
+    from .terraform_cleanup_agent import terraform_cleanup_agent
+
+    response = terraform_cleanup_agent(terraform_code)
+    if response.startswith("Error in terraform cleanup agent"):
+        raise StageError("terraform_cleanup_agent", response)
+    return extract_terraform_code(response)
+
+def store(run: PipelineRun) -> Dict[str, str]:
+    """Store the run's results in DynamoDB and S3."""
+    from .storage_agent import store_results
+
+    extra_attributes = {}
+    if run.failed_agent:
+        extra_attributes["failed_agent"] = run.failed_agent
+    if run.error:
+        extra_attributes["error"] = run.error[:1000]
+    if run.failure_reason:
+        extra_attributes["failure_reason"] = run.failure_reason
+    if run.budget_usage:
+        extra_attributes["budget_usage"] = json.dumps(run.budget_usage, sort_keys=True)
+    if run.error_class:
+        extra_attributes["error_class"] = run.error_class
+    if run.regenerations:
+        extra_attributes["preflight_regenerations"] = str(run.regenerations)
+    if run.trace:
+        extra_attributes["trace_id"] = run.trace.trace_id
+    return store_results(
+        resource_name=run.target.resource_name,
+        status=run.status,
+        terraform_code=run.cleaned_code or "",
+        s3_analysis_link=run.validation.s3_analysis_link if run.validation else "none",
+        extra_attributes=extra_attributes,
+        trace_summary=run.trace.summary() if run.trace else None,
+        provider_version=run.target.provider_version
+    )
+
+@contextmanager
+def _timed(run: PipelineRun, stage: str) -> Iterator[None]:
+    """Run a stage inside a tracing span and add its wall time to the run."""
+    start = time.perf_counter()
+    try:
+        with span(stage):
+            yield
+    finally:
+        run.stage_timings[stage] = run.stage_timings.get(stage, 0.0) + time.perf_counter() - start
+
+def run_resource_pipeline(resource_name: str, provider_version: str, work_dir: Optional[str] = None) -> PipelineRun:
+    """
+    Process one resource through every stage in DATA FLOW order.
+
+    Storage always runs, for both success and failure, so the audit trail is complete.
+
+    Args:
+        resource_name: AWS CloudControl resource name
+        provider_version: awscc provider version
+        work_dir: Optional working directory for the terraform stages
+
+    Returns:
+        The completed pipeline run
+    """
+    with start_trace(resource_name) as trace, budget_scope(resource_budget()) as budget:
+        return _run_stages(
+            PipelineRun(target=ResourceTarget(resource_name, provider_version), trace=trace), work_dir, budget
+        )
+
+def _preflight_gate(run: PipelineRun) -> None:
+    """
+    Check generated code locally before any real deployment, sending the findings back
+    to the generator up to PREFLIGHT_MAX_REGENERATIONS times.
+
+    Raises:
+        StageError: If the code still has pre-flight errors after the last regeneration
+    """
+    while True:
+        with _timed(run, "preflight"):
+            run.preflight = preflight(run.generated)
+        if run.preflight.passed:
+            return
+        if run.regenerations >= config.PREFLIGHT_MAX_REGENERATIONS:
+            raise StageError("preflight", run.preflight.format_findings())
+
+        run.regenerations += 1
+        print(f"🔁 Regenerating {run.target.resource_name} to fix {len(run.preflight.errors)} pre-flight errors "
+              f"({run.regenerations}/{config.PREFLIGHT_MAX_REGENERATIONS})")
+        with _timed(run, "documentation_agent"):
+            run.generated = generate(run.target, run.generated, run.preflight.format_findings())
+
+def _check_budget(budget: Budget, stage: str) -> None:
+    """Do not start a stage once the resource's budget is exhausted."""
+    if budget.charge():
+        raise BudgetExhausted(budget, stage)
+
+def _abandon(run: PipelineRun, error: Exception) -> PipelineRun:
+    """Stop a run whose lease was lost without storing anything; the new owner stores its own results."""
+    run.status, run.error = "lease_lost", str(error)
+    print(f"⚠️ {run.target.resource_name}: {error}, not storing results")
+    return run
+
+def _run_stages(run: PipelineRun, work_dir: Optional[str], budget: Budget) -> PipelineRun:
+    from .leases import LeaseLost, lease_manager
+
+    resource_name = run.target.resource_name
+    try:
+        with _timed(run, "documentation_agent"):
+            run.generated = generate(run.target)
+
+        if config.PREFLIGHT_ENABLED:
+            _preflight_gate(run)
+
+        lease_manager.check(resource_name)
+        _check_budget(budget, "terraform_agent")
+        with _timed(run, "terraform_agent"):
+            run.lifecycle = run_lifecycle(run.generated, work_dir)
+        if not run.lifecycle.success:
+            raise StageError("terraform_agent", run.lifecycle.details)
+
+        lease_manager.check(resource_name)
+        _check_budget(budget, "validation_agent")
+        with _timed(run, "validation_agent"):
+            run.validation = validate(run.lifecycle, work_dir)
+        if not run.validation.success:
+            raise StageError("validation_agent", run.validation.details)
+
+        lease_manager.check(resource_name)
+        run.status = "success"
+    except LeaseLost as e:
+        return _abandon(run, e)
+    except BudgetExhausted as e:
+        run.failed_agent, run.error = e.stage, str(e)
+    except StageError as e:
+        run.failed_agent, run.error = e.agent_name, str(e)
+        if e.agent_name in ("terraform_agent", "validation_agent"):
+            classification = classify_failure(run.error)
+            run.error_class = f"{classification.error_class}:{classification.code}"
+    except Exception as e:
+        run.failed_agent, run.error = "orchestrator", str(e)
+    # A model call stopped by the budget hook can also surface as an ordinary stage error
+    stage_exhausted = any(usage.get("exhausted") for usage in budget.stages.values())
+    if run.status != "success" and (budget.exhausted or stage_exhausted):
+        run.failure_reason = BUDGET_EXHAUSTED
+
+    # Clean whatever code the run produced so failed attempts are stored too
+    code = (run.lifecycle and run.lifecycle.corrected_code) or (run.generated and run.generated.terraform_code)
+    if code:
+        try:
+            with _timed(run, "terraform_cleanup_agent"):
+                run.cleaned_code = clean(code)
+        except StageError as e:
+            run.cleaned_code = code
+            if run.status == "success":
+                run.status, run.failed_agent, run.error = "failed", e.agent_name, str(e)
+
+    run.budget_usage = {"resource": budget.usage(), **budget.stages}
+    print(f"💰 Budget usage for {resource_name}:\n{format_report(run.budget_usage)}")
+
+    try:
+        with _timed(run, "storage_agent"):
+            run.storage_record = store(run)
+    except LeaseLost as e:
+        return _abandon(run, e)
+
+    icon = "✅" if run.status == "success" else "❌"
+    print(f"{icon} {resource_name}: {run.status}" + (f" ({run.failed_agent}: {run.error[:200]})" if run.error else ""))
+    return run
+
+def run_next_resource(work_dir: Optional[str] = None) -> PipelineRun:
+    """Discover the next unprocessed resource and run it through the pipeline."""
+    run = PipelineRun(target=None)
+    with _timed(run, "discovery_agent"):
+        target = discover()
+    if target is None:
+        print("ℹ️ All resources are processed")
+        run.status = "no_resources"
+        return run
+
+    from .leases import lease_manager
+
+    try:
+        discovered = run_resource_pipeline(target.resource_name, target.provider_version, work_dir)
+    finally:
+        lease_manager.release(target.resource_name)
+    discovered.stage_timings = {**run.stage_timings, **discovered.stage_timings}
+    return discovered
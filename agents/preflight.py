@@ -0,0 +1,230 @@
+"""
+TANGO Multi-Agent Pipeline - Pre-flight Checks
+Deterministic checks on generated code before any real terraform apply: HCL parsing,
+the target resource block, aws provider usage, placeholder values, the cached provider
+schema and `terraform fmt`/`validate` in a workspace with the cached provider
+"""
+
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+from .hcl import Attribute, Block, HCLParseError, parse_blocks, rewrite_strings
+
+# Resource meta-arguments that are not part of a resource's schema
+META_ARGUMENTS = ('count', 'for_each', 'provider', 'depends_on', 'lifecycle', 'provisioner', 'connection', 'timeouts')
+
+# Values that stand in for real IDs and never work in a real deployment
+PLACEHOLDER_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\b(vpc|subnet|sg|ami|igw|rtb|eni|vol|snap|i|nat|acl|tgw|key|lt)-(x{3,}[0-9a-z]*|0{8,}|12345678\w*)\b',
+    r'\b(123456789012|111122223333|000000000000)\b',
+    r'<[a-z][a-z0-9 _-]*>',
+    r'\b(replace[_-]?me|change[_-]?me|your[_-][a-z0-9_-]+|placeholder)\b',
+)]
+
+@dataclass
+class Finding:
+    """One pre-flight problem. Errors fail the gate; warnings are only reported."""
+    check: str
+    severity: str
+    message: str
+    line: Optional[int] = None
+
+    def format(self) -> str:
+        location = f" (line {self.line})" if self.line else ""
+        return f"[{self.severity}] {self.check}{location}: {self.message}"
+
+@dataclass
+class PreflightResult:
+    """Findings of all pre-flight checks for one piece of code."""
+    resource_name: str
+    findings: List[Finding] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def errors(self) -> List[Finding]:
+        return [finding for finding in self.findings if finding.severity == 'error']
+
+    @property
+    def passed(self) -> bool:
+        return not self.errors
+
+    def format_findings(self) -> str:
+        """Render the findings as feedback for the code generator."""
+        if not self.findings:
+            return "All pre-flight checks passed."
+        return '\n'.join(finding.format() for finding in self.findings)
+
+def _line(code: str, offset: int) -> int:
+    return code.count('\n', 0, max(0, offset)) + 1
+
+def check_target(blocks: List[Block], resource_name: str) -> List[Finding]:
+    """The code must declare the resource it is an example for."""
+    if any(block.type == 'resource' and block.labels[:1] == [resource_name] for block in blocks):
+        return []
+    return [Finding('target', 'error', f'No resource "{resource_name}" block; the example must create the target resource')]
+
+def check_aws_provider(code: str, blocks: List[Block], awscc_types: List[str]) -> List[Finding]:
+    """
+    Flag aws provider resources: errors where an awscc equivalent exists, warnings otherwise.
+
+    aws data sources (account ID, region, partition lookups) are allowed.
+    """
+    findings = []
+    for block in blocks:
+        if block.type != 'resource' or not block.labels or not block.labels[0].startswith('aws_'):
+            continue
+        equivalent = 'awscc_' + block.labels[0][len('aws_'):]
+        if equivalent in awscc_types:
+            findings.append(Finding(
+                'aws_provider', 'error',
+                f'Uses aws provider resource {block.labels[0]}; use {equivalent} instead', _line(code, block.start)
+            ))
+        else:
+            findings.append(Finding(
+                'aws_provider', 'warning',
+                f'Uses aws provider resource {block.labels[0]}; keep aws provider resources to a minimum',
+                _line(code, block.start)
+            ))
+    return findings
+
+def check_placeholders(code: str) -> List[Finding]:
+    """Find placeholder IDs, account numbers and <...> markers in string values."""
+    findings = []
+    seen = set()
+
+    def inspect(value: str) -> str:
+        # One finding per distinct string value is enough for the generator to fix it
+        match = next((m for pattern in PLACEHOLDER_PATTERNS for m in pattern.finditer(value)), None)
+        if match and value not in seen:
+            seen.add(value)
+            findings.append(Finding(
+                'placeholder', 'error',
+                f'Placeholder value "{match.group()}" in "{value[:80]}"; create the dependency or reference a real one',
+                _line(code, code.find(value))
+            ))
+        return value
+
+    rewrite_strings(code, inspect)
+    return findings
+
+def _argument_name(item) -> str:
+    """The schema argument an item sets; a `dynamic "name"` block generates `name` blocks."""
+    if isinstance(item, Attribute):
+        return item.name
+    if item.type == 'dynamic' and item.labels:
+        return item.labels[0]
+    return item.type
+
+def check_schema(code: str, blocks: List[Block], provider_version: str) -> List[Finding]:
+    """Check every awscc resource's arguments against the cached provider schema."""
+    from .provider_schema import get_resource_schema
+
+    findings = []
+    for block in blocks:
+        if block.type != 'resource' or not block.labels or not block.labels[0].startswith('awscc_'):
+            continue
+        resource_type = block.labels[0]
+        schema = get_resource_schema(resource_type, provider_version)
+        if schema is None:
+            findings.append(Finding(
+                'schema', 'error', f'{resource_type} is not a resource type of awscc {provider_version}', _line(code, block.start)
+            ))
+            continue
+
+        attributes = schema['attributes']
+        names = {_argument_name(item): item for item in block.items}
+        for name, item in names.items():
+            line = _line(code, item.start)
+            if name in META_ARGUMENTS:
+                continue
+            if name not in attributes:
+                findings.append(Finding('schema', 'error', f'{resource_type} has no argument "{name}"', line))
+            elif name in schema['computed']:
+                findings.append(Finding('schema', 'error', f'{resource_type}.{name} is read-only and cannot be set', line))
+        for name in schema['required']:
+            if name not in names:
+                findings.append(Finding(
+                    'schema', 'error', f'{resource_type} is missing required argument "{name}"', _line(code, block.start)
+                ))
+    return findings
+
+def check_terraform(code: str, provider_version: str) -> List[Finding]:
+    """Run terraform fmt and validate on the code in a workspace with the cached provider."""
+    from .terraform_runner import build_args, command_timeout, terraform_runner
+    from .terraform_workspace import workspace_pool
+
+    findings = []
+    with workspace_pool.checkout(provider_version) as work_dir:
+        with open(os.path.join(work_dir, 'main.tf'), 'w', encoding='utf-8') as f:
+            f.write(code)
+        try:
+            fmt = terraform_runner.run_sync(work_dir, build_args('fmt', '-check'), command_timeout('fmt'))
+            if not fmt.success:
+                # fmt -check lists unformatted files; diagnostics mean the code does not parse
+                if 'Error' in fmt.output:
+                    return [Finding('fmt', 'error', fmt.output.strip()[-1500:])]
+                findings.append(Finding('fmt', 'warning', 'Code is not in canonical terraform fmt style'))
+
+            init = terraform_runner.run_sync(work_dir, build_args('init'), command_timeout('init'))
+            if not init.success:
+                return findings + [Finding('init', 'error', init.output.strip()[-1500:] or 'terraform init failed')]
+
+            validate = terraform_runner.run_sync(work_dir, build_args('validate', '-json'), command_timeout('validate'))
+        except OSError as e:
+            return [Finding('validate', 'warning', f'terraform is not available, skipped fmt/validate: {e}')]
+
+    try:
+        diagnostics = json.loads(validate.output).get('diagnostics', [])
+    except ValueError:
+        diagnostics = [] if validate.success else [{'severity': 'error', 'summary': validate.output.strip()[-1500:]}]
+    for diagnostic in diagnostics:
+        message = diagnostic.get('summary', '')
+        if diagnostic.get('detail'):
+            message += f": {diagnostic['detail']}"
+        line = diagnostic.get('range', {}).get('start', {}).get('line')
+        findings.append(Finding('validate', diagnostic.get('severity', 'error'), message, line))
+    return findings
+
+def run_preflight(terraform_code: str, resource_name: str, provider_version: str) -> PreflightResult:
+    """
+    Run every pre-flight check on generated code.
+
+    Cheap checks run first; terraform fmt/validate only runs when they found no errors.
+
+    Args:
+        terraform_code: Generated Terraform code
+        resource_name: Target awscc resource type
+        provider_version: awscc provider version the code is for
+
+    Returns:
+        The result with all findings
+    """
+    from .provider_schema import build_schema_index
+
+    start = time.time()
+    result = PreflightResult(resource_name)
+    try:
+        blocks = parse_blocks(terraform_code)
+    except HCLParseError as e:
+        result.findings.append(Finding('parse', 'error', str(e)))
+        result.duration = time.time() - start
+        return result
+
+    index = build_schema_index(provider_version) or {}
+    result.findings.extend(check_target(blocks, resource_name))
+    result.findings.extend(check_aws_provider(terraform_code, blocks, index.get('resource_types', [])))
+    result.findings.extend(check_placeholders(terraform_code))
+    # Without any known resource types every resource would be rejected as unknown
+    if index.get('resource_types'):
+        result.findings.extend(check_schema(terraform_code, blocks, provider_version))
+    if result.passed:
+        result.findings.extend(check_terraform(terraform_code, provider_version))
+
+    result.duration = time.time() - start
+    icon = "✅" if result.passed else "❌"
+    print(f"{icon} Pre-flight for {resource_name}: {len(result.errors)} errors, "
+          f"{len(result.findings) - len(result.errors)} warnings ({result.duration:.1f}s)")
+    return result
@@ -0,0 +1,194 @@
+"""
+TANGO Multi-Agent Pipeline - Provider Schema Cache
+Local store of awscc resource schemas built from `terraform providers schema -json`,
+split into one small file per resource type for each provider version
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import config
+from .local_store import load_json, save_json
+from .terraform_workspace import workspace_pool
+
+AWSCC_PROVIDER = 'registry.terraform.io/hashicorp/awscc'
+INDEX_FILE = '_index.json'
+DESCRIPTION_MAX_CHARS = 160
+
+_build_locks: Dict[str, threading.Lock] = {}
+_build_locks_lock = threading.Lock()
+# Loaded resource schemas; misses are not cached, so a later index build can fill them
+_schemas: Dict[Tuple[str, str], Dict] = {}
+_schemas_lock = threading.Lock()
+
+def _type_name(cty_type: Any) -> str:
+    """Render a cty type from the schema JSON (e.g. ["list", "string"]) as text."""
+    if isinstance(cty_type, str):
+        return cty_type
+    if isinstance(cty_type, list) and len(cty_type) == 2:
+        kind, inner = cty_type
+        if kind == 'object':
+            return 'object'
+        return f"{kind} of {_type_name(inner)}"
+    return json.dumps(cty_type)
+
+def _summarize_attributes(attributes: Dict[str, Dict]) -> Dict[str, Dict]:
+    summary = {}
+    for name, attribute in attributes.items():
+        entry = {
+            'required': bool(attribute.get('required')),
+            'optional': bool(attribute.get('optional')),
+            'computed': bool(attribute.get('computed')),
+            'description': (attribute.get('description') or '').strip()[:DESCRIPTION_MAX_CHARS]
+        }
+        nested = attribute.get('nested_type')
+        if nested:
+            entry['type'] = f"{nested.get('nesting_mode', 'single')} of object"
+            entry['nested'] = _summarize_attributes(nested.get('attributes', {}))
+        else:
+            entry['type'] = _type_name(attribute.get('type'))
+        summary[name] = entry
+    return summary
+
+def _summarize_block(block: Dict) -> Dict[str, Dict]:
+    """Summarize a schema block's attributes and nested blocks into one attribute map."""
+    summary = _summarize_attributes(block.get('attributes', {}))
+    for name, block_type in block.get('block_types', {}).items():
+        summary[name] = {
+            'required': block_type.get('min_items', 0) > 0,
+            'optional': block_type.get('min_items', 0) == 0,
+            'computed': False,
+            'description': (block_type.get('block', {}).get('description') or '').strip()[:DESCRIPTION_MAX_CHARS],
+            'type': f"{block_type.get('nesting_mode', 'single')} block",
+            'nested': _summarize_block(block_type.get('block', {}))
+        }
+    return summary
+
+def summarize_resource_schema(resource_type: str, schema: Dict) -> Dict:
+    """Reduce one resource schema to its required, optional and computed attributes."""
+    attributes = _summarize_block(schema.get('block', {}))
+    return {
+        'resource_type': resource_type,
+        'required': sorted(name for name, entry in attributes.items() if entry['required']),
+        'optional': sorted(name for name, entry in attributes.items() if entry['optional']),
+        'computed': sorted(
+            name for name, entry in attributes.items()
+            if entry['computed'] and not entry['optional'] and not entry['required']
+        ),
+        'attributes': attributes
+    }
+
+def _schema_dir(provider_version: str) -> str:
+    return os.path.join(config.PROVIDER_SCHEMA_DIR, provider_version)
+
+def _build_lock(provider_version: str) -> threading.Lock:
+    with _build_locks_lock:
+        return _build_locks.setdefault(provider_version, threading.Lock())
+
+def build_schema_index(provider_version: str) -> Optional[Dict]:
+    """
+    Dump the provider schema for a version once and split it per resource type.
+
+    Uses the seed workspace of the workspace pool, which already has the provider installed.
+
+    Returns:
+        The index ({provider_version, built_at, resource_types}), or None if terraform is
+        unavailable or the dump has no awscc resource schemas
+    """
+    index_path = os.path.join(_schema_dir(provider_version), INDEX_FILE)
+    with _build_lock(provider_version):
+        index = load_json(index_path)
+        if index and index.get('resource_types'):
+            return index
+
+        seed_path = workspace_pool.seed(provider_version)
+        if not seed_path:
+            return None
+
+        print(f"📚 Building awscc {provider_version} schema index...")
+        try:
+            result = subprocess.run(
+                ['terraform', 'providers', 'schema', '-json'],
+                cwd=seed_path, check=True, capture_output=True, text=True,
+                timeout=config.PROVIDER_SCHEMA_TIMEOUT_SECONDS
+            )
+            schemas = json.loads(result.stdout)
+        except (OSError, subprocess.SubprocessError, ValueError) as e:
+            details = getattr(e, 'stderr', '') or str(e)
+            print(f"Warning: Could not read provider schema for {provider_version}: {details}")
+            return None
+
+        resource_schemas = schemas.get('provider_schemas', {}).get(AWSCC_PROVIDER, {}).get('resource_schemas', {})
+        if not resource_schemas:
+            # Saving an empty index would make every resource type look unknown until the cache is cleared
+            print(f"Warning: terraform providers schema returned no awscc resource schemas for {provider_version}")
+            return None
+        for resource_type, schema in resource_schemas.items():
+            save_json(
+                os.path.join(_schema_dir(provider_version), f"{resource_type}.json"),
+                summarize_resource_schema(resource_type, schema)
+            )
+
+        # The index is written last, so its presence means the split is complete
+        index = {
+            'provider_version': provider_version,
+            'built_at': int(time.time()),
+            'resource_types': sorted(resource_schemas)
+        }
+        save_json(index_path, index)
+        print(f"📚 Indexed {len(resource_schemas)} awscc resource schemas for {provider_version}")
+        return index
+
+def get_resource_schema(resource_type: str, provider_version: str) -> Optional[Dict]:
+    """
+    Return the summarized schema of one resource type, building the index on first use.
+
+    Returns:
+        The schema summary, or None if the type is unknown or the index cannot be built
+    """
+    key = (resource_type, provider_version)
+    with _schemas_lock:
+        if key in _schemas:
+            return _schemas[key]
+
+    path = os.path.join(_schema_dir(provider_version), f"{resource_type}.json")
+    schema = load_json(path)
+    if schema is None:
+        index = build_schema_index(provider_version)
+        if not index or resource_type not in index['resource_types']:
+            return None
+        schema = load_json(path)
+    if schema is not None:
+        with _schemas_lock:
+            _schemas[key] = schema
+    return schema
+
+def _format_attributes(attributes: Dict[str, Dict], names: List[str], indent: int) -> List[str]:
+    lines = []
+    for name in names:
+        entry = attributes[name]
+        flags = 'required' if entry['required'] else 'optional'
+        description = f": {entry['description']}" if entry['description'] and indent == 2 else ''
+        lines.append(f"{' ' * indent}- {name} ({entry['type']}, {flags}){description}")
+        nested = entry.get('nested')
+        if nested:
+            settable = [n for n, e in nested.items() if e['required'] or e['optional']]
+            lines.extend(_format_attributes(nested, sorted(settable, key=lambda n: not nested[n]['required']), indent + 4))
+    return lines
+
+def format_schema_for_prompt(schema: Dict, provider_version: str) -> str:
+    """Render a schema summary as compact prompt text, required arguments first."""
+    attributes = schema['attributes']
+    lines = [f"Schema for {schema['resource_type']} (awscc {provider_version}):"]
+    if schema['required']:
+        lines.append("Required arguments (must all be set):")
+        lines.extend(_format_attributes(attributes, schema['required'], 2))
+    if schema['optional']:
+        lines.append("Optional arguments:")
+        lines.extend(_format_attributes(attributes, schema['optional'], 2))
+    if schema['computed']:
+        lines.append(f"Read-only attributes (never set these): {', '.join(schema['computed'])}")
+    return '\n'.join(lines)
@@ -0,0 +1,218 @@
+"""
+TANGO Multi-Agent Pipeline - Resource Scheduler
+Dispatches resources to the worker pool under token-bucket limits per AWS service
+(the `<service>` in `awscc_<service>_...`) and per region, taking services in turn so
+one large service cannot starve the others, and reports where the limits held work back
+"""
+
+import queue
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional
+import config
+
+def service_prefix(resource_name: str) -> str:
+    """Return the AWS service of a resource type, e.g. awscc_ec2_vpc -> ec2."""
+    parts = resource_name.split('_')
+    return parts[1] if len(parts) > 2 and parts[0] == 'awscc' else 'default'
+
+def parse_rates(spec: str) -> Dict[str, float]:
+    """Parse 'iam=2,ec2=4,default=6' into starts per minute per service."""
+    rates = {}
+    for item in spec.split(','):
+        name, _, rate = item.partition('=')
+        if name.strip() and rate.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+class TokenBucket:
+    """Token bucket refilled at rate_per_minute and holding at most burst tokens (0 means unlimited)."""
+
+    def __init__(self, rate_per_minute: float, burst: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        if self.rate > 0:
+            self._refill(now)
+            self.tokens -= 1
+
+@dataclass
+class ServiceMetrics:
+    """Per-service scheduling counters (wait times in seconds)."""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    service_limited: int = 0
+    region_limited: int = 0
+    queue_wait: float = 0.0
+    throttle_wait: float = 0.0
+    max_queue_wait: float = 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'service_limited': self.service_limited,
+            'region_limited': self.region_limited,
+            'queue_wait': round(self.queue_wait, 1),
+            'throttle_wait': round(self.throttle_wait, 1),
+            'max_queue_wait': round(self.max_queue_wait, 1)
+        }
+
+class ResourceScheduler:
+    """
+    Runs resources on a fixed pool of workers, starting each one only when both
+    its service bucket and its region bucket have a token.
+
+    Pending resources are queued per service and services are taken round-robin,
+    so a backlog of one service is interleaved with the others instead of draining
+    first. A service held back by its own limit does not block other services.
+    """
+
+    def __init__(self, workers: int, service_rates: Optional[Dict[str, float]] = None,
+                 region_rate: Optional[float] = None, burst: Optional[float] = None):
+        self.workers = max(1, workers)
+        self.service_rates = service_rates if service_rates is not None else parse_rates(config.SCHEDULER_SERVICE_RATES)
+        self.region_rate = config.SCHEDULER_REGION_RATE if region_rate is None else region_rate
+        self.burst = config.SCHEDULER_BURST if burst is None else burst
+        self._service_buckets: Dict[str, TokenBucket] = {}
+        self._region_buckets: Dict[str, TokenBucket] = {}
+        self.metrics: Dict[str, ServiceMetrics] = {}
+
+    def _service_bucket(self, service: str) -> TokenBucket:
+        if service not in self._service_buckets:
+            rate = self.service_rates.get(service, self.service_rates.get('default', 0))
+            self._service_buckets[service] = TokenBucket(rate, self.burst)
+        return self._service_buckets[service]
+
+    def _region_bucket(self, region: str) -> TokenBucket:
+        if region not in self._region_buckets:
+            self._region_buckets[region] = TokenBucket(self.region_rate, self.burst)
+        return self._region_buckets[region]
+
+    def run(self, resources: List[Dict[str, str]], worker: Callable[[Dict[str, str]], Dict],
+            on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Run worker(resource) for every resource under the scheduling limits.
+
+        Args:
+            resources: Resources with resource_name and optionally region
+            worker: Function processing one resource and returning a result dict with "success"
+            on_result: Called in the dispatching thread as each result arrives
+
+        Returns:
+            Worker results in completion order, each with service, region and queue_wait added
+        """
+        pending: "OrderedDict[str, Deque[Dict]]" = OrderedDict()
+        for resource in resources:
+            service = service_prefix(resource['resource_name'])
+            pending.setdefault(service, deque()).append({
+                'resource': resource,
+                'region': resource.get('region') or config.AWS_REGION,
+                'enqueued': time.monotonic(),
+                'blocked': None
+            })
+            self.metrics.setdefault(service, ServiceMetrics()).submitted += 1
+        order = deque(pending)
+        finished: "queue.Queue[Dict]" = queue.Queue()
+        results: List[Dict] = []
+        in_flight = 0
+
+        def execute(entry: Dict, service: str, queue_wait: float) -> None:
+            try:
+                result = worker(entry['resource'])
+            except Exception as e:
+                result = {'resource_name': entry['resource']['resource_name'], 'success': False, 'error': str(e)}
+            finished.put({**result, 'service': service, 'region': entry['region'], 'queue_wait': queue_wait})
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while order or in_flight:
+                next_ready = None
+                if order and in_flight < self.workers:
+                    now = time.monotonic()
+                    for _ in range(len(order)):
+                        service = order[0]
+                        order.rotate(-1)
+                        entry = pending[service][0]
+                        service_wait = self._service_bucket(service).wait_time(now)
+                        region_wait = self._region_bucket(entry['region']).wait_time(now)
+                        if service_wait or region_wait:
+                            if entry['blocked'] is None:
+                                entry['blocked'] = now
+                                metrics = self.metrics[service]
+                                if service_wait >= region_wait:
+                                    metrics.service_limited += 1
+                                else:
+                                    metrics.region_limited += 1
+                            wait = max(service_wait, region_wait)
+                            next_ready = wait if next_ready is None else min(next_ready, wait)
+                            continue
+
+                        self._service_bucket(service).take(now)
+                        self._region_bucket(entry['region']).take(now)
+                        pending[service].popleft()
+                        if not pending[service]:
+                            del pending[service]
+                            order.remove(service)
+                        metrics = self.metrics[service]
+                        queue_wait = now - entry['enqueued']
+                        metrics.queue_wait += queue_wait
+                        metrics.max_queue_wait = max(metrics.max_queue_wait, queue_wait)
+                        if entry['blocked'] is not None:
+                            metrics.throttle_wait += now - entry['blocked']
+                        executor.submit(execute, entry, service, queue_wait)
+                        in_flight += 1
+                        next_ready = 0
+                        break
+                    if next_ready == 0:
+                        continue
+
+                # Wait for a worker to finish, or until the next token is due
+                try:
+                    result = finished.get(timeout=next_ready if in_flight < self.workers else None)
+                except queue.Empty:
+                    continue
+                in_flight -= 1
+                metrics = self.metrics[result['service']]
+                if result.get('success'):
+                    metrics.completed += 1
+                else:
+                    metrics.failed += 1
+                results.append(result)
+                if on_result:
+                    on_result(result)
+        return results
+
+    def report(self) -> Dict[str, Dict]:
+        """Metrics per service as plain dicts."""
+        return {service: metrics.as_dict() for service, metrics in sorted(self.metrics.items())}
+
+    def print_report(self) -> None:
+        """Print per-service counters, flagging services that waited on a limit."""
+        print("\n📊 Scheduler metrics per service")
+        print(f"   {'service':<20} {'done':>5} {'failed':>6} {'limited':>8} {'queue wait':>11} {'throttled':>10}")
+        for service, metrics in sorted(self.metrics.items()):
+            limited = metrics.service_limited + metrics.region_limited
+            icon = "⏳" if limited else "  "
+            print(
+                f"{icon} {service:<20} {metrics.completed:>5} {metrics.failed:>6} {limited:>8} "
+                f"{metrics.queue_wait:>10.0f}s {metrics.throttle_wait:>9.0f}s"
+            )
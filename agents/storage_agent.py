@@ -5,11 +5,62 @@ Specialized agent for storing pipeline results in DynamoDB and S3 (both success
 
 import json
 import os
-import boto3
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from strands import Agent, tool
+from functools import lru_cache
+from typing import Dict, Optional
+from strands import tool
 from strands_tools import python_repl, use_aws
 import config
+from .agent_factory import checkout_agent, get_client
+from .latest_status import write_with_history
+
+GENERIC_TEMPLATE_KEY = 'templates/resources/generic_resource.md.tmpl'
+
+@lru_cache(maxsize=1)
+def load_generic_template() -> str:
+    """Read the generic resource template once per process, from S3 or the local copy."""
+    try:
+        response = get_client('s3').get_object(
+            Bucket=config.S3_BUCKET,
+            Key=GENERIC_TEMPLATE_KEY
+        )
+        return response['Body'].read().decode('utf-8')
+    except Exception as e:
+        print(f"Warning: Could not read template from S3 ({e}), using local copy")
+        with open(os.path.join(config.BASE_DIR, GENERIC_TEMPLATE_KEY), 'r', encoding='utf-8') as f:
+            return f.read()
+
+def render_template(service_name: str, description: str, heading: str) -> str:
+    """
+    Replace template variables in the generic template.
+    
+    Raises:
+        ValueError: If the processed template is not in the expected format
+    """
+    replacements = {
+        "Description about the first example": description,
+        "First example": heading,
+        "SERVICE_NAME": service_name
+    }
+    
+    processed_content = load_generic_template()
+    for old_text, new_text in replacements.items():
+        processed_content = processed_content.replace(old_text, new_text)
+    
+    if "{{ tffile" not in processed_content:
+        raise ValueError("Template processing failed - missing {{ tffile }} pattern")
+        
+    if "resource \"" in processed_content and "{{ tffile" in processed_content:
+        lines = processed_content.split('\n')
+        terraform_lines = [i for i, line in enumerate(lines) if "resource \"" in line]
+        tffile_lines = [i for i, line in enumerate(lines) if "{{ tffile" in line]
+        
+        if terraform_lines and tffile_lines:
+            raise ValueError("Template contains both embedded Terraform code and {{ tffile }} - this is incorrect")
+    
+    return processed_content
 
 def create_template_replacement_tool():
     """Create a programmatic template replacement tool"""
@@ -28,41 +79,127 @@ def create_template_replacement_tool():
             The processed template content
         """
         try:
-            s3_client = boto3.client('s3')
-            response = s3_client.get_object(
-                Bucket=config.S3_BUCKET,
-                Key='templates/resources/generic_resource.md.tmpl'
-            )
-            template_content = response['Body'].read().decode('utf-8')
-            
-            replacements = {
-                "Description about the first example": description,
-                "First example": heading,
-                "SERVICE_NAME": service_name
-            }
-            
-            processed_content = template_content
-            for old_text, new_text in replacements.items():
-                processed_content = processed_content.replace(old_text, new_text)
-            
-            if "{{ tffile" not in processed_content:
-                return "Error: Template processing failed - missing {{ tffile }} pattern"
-                
-            if "resource \"" in processed_content and "{{ tffile" in processed_content:
-                lines = processed_content.split('\n')
-                terraform_lines = [i for i, line in enumerate(lines) if "resource \"" in line]
-                tffile_lines = [i for i, line in enumerate(lines) if "{{ tffile" in line]
-                
-                if terraform_lines and tffile_lines:
-                    return "Error: Template contains both embedded Terraform code and {{ tffile }} - this is incorrect"
-            
-            return processed_content
-            
+            return render_template(service_name, description, heading)
+        except ValueError as e:
+            return f"Error: {str(e)}"
         except Exception as e:
             return f"Error in template replacement: {str(e)}"
     
     return template_replacer
 
+def _storage_keys(resource_name: str, status: str) -> Dict[str, str]:
+    """Build the fixed S3 keys for a resource, following dynamodb-schema.md."""
+    service_name = resource_name.replace("awscc_", "", 1)
+    prefix = "examples" if status == "success" else "failed"
+    return {
+        "s3_terraform_link": f"{prefix}/resources/{resource_name}/{service_name}.tf",
+        "s3_template_link": f"templates/resources/{resource_name}.md.tmpl"
+    }
+
+def store_results(resource_name: str, status: str, terraform_code: str, s3_analysis_link: str = "none",
+                  description: Optional[str] = None, heading: Optional[str] = None,
+                  extra_attributes: Optional[Dict[str, str]] = None,
+                  trace_summary: Optional[Dict[str, Dict[str, int]]] = None,
+                  provider_version: Optional[str] = None) -> Dict:
+    """
+    Store pipeline results directly in DynamoDB and S3.
+    
+    Uploads the .tf file and resource template concurrently, then writes a history
+    item and updates the resource's latest status item in one transaction, following
+    dynamodb-schema.md. History items are kept.
+    
+    Args:
+        resource_name: AWS CloudControl resource name (e.g., "awscc_s3_bucket")
+        status: "success" or "failed"
+        terraform_code: Cleaned terraform code
+        s3_analysis_link: S3 path to the validation analysis
+        description: Example description for the template
+        heading: Example heading for the template
+        extra_attributes: Optional string attributes to add to the DynamoDB item
+        trace_summary: Optional per-stage tracing summary (stage -> numeric fields)
+        provider_version: awscc provider version the code was validated with
+        
+    Returns:
+        The stored DynamoDB record
+        
+    Raises:
+        LeaseLost: If this worker's lease on the resource was lost; nothing is written
+    """
+    from .leases import lease_manager
+    
+    lease_manager.check(resource_name)
+    status = "success" if status == "success" else "failed"
+    service_name = resource_name.replace("awscc_", "", 1)
+    readable_name = service_name.replace("_", " ")
+    template = render_template(
+        service_name,
+        description or f"To create a {readable_name} with the minimal required configuration",
+        heading or "Basic example"
+    )
+    keys = _storage_keys(resource_name, status)
+    
+    s3 = get_client('s3')
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(s3.put_object, Bucket=config.S3_BUCKET, Key=keys["s3_terraform_link"],
+                            Body=terraform_code.encode('utf-8'), ContentType='text/plain'),
+            executor.submit(s3.put_object, Bucket=config.S3_BUCKET, Key=keys["s3_template_link"],
+                            Body=template.encode('utf-8'), ContentType='text/plain')
+        ]
+        for future in futures:
+            future.result()
+    
+    record = {
+        "resource_name": resource_name,
+        "timestamp": str(int(time.time())),
+        "status": status,
+        "s3_analysis_link": s3_analysis_link or "none",
+        "provider_version": provider_version or "",
+        **keys,
+        **(extra_attributes or {})
+    }
+    item = {name: {'S': value} for name, value in record.items() if value}
+    item['timestamp'] = {'N': record['timestamp']}
+    if trace_summary:
+        record['trace_summary'] = trace_summary
+        item['trace_summary'] = {'M': {
+            stage: {'M': {name: {'N': str(value)} for name, value in fields.items()}}
+            for stage, fields in trace_summary.items()
+        }}
+    write_with_history(item, record)
+    return record
+
+def format_storage_summary(record: Dict[str, str]) -> str:
+    """Format a stored record like the storage agent's execution summary."""
+    status = record["status"].upper()
+    return "\n".join([
+        f"PIPELINE EXECUTION {status}",
+        "=" * 40,
+        f"Resource: {record['resource_name']}",
+        f"Status: {status}",
+        "",
+        "Storage:",
+        f"- Stored Terraform code in S3 at {record['s3_terraform_link']}",
+        f"- Stored template in S3 at {record['s3_template_link']}",
+        f"- Stored validation analysis in S3 at {record['s3_analysis_link']}",
+        "- Logged execution details to DynamoDB with S3 links",
+        "=" * 40
+    ])
+
+def _parse_storage_request(storage_request: str) -> Optional[Dict]:
+    """Parse a structured storage request, or return None for free-form requests."""
+    try:
+        request = json.loads(storage_request)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(request, dict):
+        return None
+    if not all(request.get(field) for field in ("resource_name", "status", "terraform_code")):
+        return None
+    return request
+
+template_replacer = create_template_replacement_tool()
+
 STORAGE_SYSTEM_PROMPT = """
 You are a specialized storage agent for pipeline results and template generation.
 
@@ -92,7 +229,7 @@ DYNAMODB SCHEMA ({config.DYNAMODB_TABLE} table):
 WORKFLOW:
 1. Extract service name from resource_name (remove "awscc_" prefix)
 2. Extract validation results and S3 analysis link from input
-3. Clean up old entries: Query DynamoDB for existing entries with same resource_name and delete them
+3. Keep old entries: never delete existing entries for the resource, they are the run history
 4. Use the template_replacer tool to create the resource-specific template:
    - Reads generic template from S3: s3://{config.S3_BUCKET}/templates/resources/generic_resource.md.tmpl
    - Pass the resource_name, service_name, a brief description, and a descriptive heading
@@ -107,7 +244,12 @@ WORKFLOW:
    - s3_terraform_link
    - s3_template_link
    - s3_analysis_link (from validation agent)
-8. Return structured summary
+8. Update the latest status item in the same call using transact_write_items (Put the new entry and
+   Put the latest item together):
+   - resource_name (partition key), timestamp = 0, item_type = "latest"
+   - last_timestamp (the new entry's timestamp), status, provider_version, s3_terraform_link,
+     s3_template_link, s3_analysis_link
+9. Return structured summary
 
 TEMPLATE REPLACEMENT EXAMPLES:
 - For awscc_s3_bucket: description="Create an S3 bucket with versioning and encryption", heading="Create an S3 bucket"
@@ -134,13 +276,33 @@ def storage_agent(storage_request: str) -> str:
     Store pipeline results in DynamoDB and S3, generate resource-specific templates.
 
     Args:
-        storage_request: JSON string with execution results
+        storage_request: JSON object with resource_name, status, terraform_code and
+            s3_analysis_link (optionally provider_version, failed_agent, error, error_class,
+            failure_reason, budget_usage, description, heading).
+            Free-form requests are handled by the storage model.
 
     Returns:
         Storage confirmation with DynamoDB and S3 locations
     """
     try:
-        template_replacer = create_template_replacement_tool()
+        request = _parse_storage_request(storage_request)
+        if request is not None:
+            extra_attributes = {
+                field: str(request[field])[:1000]
+                for field in ("failed_agent", "error", "error_class", "failure_reason", "budget_usage")
+                if request.get(field)
+            }
+            record = store_results(
+                resource_name=request["resource_name"],
+                status=request["status"],
+                terraform_code=request["terraform_code"],
+                s3_analysis_link=request.get("s3_analysis_link", "none"),
+                description=request.get("description"),
+                heading=request.get("heading"),
+                extra_attributes=extra_attributes,
+                provider_version=request.get("provider_version")
+            )
+            return format_storage_summary(record)
         
         # Create system prompt with actual config values
         system_prompt = STORAGE_SYSTEM_PROMPT.replace(
@@ -151,12 +313,8 @@ def storage_agent(storage_request: str) -> str:
             "{config.DYNAMODB_TABLE}", config.DYNAMODB_TABLE
         )
         
-        agent = Agent(
-            system_prompt=system_prompt,
-            tools=[use_aws, python_repl, template_replacer]
-        )
-        
-        response = agent(storage_request)
+        with checkout_agent("storage", system_prompt, [use_aws, python_repl, template_replacer]) as agent:
+            response = agent(storage_request)
         return str(response)
     except Exception as e:
         return f"Error in storage agent: {str(e)}"
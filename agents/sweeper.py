@@ -0,0 +1,311 @@
+"""
+TANGO Multi-Agent Pipeline - Resource Sweeper
+Deterministic cleanup of resources left behind by example deployments: candidates are
+found through the Resource Groups Tagging API in every sweep region, resources that may
+belong to a deployment still in flight are held back, the rest are deleted through
+Cloud Control in dependency order with concurrency and retries, and every run is
+appended to a ledger
+
+Usage:
+    python -m agents.sweeper [--dry-run] [--region REGION ...]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+import config
+from .agent_factory import get_client
+from .fixtures import FIXTURE_TAG_KEY
+from .local_store import load_json, save_json
+from .terraform_workspace import tracked_identifiers, workspace_pool
+
+EXAMPLE_TAG = ('Environment', 'example')
+EXAMPLE_NAME_PREFIX = 'example-'
+RESOURCES_PER_PAGE = 100
+
+# Cloud Control error codes worth retrying (the dependency may be deleted by a later attempt)
+RETRYABLE_ERRORS = ('Throttling', 'ThrottlingException', 'ConcurrentOperationException', 'ServiceInternalError',
+                    'NetworkFailure', 'ResourceConflict', 'ServiceLimitExceeded', 'GeneralServiceException',
+                    'NotStabilized')
+
+def _last_segment(resource: str) -> str:
+    return resource.split('/')[-1]
+
+def _after_colon(resource: str) -> str:
+    return resource.split(':', 1)[1].removesuffix(':*')
+
+# (ARN service, resource type) -> (CloudFormation type, deletion rank, ARN resource part -> identifier).
+# Lower ranks are deleted first: workloads, then attachments, then network building blocks, then VPCs.
+DELETABLE_TYPES: Dict[Tuple[str, str], Tuple[str, int, Callable[[str, Dict], str]]] = {
+    ('ec2', 'instance'): ('AWS::EC2::Instance', 0, lambda r, a: _last_segment(r)),
+    ('ec2', 'natgateway'): ('AWS::EC2::NatGateway', 0, lambda r, a: _last_segment(r)),
+    ('ec2', 'launch-template'): ('AWS::EC2::LaunchTemplate', 0, lambda r, a: _last_segment(r)),
+    ('lambda', 'function'): ('AWS::Lambda::Function', 0, lambda r, a: _after_colon(r)),
+    ('dynamodb', 'table'): ('AWS::DynamoDB::Table', 0, lambda r, a: _last_segment(r)),
+    ('sns', ''): ('AWS::SNS::Topic', 0, lambda r, a: a['arn']),
+    ('sqs', ''): ('AWS::SQS::Queue', 0, lambda r, a: f"https://sqs.{a['region']}.amazonaws.com/{a['account']}/{r}"),
+    ('logs', 'log-group'): ('AWS::Logs::LogGroup', 0, lambda r, a: _after_colon(r)),
+    ('ecr', 'repository'): ('AWS::ECR::Repository', 0, lambda r, a: _last_segment(r)),
+    ('s3', ''): ('AWS::S3::Bucket', 0, lambda r, a: r),
+    ('kms', 'key'): ('AWS::KMS::Key', 0, lambda r, a: _last_segment(r)),
+    ('elasticloadbalancing', 'loadbalancer'): ('AWS::ElasticLoadBalancingV2::LoadBalancer', 0, lambda r, a: a['arn']),
+    ('ec2', 'network-interface'): ('AWS::EC2::NetworkInterface', 1, lambda r, a: _last_segment(r)),
+    ('ec2', 'volume'): ('AWS::EC2::Volume', 1, lambda r, a: _last_segment(r)),
+    ('ec2', 'vpc-endpoint'): ('AWS::EC2::VPCEndpoint', 1, lambda r, a: _last_segment(r)),
+    ('ec2', 'elastic-ip'): ('AWS::EC2::EIP', 1, lambda r, a: _last_segment(r)),
+    ('ec2', 'security-group'): ('AWS::EC2::SecurityGroup', 2, lambda r, a: _last_segment(r)),
+    ('ec2', 'subnet'): ('AWS::EC2::Subnet', 2, lambda r, a: _last_segment(r)),
+    ('ec2', 'route-table'): ('AWS::EC2::RouteTable', 2, lambda r, a: _last_segment(r)),
+    ('ec2', 'network-acl'): ('AWS::EC2::NetworkAcl', 2, lambda r, a: _last_segment(r)),
+    ('ec2', 'internet-gateway'): ('AWS::EC2::InternetGateway', 2, lambda r, a: _last_segment(r)),
+    ('ec2', 'vpc'): ('AWS::EC2::VPC', 3, lambda r, a: _last_segment(r)),
+}
+
+@dataclass
+class Candidate:
+    """A tagged resource found by the sweep and what happened to it."""
+    arn: str
+    region: str
+    tags: Dict[str, str]
+    type_name: Optional[str] = None
+    identifier: Optional[str] = None
+    rank: int = 0
+    status: str = 'pending'
+    attempts: int = 0
+    error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.tags.get('Name', self.arn)
+
+@dataclass
+class SweepRun:
+    """One sweep, as written to the ledger."""
+    run_id: str
+    regions: List[str]
+    dry_run: bool
+    started_at: float
+    finished_at: Optional[float] = None
+    candidates: List[Candidate] = field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for candidate in self.candidates:
+            counts[candidate.status] = counts.get(candidate.status, 0) + 1
+        return counts
+
+    def leftovers(self) -> List[Candidate]:
+        """Candidates the sweep could not delete (unsupported types and failures), never held-back ones."""
+        return [c for c in self.candidates if c.status in ('unsupported', 'failed')]
+
+def parse_arn(arn: str) -> Dict[str, str]:
+    """Split an ARN into partition, service, region, account, resource type and resource."""
+    parts = arn.split(':', 5)
+    resource = parts[5] if len(parts) > 5 else ''
+    positions = [index for index in (resource.find('/'), resource.find(':')) if index >= 0]
+    resource_type = resource[:min(positions)] if positions else ''
+    return {
+        'arn': arn, 'service': parts[2], 'region': parts[3], 'account': parts[4],
+        'resource_type': resource_type, 'resource': resource
+    }
+
+def is_sweepable(tags: Dict[str, str]) -> bool:
+    """Only example resources are swept, and never the shared fixtures."""
+    if FIXTURE_TAG_KEY in tags:
+        return False
+    return tags.get(EXAMPLE_TAG[0]) == EXAMPLE_TAG[1] and tags.get('Name', '').startswith(EXAMPLE_NAME_PREFIX)
+
+def find_candidates(region: str) -> List[Candidate]:
+    """List every example-tagged resource in a region, following all result pages."""
+    tagging = get_client('resourcegroupstaggingapi', region)
+    candidates = []
+    request = {'TagFilters': [{'Key': EXAMPLE_TAG[0], 'Values': [EXAMPLE_TAG[1]]}], 'ResourcesPerPage': RESOURCES_PER_PAGE}
+    while True:
+        response = tagging.get_resources(**request)
+        for mapping in response.get('ResourceTagMappingList', []):
+            tags = {tag['Key']: tag['Value'] for tag in mapping.get('Tags', [])}
+            if not is_sweepable(tags):
+                continue
+            candidate = Candidate(arn=mapping['ResourceARN'], region=region, tags=tags)
+            arn = parse_arn(candidate.arn)
+            deletable = DELETABLE_TYPES.get((arn['service'], arn['resource_type']))
+            if deletable:
+                candidate.type_name, candidate.rank, identifier = deletable
+                candidate.identifier = identifier(arn['resource'], {**arn, 'region': arn['region'] or region})
+            else:
+                candidate.status = 'unsupported'
+            candidates.append(candidate)
+        token = response.get('PaginationToken')
+        if not token:
+            return candidates
+        request['PaginationToken'] = token
+
+_sightings_lock = threading.Lock()
+
+def _record_sightings(candidates: List[Candidate], regions: List[str], now: float) -> Dict[str, float]:
+    """Remember when each candidate was first seen, forgetting resources gone from the swept regions."""
+    with _sightings_lock:
+        sightings = load_json(config.SWEEP_SIGHTINGS_FILE, {}) or {}
+        kept = {arn: seen for arn, seen in sightings.items() if parse_arn(arn)['region'] not in regions}
+        kept.update({c.arn: sightings.get(c.arn, now) for c in candidates})
+        try:
+            save_json(config.SWEEP_SIGHTINGS_FILE, kept)
+        except OSError as e:
+            print(f"Warning: Could not save sweep sightings: {e}")
+        return kept
+
+def hold_back(candidates: List[Candidate], regions: List[str], now: Optional[float] = None) -> None:
+    """
+    Keep resources that may belong to a deployment still in flight out of the sweep.
+
+    Resources tracked by the state of a workspace a stage has checked out are marked
+    'in_use'. Resources first seen less than SWEEP_MIN_AGE_SECONDS ago are marked
+    'too_recent', which also covers resources a running apply has created but not yet
+    written to its state, and deployments running in other processes.
+    """
+    now = time.time() if now is None else now
+    in_use = set()
+    for work_dir in workspace_pool.active():
+        try:
+            in_use |= tracked_identifiers(work_dir)
+        except (OSError, ValueError):
+            continue
+    sightings = _record_sightings(candidates, regions, now)
+    for candidate in candidates:
+        if candidate.arn in in_use or candidate.identifier in in_use:
+            candidate.status = 'in_use'
+        elif now - sightings.get(candidate.arn, now) < config.SWEEP_MIN_AGE_SECONDS:
+            candidate.status = 'too_recent'
+
+def deletion_waves(candidates: List[Candidate]) -> List[List[Candidate]]:
+    """
+    Order deletable candidates into waves by rank.
+
+    Every resource in a wave may depend only on resources in later waves, so a wave's
+    resources can be deleted concurrently once the previous waves are done.
+    """
+    ranks = sorted({c.rank for c in candidates if c.status == 'pending'})
+    return [[c for c in candidates if c.status == 'pending' and c.rank == rank] for rank in ranks]
+
+def _wait_for_request(cloudcontrol, token: str, timeout: float) -> Dict:
+    deadline = time.time() + timeout
+    while True:
+        progress = cloudcontrol.get_resource_request_status(RequestToken=token)['ProgressEvent']
+        if progress['OperationStatus'] in ('SUCCESS', 'FAILED', 'CANCEL_COMPLETE'):
+            return progress
+        if time.time() > deadline:
+            return {**progress, 'OperationStatus': 'FAILED', 'ErrorCode': 'NotStabilized',
+                    'StatusMessage': f"Delete did not finish within {timeout:.0f}s"}
+        time.sleep(2)
+
+def delete_candidate(candidate: Candidate) -> Candidate:
+    """Delete one resource through Cloud Control, retrying throttling and dependency conflicts."""
+    cloudcontrol = get_client('cloudcontrol', candidate.region)
+    while candidate.attempts < config.SWEEP_MAX_ATTEMPTS:
+        candidate.attempts += 1
+        try:
+            response = cloudcontrol.delete_resource(TypeName=candidate.type_name, Identifier=candidate.identifier)
+            progress = _wait_for_request(
+                cloudcontrol, response['ProgressEvent']['RequestToken'], config.SWEEP_DELETE_TIMEOUT_SECONDS
+            )
+            error_code = progress.get('ErrorCode')
+            message = progress.get('StatusMessage')
+        except cloudcontrol.exceptions.ResourceNotFoundException:
+            progress, error_code, message = {'OperationStatus': 'SUCCESS'}, None, None
+        except Exception as e:
+            progress, message = {'OperationStatus': 'FAILED'}, str(e)
+            error_code = (getattr(e, 'response', None) or {}).get('Error', {}).get('Code') or type(e).__name__
+
+        if progress['OperationStatus'] == 'SUCCESS' or error_code == 'NotFound':
+            candidate.status, candidate.error = 'deleted', None
+            return candidate
+        candidate.error = f"{error_code}: {message}"
+        if error_code not in RETRYABLE_ERRORS and 'DependencyViolation' not in (message or ''):
+            break
+        time.sleep(min(2 ** candidate.attempts, 30))
+    candidate.status = 'failed'
+    return candidate
+
+def _append_ledger(run: SweepRun) -> None:
+    if not config.SWEEP_LEDGER_FILE:
+        return
+    os.makedirs(os.path.dirname(config.SWEEP_LEDGER_FILE) or '.', exist_ok=True)
+    entry = {**asdict(run), 'counts': run.counts()}
+    with open(config.SWEEP_LEDGER_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, default=str) + '\n')
+
+def sweep(regions: Optional[List[str]] = None, dry_run: bool = False) -> SweepRun:
+    """
+    Find and delete example resources in every sweep region.
+
+    Args:
+        regions: Regions to sweep (defaults to SWEEP_REGIONS)
+        dry_run: Only list what would be deleted
+
+    Returns:
+        The sweep run, also appended to the ledger
+    """
+    regions = regions or [region.strip() for region in config.SWEEP_REGIONS.split(',') if region.strip()]
+    run = SweepRun(run_id=uuid.uuid4().hex[:12], regions=regions, dry_run=dry_run, started_at=time.time())
+
+    with ThreadPoolExecutor(max_workers=max(1, len(regions))) as executor:
+        for candidates in executor.map(find_candidates, regions):
+            run.candidates.extend(candidates)
+    hold_back(run.candidates, regions, run.started_at)
+    held = sum(1 for c in run.candidates if c.status in ('in_use', 'too_recent'))
+    print(f"🧹 Sweep {run.run_id}: {len(run.candidates)} example resources in {', '.join(regions)}"
+          + (f", {held} held back as possibly in flight" if held else ""))
+
+    if dry_run:
+        for candidate in run.candidates:
+            candidate.status = 'would_delete' if candidate.status == 'pending' else candidate.status
+    else:
+        lock = threading.Lock()
+
+        def delete(candidate: Candidate) -> None:
+            delete_candidate(candidate)
+            icon = "🗑️" if candidate.status == 'deleted' else "❌"
+            with lock:
+                print(f"{icon} {candidate.type_name} {candidate.identifier} ({candidate.region}): {candidate.status}"
+                      + (f" - {candidate.error}" if candidate.error and candidate.status == 'failed' else ""))
+
+        with ThreadPoolExecutor(max_workers=max(1, config.SWEEP_CONCURRENCY)) as executor:
+            for wave in deletion_waves(run.candidates):
+                list(executor.map(delete, wave))
+
+    run.finished_at = time.time()
+    try:
+        _append_ledger(run)
+    except OSError as e:
+        print(f"Warning: Could not write sweep ledger: {e}")
+    return run
+
+def format_sweep_report(run: SweepRun) -> str:
+    """Summarize a sweep run for logs and the cleanup agent."""
+    counts = ', '.join(f"{status}: {count}" for status, count in sorted(run.counts().items())) or 'nothing found'
+    lines = [f"Sweep {run.run_id} in {', '.join(run.regions)} ({counts})"]
+    for candidate in run.candidates:
+        if candidate.status != 'deleted':
+            detail = f" - {candidate.error}" if candidate.error else ""
+            lines.append(f"- {candidate.status}: {candidate.arn} ({candidate.name}){detail}")
+    return '\n'.join(lines)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Delete example resources left behind by pipeline runs")
+    parser.add_argument('--dry-run', action='store_true', help='Only list what would be deleted')
+    parser.add_argument('--region', action='append', dest='regions', help='Region to sweep (repeatable)')
+    args = parser.parse_args(argv)
+
+    run = sweep(args.regions, dry_run=args.dry_run)
+    print(format_sweep_report(run))
+    return 1 if any(c.status == 'failed' for c in run.candidates) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
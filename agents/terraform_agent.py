@@ -3,8 +3,15 @@ TANGO Multi-Agent Pipeline - Terraform Agent
 Specialized agent for executing Terraform lifecycle operations with real AWS deployment
 """
 
-from strands import Agent, tool
-from strands_tools import python_repl, shell
+from strands import tool
+from strands_tools import python_repl
+from .agent_factory import checkout_agent
+from .terraform_runner import terraform
+from .budget import BudgetExhausted, enforce_stage_budget
+from .error_classifier import pop_failures
+from .fixtures import prepare_workspace
+from .hcl import extract_terraform_code
+from .terraform_workspace import workspace_pool, extract_provider_version, extract_resource_name, extract_work_dir
 
 TERRAFORM_SYSTEM_PROMPT = """
 You are a specialized Terraform validation agent for AWS CloudControl resources.
@@ -23,18 +30,22 @@ CRITICAL PROVIDER REQUIREMENTS:
 
 MANDATORY STEPS (IN ORDER):
 1. Extract terraform code and provider version from input
-2. Create test directory and main.tf with terraform code
-3. **ADD DEPENDENCY RESOURCES IF NECESSARY** - If the target resource references non-existent resources (like volume_id, vpc_id, subnet_id), create the required supporting AWSCC resources and use proper resource references
+2. Write main.tf with terraform code into the pre-initialized working directory given in the input
+3. **ADD DEPENDENCY RESOURCES IF NECESSARY** - If the target resource references non-existent resources (like volume_id, vpc_id, subnet_id), use the shared fixture variables when they are provided; otherwise create the required supporting AWSCC resources and use proper resource references
 4. terraform init
 5. terraform validate (fix syntax errors if needed)
 6. terraform plan
 7. **terraform apply -auto-approve** (MANDATORY - create real AWS resources)
 8. **terraform destroy -auto-approve** (MANDATORY - clean up resources)
-9. Remove test directory completely (MANDATORY cleanup)
+9. Leave the working directory in place (it is removed automatically after the lifecycle)
 
 FAILURE HANDLING:
-- If terraform apply fails, analyze the error and try to fix the SAME resource type only
-- TypeNotFoundException (CloudControl API limitation) = immediate failure
+- Failed terraform tool results end with an error class line: "Error class: RETRYABLE|FIXABLE|TERMINAL (code) - hint"
+- RETRYABLE (throttling, transient service errors): the tool already retried the command; run it once more at most
+- FIXABLE (invalid configuration, missing dependency, iam:PassRole or trust/resource policy problems of roles the code creates): analyze the error and try to fix the SAME resource type only
+- TERMINAL (TypeNotFoundException, unsupported action or region, opt-in required, quota exceeded, access denied for the pipeline's credentials):
+  stop immediately - no code change can help. Run terraform destroy and return "TERRAFORM_LIFECYCLE_FAILED"
+  with the error class line; further plan/apply calls are short-circuited by the tool
 - Common fixes: Invalid resource IDs → create missing resources, Invalid configurations → fix attribute values
 - For placeholder IDs like "fsvol-xxx", "vpc-xxx", "subnet-xxx" - create the actual supporting resources and use resource references
 - Re-test fixes with full lifecycle: terraform plan → terraform apply → terraform destroy
@@ -49,6 +60,16 @@ OUTPUT FORMAT:
 - If failed: Return "TERRAFORM_LIFECYCLE_FAILED" with details
 """
 
+WORKSPACE_PROMPT_TEMPLATE = """
+Pre-initialized working directory: {work_dir}
+The awscc provider {provider_version} is already installed here. Write main.tf into this directory
+and run every terraform command inside it (terraform init only links the cached providers).
+Write files with python_repl and run every terraform command with the terraform tool (work_dir="{work_dir}"):
+it enforces timeouts, keeps the full log on disk, retries throttled commands and destroys resources if an
+apply has to be interrupted. Do not start terraform from python_repl.
+Do not create another test directory and do not delete this one - it is cleaned up automatically.
+"""
+
 @tool
 def terraform_agent(terraform_code_and_version: str) -> str:
     """
@@ -61,18 +82,28 @@ def terraform_agent(terraform_code_and_version: str) -> str:
         Corrected Terraform code after validation OR failure message
     """
     try:
-        agent = Agent(
-            system_prompt=TERRAFORM_SYSTEM_PROMPT,
-            tools=[shell, python_repl]
-        )
-        
-        terraform_query = f"""
-        Execute complete Terraform validation with correct provider version and return the corrected code:
-        
-        {terraform_code_and_version}
-        """
+        provider_version = extract_provider_version(terraform_code_and_version)
+        resource_name = extract_resource_name(terraform_code_and_version, extract_terraform_code(terraform_code_and_version))
         
-        response = agent(terraform_query)
-        return str(response)
+        with workspace_pool.checkout(provider_version, extract_work_dir(terraform_code_and_version)) as work_dir:
+            terraform_query = f"""
+            Execute complete Terraform validation with correct provider version and return the corrected code:
+            
+            {terraform_code_and_version}
+            {WORKSPACE_PROMPT_TEMPLATE.format(work_dir=work_dir, provider_version=provider_version)}
+            {prepare_workspace(work_dir, resource_name, provider_version)}
+            """
+            
+            try:
+                with enforce_stage_budget("terraform_agent", work_dir):
+                    with checkout_agent("terraform", TERRAFORM_SYSTEM_PROMPT, [terraform, python_repl]) as agent:
+                        response = str(agent(terraform_query))
+            finally:
+                classification = pop_failures(work_dir)
+            if classification and "TERRAFORM_LIFECYCLE_FAILED" in response:
+                response += f"\n{classification.format()}"
+            return response
+    except BudgetExhausted:
+        raise
     except Exception as e:
         return f"Error in terraform agent: {str(e)}"
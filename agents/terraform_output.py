@@ -0,0 +1,128 @@
+"""
+TANGO Multi-Agent Pipeline - Terraform Output Filter
+Summarizes terraform output returned by the terraform tool before it reaches the model,
+keeping errors, resource addresses and summary lines and saving the full log to disk
+"""
+
+import hashlib
+import os
+import re
+import time
+from typing import List, Optional
+import config
+
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+# Lines worth keeping from init/validate/plan/apply/destroy output
+KEEP_PATTERNS = [re.compile(pattern) for pattern in (
+    r'\b(Error|error|ERROR|Warning)\b',
+    r'^\s*# \S+\.\S+ (will|must|has|is)\b',                     # plan resource headers
+    r'^\S+\.\S+: (Creating|Creation complete|Modifying|Modifications complete|Destroying|'
+    r'Destruction complete|Reading|Read complete|Refreshing state)',
+    r'^(Plan|Apply complete|Destroy complete|No changes|Changes to Outputs|Outputs):?',
+    r'^Terraform has been successfully initialized|^Success! The configuration is valid',
+)]
+# Progress lines that match the patterns above but carry no information
+DROP_PATTERNS = [re.compile(pattern) for pattern in (
+    r': Still (creating|modifying|destroying|reading)\.\.\.',
+)]
+ERROR_BOX_MAX_LINES = 40
+
+def _omitted(count: int) -> str:
+    return f"  ... [{count} lines omitted]"
+
+def summarize_terraform_output(text: str, max_chars: int) -> str:
+    """
+    Reduce terraform output to the lines a model needs to act on it.
+
+    Error diagnostics (the boxed blocks terraform prints) are kept in full up to
+    ERROR_BOX_MAX_LINES, warnings are reduced to their headline, and runs of
+    dropped lines are replaced by an omission marker.
+
+    Args:
+        text: Raw command output
+        max_chars: Upper bound on the summary length; the middle is cut beyond it
+
+    Returns:
+        Summarized output
+    """
+    lines = ANSI_ESCAPE.sub('', text).splitlines()
+    kept: List[str] = []
+    omitted = 0
+
+    def keep(new_lines: List[str]) -> None:
+        nonlocal omitted
+        if omitted:
+            kept.append(_omitted(omitted))
+            omitted = 0
+        kept.extend(new_lines)
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith('╷'):
+            end = next((j for j in range(i + 1, len(lines)) if lines[j].startswith('╵')), len(lines) - 1)
+            box = lines[i:end + 1]
+            if any('Error' in box_line for box_line in box[:3]):
+                keep(box[:ERROR_BOX_MAX_LINES])
+                if len(box) > ERROR_BOX_MAX_LINES:
+                    keep([_omitted(len(box) - ERROR_BOX_MAX_LINES)])
+            else:
+                keep([box_line for box_line in box[:2] if box_line.strip('╷│ ')])
+            i = end + 1
+            continue
+
+        if line.strip():
+            if any(p.search(line) for p in KEEP_PATTERNS) and not any(p.search(line) for p in DROP_PATTERNS):
+                keep([line])
+            else:
+                omitted += 1
+        i += 1
+    if omitted:
+        kept.append(_omitted(omitted))
+
+    summary = '\n'.join(kept)
+    if len(summary) > max_chars:
+        half = max_chars // 2
+        summary = f"{summary[:half]}\n  ... [{len(summary) - max_chars} characters omitted]\n{summary[-half:]}"
+    return summary
+
+def save_terraform_log(text: str) -> str:
+    """Write the full output to the terraform log directory and return its path."""
+    os.makedirs(config.TERRAFORM_LOG_DIR, exist_ok=True)
+    digest = hashlib.sha1(text.encode('utf-8')).hexdigest()[:8]
+    path = os.path.join(config.TERRAFORM_LOG_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{digest}.log")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+def filter_terraform_output(text: str, max_chars: Optional[int] = None, log_path: Optional[str] = None) -> str:
+    """
+    Summarize terraform output that exceeds max_chars, keeping the full log on disk.
+
+    Args:
+        text: Raw command output
+        max_chars: Summarize beyond this length (defaults to TERRAFORM_OUTPUT_MAX_CHARS)
+        log_path: Existing log holding the full output; a new log is only written without one
+
+    Returns:
+        The original text when it is short enough, otherwise the summary with a
+        footer naming the saved log and the size reduction
+    """
+    max_chars = max_chars or config.TERRAFORM_OUTPUT_MAX_CHARS
+    if len(text) <= max_chars:
+        return text
+
+    summary = summarize_terraform_output(text, max_chars)
+    if not log_path:
+        try:
+            log_path = save_terraform_log(text)
+        except OSError as e:
+            log_path = f"not saved ({e})"
+    reduction = 100 - (100 * len(summary) // len(text))
+    print(f"✂️ Terraform output summarized: {len(text)} → {len(summary)} chars ({reduction}% smaller), full log: {log_path}")
+    return (
+        f"{summary}\n"
+        f"[terraform output summarized from {len(text)} to {len(summary)} chars ({reduction}% smaller); "
+        f"full log: {log_path}]"
+    )
@@ -0,0 +1,263 @@
+"""
+TANGO Multi-Agent Pipeline - Terraform Runner
+Asyncio-based terraform runner shared by every workspace in the process: streams
+output line by line to a log file, enforces per-command timeouts and, when a command
+is cancelled or times out, interrupts terraform gracefully and destroys what an
+interrupted apply left behind
+"""
+
+import asyncio
+import os
+import shlex
+import signal
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, TextIO
+from strands import tool
+import config
+from .error_classifier import RETRYABLE, classify, record_failure, terminal_failure
+from .terraform_output import filter_terraform_output
+
+# Commands that are retried on retryable errors and that stop after a terminal error
+RETRY_COMMANDS = ('init', 'plan', 'apply', 'destroy')
+SHORT_CIRCUIT_COMMANDS = ('plan', 'apply')
+TERRAFORM_COMMANDS = ('init', 'validate', 'plan', 'apply', 'destroy', 'fmt', 'show', 'output', 'state', 'providers', 'version')
+AUTO_FLAGS = {
+    'init': ['-input=false'],
+    'plan': ['-input=false'],
+    'apply': ['-auto-approve', '-input=false'],
+    'destroy': ['-auto-approve', '-input=false'],
+}
+NO_COLOR_COMMANDS = ('init', 'validate', 'plan', 'apply', 'destroy', 'show', 'output', 'providers')
+
+@dataclass
+class TerraformResult:
+    """Outcome of one terraform command"""
+    args: List[str]
+    exit_code: Optional[int]
+    output: str
+    duration: float
+    log_path: str
+    timed_out: bool = False
+    cleanup: Optional['TerraformResult'] = None
+
+    @property
+    def success(self) -> bool:
+        return self.exit_code == 0 and not self.timed_out
+
+def parse_timeouts(spec: str) -> Dict[str, float]:
+    """Parse 'init=600,apply=3600,default=900' into seconds per command."""
+    timeouts = {}
+    for item in spec.split(','):
+        name, _, seconds = item.partition('=')
+        if name.strip() and seconds.strip():
+            timeouts[name.strip()] = float(seconds)
+    return timeouts
+
+def command_timeout(command: str) -> Optional[float]:
+    """Timeout for a terraform subcommand (None means no limit)."""
+    timeouts = parse_timeouts(config.TERRAFORM_TIMEOUTS)
+    timeout = timeouts.get(command, timeouts.get('default'))
+    return timeout if timeout and timeout > 0 else None
+
+def build_args(command: str, arguments: str = "") -> List[str]:
+    """Build the argument list for a subcommand, adding the flags automation needs."""
+    if command not in TERRAFORM_COMMANDS:
+        raise ValueError(f"Unsupported terraform command '{command}', expected one of {', '.join(TERRAFORM_COMMANDS)}")
+    args = [command] + shlex.split(arguments)
+    for flag in AUTO_FLAGS.get(command, []):
+        if flag.split('=')[0] not in ' '.join(args):
+            args.append(flag)
+    if command in NO_COLOR_COMMANDS and '-no-color' not in args:
+        args.append('-no-color')
+    return args
+
+class TerraformRunner:
+    """
+    Runs terraform commands on one background event loop, so any number of
+    workspaces can run commands concurrently from worker threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._futures: Set[Future] = set()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='terraform-runner', daemon=True).start()
+            return self._loop
+
+    def _log_path(self, work_dir: str, command: str) -> str:
+        os.makedirs(config.TERRAFORM_LOG_DIR, exist_ok=True)
+        name = f"{os.path.basename(os.path.normpath(work_dir))}-{command}-{time.strftime('%Y%m%d-%H%M%S')}.log"
+        return os.path.join(config.TERRAFORM_LOG_DIR, name)
+
+    async def _stream(self, process: asyncio.subprocess.Process, log: TextIO, lines: List[str]) -> None:
+        while True:
+            raw = await process.stdout.readline()
+            if not raw:
+                return
+            line = raw.decode('utf-8', errors='replace')
+            log.write(line)
+            log.flush()
+            lines.append(line)
+
+    async def _interrupt(self, process: asyncio.subprocess.Process, log: TextIO, lines: List[str]) -> None:
+        """Send SIGINT so terraform can stop cleanly and save state, then kill after the grace period."""
+        if process.returncode is not None:
+            return
+        process.send_signal(signal.SIGINT)
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(self._stream(process, log, lines), process.wait()),
+                config.TERRAFORM_INTERRUPT_GRACE_SECONDS
+            )
+        except asyncio.TimeoutError:
+            log.write("\n[terraform did not stop after SIGINT, killing it]\n")
+            process.kill()
+            await process.wait()
+
+    async def run(self, work_dir: str, args: List[str], timeout: Optional[float] = None,
+                  destroy_on_interrupt: bool = True) -> TerraformResult:
+        """
+        Run one terraform command, streaming its output to a log file.
+
+        If the command times out or is cancelled, terraform is interrupted; an
+        interrupted apply is followed by a destroy so no resources are left behind.
+        """
+        command = args[0]
+        log_path = self._log_path(work_dir, command)
+        lines: List[str] = []
+        timed_out = False
+        start = time.time()
+
+        process = await asyncio.create_subprocess_exec(
+            'terraform', *args, cwd=work_dir,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+        with open(log_path, 'w', encoding='utf-8') as log:
+            log.write(f"$ terraform {' '.join(args)}\n")
+            try:
+                await asyncio.wait_for(asyncio.gather(self._stream(process, log, lines), process.wait()), timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+                log.write(f"\n[timed out after {timeout:.0f}s, interrupting terraform]\n")
+                await self._interrupt(process, log, lines)
+            except asyncio.CancelledError:
+                log.write("\n[cancelled, interrupting terraform]\n")
+                await self._interrupt(process, log, lines)
+                if destroy_on_interrupt and command == 'apply':
+                    await self.run(work_dir, build_args('destroy'), command_timeout('destroy'), destroy_on_interrupt=False)
+                raise
+
+        result = TerraformResult(args, process.returncode, ''.join(lines), time.time() - start, log_path, timed_out)
+        if timed_out and destroy_on_interrupt and command == 'apply':
+            result.cleanup = await self.run(work_dir, build_args('destroy'), command_timeout('destroy'), destroy_on_interrupt=False)
+        return result
+
+    def run_sync(self, work_dir: str, args: List[str], timeout: Optional[float] = None) -> TerraformResult:
+        """Run a command on the background loop and wait for it; interrupting the caller cancels it."""
+        future = asyncio.run_coroutine_threadsafe(self.run(work_dir, args, timeout), self._ensure_loop())
+        with self._lock:
+            self._futures.add(future)
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            with self._lock:
+                self._futures.discard(future)
+
+    def cancel_all(self, wait_seconds: float = 0) -> int:
+        """Cancel every running command (e.g. on shutdown); returns how many were cancelled."""
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+        if futures and wait_seconds and self._loop is not None:
+            # Give interrupted applies time to be destroyed before the process exits
+            pending = [task for task in asyncio.all_tasks(self._loop) if not task.done()]
+            if pending:
+                done = asyncio.run_coroutine_threadsafe(asyncio.wait(pending, timeout=wait_seconds), self._loop)
+                done.result()
+        return len(futures)
+
+terraform_runner = TerraformRunner()
+
+def format_result(result: TerraformResult) -> str:
+    """Format a result for the model, summarizing long output."""
+    lines = [
+        f"Command: terraform {' '.join(result.args)}",
+        f"Exit code: {result.exit_code}",
+        f"Duration: {result.duration:.1f}s",
+        f"Full log: {result.log_path}",
+    ]
+    if result.timed_out:
+        lines.append("Status: TIMED OUT - terraform was interrupted")
+    if result.cleanup:
+        lines.append(f"Cleanup destroy after interrupted apply: exit code {result.cleanup.exit_code} (log: {result.cleanup.log_path})")
+    lines.append("Output:")
+    if config.TERRAFORM_OUTPUT_FILTER:
+        # The runner already logged the full output, so the filter points at that log
+        lines.append(filter_terraform_output(result.output, log_path=result.log_path))
+    else:
+        lines.append(result.output)
+    return '\n'.join(lines)
+
+@tool
+def terraform(work_dir: str, command: str, arguments: str = "") -> str:
+    """
+    Run a terraform command in a working directory with a timeout and a full log on disk.
+
+    Use this tool for every terraform command. Flags needed
+    for automation (-input=false, -auto-approve, -no-color) are added automatically.
+
+    Args:
+        work_dir: Terraform working directory
+        command: Subcommand: init, validate, plan, apply, destroy, fmt, show, output, state, providers or version
+        arguments: Extra command line arguments, e.g. "-target=awscc_s3_bucket.example"
+
+    Returns:
+        Exit code, duration, log path and the (summarized) output
+    """
+    try:
+        args = build_args(command, arguments)
+    except ValueError as e:
+        return f"Error: {e}"
+    if not os.path.isdir(work_dir):
+        return f"Error: working directory does not exist: {work_dir}"
+    terminal = terminal_failure(work_dir)
+    if terminal and command in SHORT_CIRCUIT_COMMANDS:
+        print(f"⛔ Short-circuited terraform {command} in {work_dir}: {terminal.code}")
+        return (f"Short-circuited: terraform {command} was not run because an earlier command failed with a "
+                f"terminal error that no code change can fix.\n{terminal.format()}\n"
+                f"Run terraform destroy in {work_dir} and return TERRAFORM_LIFECYCLE_FAILED with the error class.")
+
+    print(f"⚙️ terraform {command} in {work_dir}")
+    attempt = 1
+    while True:
+        result = terraform_runner.run_sync(work_dir, args, command_timeout(command))
+        icon = "✅" if result.success else "❌"
+        print(f"{icon} terraform {command} finished in {result.duration:.1f}s (exit code {result.exit_code})")
+        if result.success or result.timed_out:
+            return format_result(result)
+
+        classification = classify(result.output)
+        if (classification.error_class != RETRYABLE or command not in RETRY_COMMANDS
+                or attempt > config.TERRAFORM_RETRY_ATTEMPTS):
+            break
+        delay = config.TERRAFORM_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+        print(f"🔁 Retrying terraform {command} in {delay:.0f}s after {classification.code} "
+              f"(retry {attempt}/{config.TERRAFORM_RETRY_ATTEMPTS})")
+        time.sleep(delay)
+        attempt += 1
+
+    record_failure(work_dir, classification)
+    print(f"🏷️ terraform {command} failed: {classification.error_class} ({classification.code})")
+    return format_result(result) + '\n' + classification.format()
@@ -0,0 +1,259 @@
+"""
+TANGO Multi-Agent Pipeline - Terraform Workspaces
+Shared provider plugin cache and a pool of pre-initialized Terraform workspaces
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set
+import config
+from .hcl import HCLParseError, parse_blocks
+
+WORK_DIR_PREFIX = "Working directory:"
+
+SEED_VERSIONS_TEMPLATE = """
+terraform {{
+  required_providers {{
+    awscc = {{
+      source  = "hashicorp/awscc"
+      version = "{provider_version}"
+    }}
+    aws = {{
+      source = "hashicorp/aws"
+    }}
+    random = {{
+      source = "hashicorp/random"
+    }}
+  }}
+}}
+"""
+
+CLI_CONFIG_TEMPLATE = """
+plugin_cache_dir = "{plugin_cache_dir}"
+
+provider_installation {{
+  filesystem_mirror {{
+    path = "{mirror_dir}"
+  }}
+  direct {{}}
+}}
+"""
+
+def configure_terraform_environment() -> None:
+    """Point every terraform process started by this pipeline at the shared provider cache."""
+    os.makedirs(config.TERRAFORM_PLUGIN_CACHE_DIR, exist_ok=True)
+    os.environ['TF_PLUGIN_CACHE_DIR'] = config.TERRAFORM_PLUGIN_CACHE_DIR
+    os.environ['TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE'] = 'true'
+    os.environ['TF_IN_AUTOMATION'] = 'true'
+    
+    if config.TERRAFORM_PROVIDER_MIRROR_DIR:
+        # Prefer the local filesystem mirror so runs work offline once it is populated
+        os.makedirs(config.TERRAFORM_PROVIDER_MIRROR_DIR, exist_ok=True)
+        cli_config_path = os.path.join(config.CACHE_DIR, 'terraform.rc')
+        with open(cli_config_path, 'w', encoding='utf-8') as f:
+            f.write(CLI_CONFIG_TEMPLATE.format(
+                plugin_cache_dir=config.TERRAFORM_PLUGIN_CACHE_DIR,
+                mirror_dir=config.TERRAFORM_PROVIDER_MIRROR_DIR
+            ))
+        os.environ['TF_CLI_CONFIG_FILE'] = cli_config_path
+
+def extract_provider_version(text: str) -> str:
+    """Extract the awscc provider version from free-form agent input."""
+    patterns = [
+        r'"provider_version"\s*:\s*"v?(\d+\.\d+\.\d+)"',
+        r'awscc\s*=\s*\{[^}]*version\s*=\s*"[~>=\s]*(\d+\.\d+\.\d+)"',
+        r'provider[ _]version[^0-9]{0,20}v?(\d+\.\d+\.\d+)',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        if match:
+            return match.group(1)
+    return config.DEFAULT_PROVIDER_VERSION
+
+def extract_resource_name(text: str, terraform_code: str) -> Optional[str]:
+    """Extract the target resource name from agent input, falling back to the code's first awscc resource."""
+    match = re.search(r'resource[_ ]name["\']?\s*[:=]\s*["\']?(awscc_\w+)', text, re.IGNORECASE)
+    if match:
+        return match.group(1)
+    try:
+        for block in parse_blocks(terraform_code):
+            if block.type == "resource" and block.labels and block.labels[0].startswith("awscc_"):
+                return block.labels[0]
+    except HCLParseError:
+        pass
+    return None
+
+def extract_work_dir(text: str) -> Optional[str]:
+    """Extract the per-run working directory from agent input, if one was given."""
+    match = re.search(re.escape(WORK_DIR_PREFIX) + r'\s*(\S+)', text)
+    return match.group(1) if match else None
+
+def _states(work_dir: str) -> Iterator[Dict]:
+    """Yield every Terraform state file under a workspace, skipping provider directories."""
+    for root, _, files in os.walk(work_dir):
+        if '.terraform' in root.split(os.sep):
+            continue
+        if 'terraform.tfstate' in files:
+            with open(os.path.join(root, 'terraform.tfstate'), encoding='utf-8') as f:
+                yield json.load(f)
+
+def _has_live_resources(work_dir: str) -> bool:
+    """Check whether a workspace's state still tracks resources (e.g. a failed destroy)."""
+    return any(state.get('resources') for state in _states(work_dir))
+
+def tracked_identifiers(work_dir: str) -> Set[str]:
+    """ARNs and IDs of every resource a workspace's state tracks, including the IDs it references."""
+    identifiers = set()
+    for state in _states(work_dir):
+        for resource in state.get('resources', []):
+            for instance in resource.get('instances', []):
+                for key, value in (instance.get('attributes') or {}).items():
+                    if isinstance(value, str) and value and (key in ('arn', 'id') or key.endswith(('_arn', '_id'))):
+                        identifiers.add(value)
+    return identifiers
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink a file, falling back to a copy across filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+class WorkspacePool:
+    """
+    Pool of pre-initialized Terraform workspaces keyed by provider version.
+    
+    A seed workspace per provider version is initialized once against the shared
+    plugin cache. Checked-out workspaces are cheap clones of the seed's `.terraform`
+    directory and lock file, so `terraform init` in them resolves everything locally.
+    """
+    
+    def __init__(self, root: str, seed_dir: str):
+        self.root = root
+        self.seed_dir = seed_dir
+        self._lock = threading.Lock()
+        self._seed_locks: Dict[str, threading.Lock] = {}
+        self._spares: Dict[str, List[str]] = {}
+        self._active: Set[str] = set()
+    
+    def _seed_lock(self, provider_version: str) -> threading.Lock:
+        with self._lock:
+            return self._seed_locks.setdefault(provider_version, threading.Lock())
+    
+    def seed(self, provider_version: str) -> Optional[str]:
+        """Initialize (once) the seed workspace for a provider version."""
+        seed_path = os.path.join(self.seed_dir, provider_version)
+        
+        with self._seed_lock(provider_version):
+            if os.path.exists(os.path.join(seed_path, '.terraform.lock.hcl')):
+                return seed_path
+            
+            os.makedirs(seed_path, exist_ok=True)
+            with open(os.path.join(seed_path, 'versions.tf'), 'w', encoding='utf-8') as f:
+                f.write(SEED_VERSIONS_TEMPLATE.format(provider_version=provider_version))
+            
+            print(f"📦 Initializing provider cache for awscc {provider_version}...")
+            try:
+                subprocess.run(
+                    ['terraform', 'init', '-input=false', '-no-color'],
+                    cwd=seed_path, check=True, capture_output=True, text=True
+                )
+                if config.TERRAFORM_PROVIDER_MIRROR_DIR:
+                    subprocess.run(
+                        ['terraform', 'providers', 'mirror', config.TERRAFORM_PROVIDER_MIRROR_DIR],
+                        cwd=seed_path, check=True, capture_output=True, text=True
+                    )
+            except (OSError, subprocess.CalledProcessError) as e:
+                details = getattr(e, 'stderr', '') or str(e)
+                print(f"Warning: Could not initialize seed workspace for {provider_version}: {details}")
+                return None
+            
+            return seed_path
+    
+    def _clone(self, provider_version: str, parent: str) -> str:
+        """Create a workspace that shares the seed's installed providers."""
+        os.makedirs(parent, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix='tf-', dir=parent)
+        
+        seed_path = self.seed(provider_version)
+        if seed_path:
+            shutil.copytree(
+                os.path.join(seed_path, '.terraform'),
+                os.path.join(work_dir, '.terraform'),
+                symlinks=True,
+                copy_function=_link_or_copy
+            )
+            shutil.copy2(
+                os.path.join(seed_path, '.terraform.lock.hcl'),
+                os.path.join(work_dir, '.terraform.lock.hcl')
+            )
+        return work_dir
+    
+    def warm(self, provider_version: str, count: int) -> None:
+        """Pre-create spare workspaces so later checkouts are a rename."""
+        spare_root = os.path.join(self.root, 'spares')
+        for _ in range(count):
+            work_dir = self._clone(provider_version, spare_root)
+            with self._lock:
+                self._spares.setdefault(provider_version, []).append(work_dir)
+    
+    def active(self) -> List[str]:
+        """Workspaces currently checked out by a running stage."""
+        with self._lock:
+            return sorted(self._active)
+    
+    @contextmanager
+    def checkout(self, provider_version: str, parent: Optional[str] = None) -> Iterator[str]:
+        """
+        Check out a pre-initialized workspace for the duration of a stage.
+        
+        Args:
+            provider_version: awscc provider version the workspace is initialized for
+            parent: Directory to create the workspace in (defaults to the pool root)
+            
+        Yields:
+            Path of the workspace, which is removed on exit unless its state still tracks resources
+        """
+        parent = parent or self.root
+        with self._lock:
+            spares = self._spares.get(provider_version, [])
+            spare = spares.pop() if spares else None
+        
+        work_dir = None
+        if spare:
+            try:
+                os.makedirs(parent, exist_ok=True)
+                work_dir = os.path.join(parent, os.path.basename(spare))
+                os.rename(spare, work_dir)
+            except OSError:
+                shutil.rmtree(spare, ignore_errors=True)
+                work_dir = None
+        if work_dir is None:
+            work_dir = self._clone(provider_version, parent)
+        
+        with self._lock:
+            self._active.add(work_dir)
+        try:
+            yield work_dir
+        finally:
+            with self._lock:
+                self._active.discard(work_dir)
+            try:
+                keep = _has_live_resources(work_dir)
+            except (OSError, ValueError):
+                keep = False
+            if keep:
+                # Keep the state so orphaned resources can still be destroyed
+                print(f"⚠️ Workspace still tracks resources, keeping it: {work_dir}")
+            else:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+configure_terraform_environment()
+
+workspace_pool = WorkspacePool(config.WORKSPACE_ROOT, config.WORKSPACE_SEED_DIR)
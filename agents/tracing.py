@@ -0,0 +1,254 @@
+"""
+TANGO Multi-Agent Pipeline - Tracing
+Records a span per pipeline stage, agent call, model invocation and tool/terraform
+command, writes spans to a local JSONL trace file and summarizes them per stage
+"""
+
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+import config
+from .hooks import (
+    HookProvider, HookRegistry, AfterInvocationEvent,
+    BeforeModelCallEvent, AfterModelCallEvent, BeforeToolCallEvent, AfterToolCallEvent,
+    tool_command, tool_result_text
+)
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('tango_trace', default=None)
+_current_stage: contextvars.ContextVar = contextvars.ContextVar('tango_stage', default=None)
+_write_lock = threading.Lock()
+
+SUMMARY_FIELDS = ('wall_ms', 'input_tokens', 'output_tokens', 'model_calls', 'tool_calls',
+                  'terraform_commands', 'terraform_ms', 'errors')
+
+def _write_span(span: Dict[str, Any]) -> None:
+    """Append a span to the JSONL trace file."""
+    if not config.TRACE_FILE:
+        return
+    line = json.dumps(span, default=str)
+    with _write_lock:
+        os.makedirs(os.path.dirname(config.TRACE_FILE) or '.', exist_ok=True)
+        with open(config.TRACE_FILE, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+class Trace:
+    """All spans recorded while processing one resource."""
+
+    def __init__(self, resource_name: str):
+        self.trace_id = uuid.uuid4().hex
+        self.resource_name = resource_name
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """
+        Summarize spans per stage.
+
+        Wall time comes from stage spans (or agent spans for stages run outside the
+        code-driven orchestrator) and tokens from agent spans, so nothing is double counted.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        staged = {span['stage'] for span in spans if span['kind'] == 'stage'}
+
+        summary: Dict[str, Dict[str, int]] = {}
+        for span in spans:
+            stage = summary.setdefault(span['stage'] or 'unknown', dict.fromkeys(SUMMARY_FIELDS, 0))
+            kind = span['kind']
+            if kind == 'stage' or (kind == 'agent' and span['stage'] not in staged):
+                stage['wall_ms'] += span['wall_ms']
+            if kind == 'agent':
+                stage['input_tokens'] += span.get('input_tokens', 0)
+                stage['output_tokens'] += span.get('output_tokens', 0)
+            elif kind == 'model':
+                stage['model_calls'] += 1
+            elif kind in ('tool', 'terraform'):
+                stage['tool_calls'] += 1
+            if kind == 'terraform':
+                stage['terraform_commands'] += 1
+                stage['terraform_ms'] += span['wall_ms']
+            if span['status'] != 'ok':
+                stage['errors'] += 1
+        return summary
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+def current_stage() -> Optional[str]:
+    return _current_stage.get()
+
+def record_span(name: str, kind: str, start: float, end: float, status: str = 'ok',
+                trace: Optional[Trace] = None, stage: Optional[str] = None, **attributes) -> Dict[str, Any]:
+    """
+    Record a finished span.
+
+    Args:
+        name: Span name (stage, agent, tool or command)
+        kind: "stage", "agent", "model", "tool" or "terraform"
+        start: Start time (epoch seconds)
+        end: End time (epoch seconds)
+        status: "ok" or "error"
+        trace: Trace to attach the span to (defaults to the current trace)
+        stage: Pipeline stage (defaults to the current stage)
+        attributes: Extra span attributes such as input_tokens or exit_code
+    """
+    trace = trace or current_trace()
+    span = {
+        'trace_id': trace.trace_id if trace else None,
+        'resource_name': trace.resource_name if trace else None,
+        'stage': stage or current_stage(),
+        'kind': kind,
+        'name': name,
+        'start': start,
+        'wall_ms': int((end - start) * 1000),
+        'status': status,
+        **attributes
+    }
+    if trace:
+        with trace._lock:
+            trace.spans.append(span)
+    _write_span(span)
+    return span
+
+@contextmanager
+def start_trace(resource_name: str) -> Iterator[Trace]:
+    """Start a trace for one resource; spans recorded in this context attach to it."""
+    trace = Trace(resource_name)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+@contextmanager
+def span(name: str, kind: str = 'stage', **attributes) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block of code as a span. Stage spans also set the current stage.
+
+    Yields:
+        A dict of attributes the block can add to before the span is recorded
+    """
+    extra: Dict[str, Any] = dict(attributes)
+    token = _current_stage.set(name) if kind == 'stage' else None
+    start = time.time()
+    status = 'ok'
+    try:
+        yield extra
+    except Exception as e:
+        status = 'error'
+        extra['error'] = str(e)[:500]
+        raise
+    finally:
+        if token is not None:
+            _current_stage.reset(token)
+        record_span(name, kind, start, time.time(), extra.pop('status', status),
+                    stage=name if kind == 'stage' else None, **extra)
+
+def _usage(agent) -> Dict[str, int]:
+    usage = getattr(getattr(agent, 'event_loop_metrics', None), 'accumulated_usage', None) or {}
+    return {'input_tokens': usage.get('inputTokens', 0), 'output_tokens': usage.get('outputTokens', 0)}
+
+class TracingHooks(HookProvider):
+    """
+    Records model invocation and tool call spans for one pooled agent.
+
+    Model usage is only added to the agent's metrics after the model call event fires,
+    so a model span is finalized (with its token delta) at the agent's next event.
+    """
+
+    def __init__(self, agent_name: str):
+        self.agent_name = agent_name
+        self.trace: Optional[Trace] = None
+        self.stage: Optional[str] = None
+        self._model_start: Optional[float] = None
+        self._pending_model: Optional[Dict[str, Any]] = None
+        self._usage_mark: Dict[str, int] = {}
+        self._tool_starts: Dict[str, float] = {}
+
+    def bind(self, trace: Optional[Trace], stage: Optional[str]) -> None:
+        """Attach the agent's spans to a trace and stage for the current checkout."""
+        self.trace, self.stage = trace, stage
+        self._pending_model = None
+        self._usage_mark = {'input_tokens': 0, 'output_tokens': 0}
+        self._tool_starts.clear()
+
+    def register_hooks(self, registry: HookRegistry, **kwargs) -> None:
+        registry.add_callback(BeforeModelCallEvent, self._before_model)
+        registry.add_callback(AfterModelCallEvent, self._after_model)
+        registry.add_callback(BeforeToolCallEvent, self._before_tool)
+        registry.add_callback(AfterToolCallEvent, self._after_tool)
+        registry.add_callback(AfterInvocationEvent, self._after_invocation)
+
+    def _flush_model(self, agent) -> None:
+        if self._pending_model is None:
+            return
+        usage = _usage(agent)
+        pending, self._pending_model = self._pending_model, None
+        record_span(
+            f"{self.agent_name}.model", 'model', pending['start'], pending['end'], pending['status'],
+            trace=self.trace, stage=self.stage, agent=self.agent_name, stop_reason=pending['stop_reason'],
+            input_tokens=usage['input_tokens'] - self._usage_mark.get('input_tokens', 0),
+            output_tokens=usage['output_tokens'] - self._usage_mark.get('output_tokens', 0)
+        )
+        self._usage_mark = usage
+
+    def _before_model(self, event) -> None:
+        self._flush_model(event.agent)
+        self._model_start = time.time()
+
+    def _after_model(self, event) -> None:
+        stop_response = getattr(event, 'stop_response', None)
+        exception = getattr(event, 'exception', None)
+        self._pending_model = {
+            'start': self._model_start or time.time(),
+            'end': time.time(),
+            'status': 'error' if exception else 'ok',
+            'stop_reason': getattr(stop_response, 'stop_reason', None)
+        }
+
+    def _before_tool(self, event) -> None:
+        self._flush_model(event.agent)
+        self._tool_starts[event.tool_use.get('toolUseId', '')] = time.time()
+
+    def _after_tool(self, event) -> None:
+        tool_use = event.tool_use
+        start = self._tool_starts.pop(tool_use.get('toolUseId', ''), time.time())
+        result = getattr(event, 'result', None) or {}
+        failed = getattr(event, 'exception', None) is not None or result.get('status') == 'error'
+
+        name = tool_use.get('name', 'unknown')
+        attributes: Dict[str, Any] = {'agent': self.agent_name}
+        kind = 'tool'
+        command = tool_command(tool_use)
+        if command:
+            attributes['command'] = command[:500]
+            exit_code = re.search(r'exit code:\s*(-?\d+)', tool_result_text(result), re.IGNORECASE)
+            if exit_code:
+                attributes['exit_code'] = int(exit_code.group(1))
+            # Terraform run through the shell tool or the dedicated terraform tool
+            if name == 'terraform' or re.search(r'\bterraform\b', command):
+                kind = 'terraform'
+        record_span(name, kind, start, time.time(), 'error' if failed else 'ok',
+                    trace=self.trace, stage=self.stage, **attributes)
+
+    def _after_invocation(self, event) -> None:
+        self._flush_model(event.agent)
+
+def record_agent_span(agent_name: str, agent, start: float, status: str,
+                      trace: Optional[Trace] = None, stage: Optional[str] = None) -> None:
+    """Record one agent call with its token usage and tool call counts."""
+    metrics = getattr(agent, 'event_loop_metrics', None)
+    tool_calls = sum(
+        getattr(tool_metrics, 'call_count', 0)
+        for tool_metrics in (getattr(metrics, 'tool_metrics', None) or {}).values()
+    )
+    record_span(
+        agent_name, 'agent', start, time.time(), status, trace=trace, stage=stage,
+        cycles=getattr(metrics, 'cycle_count', 0), tool_calls=tool_calls, **_usage(agent)
+    )
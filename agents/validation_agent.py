@@ -3,11 +3,22 @@ TANGO Multi-Agent Pipeline - Validation Agent
 Independent reviewer that validates terraform agent's work by running apply/destroy
 """
 
-from strands import Agent, tool
-from strands_tools import python_repl, shell, use_aws
+from strands import tool
+from strands_tools import python_repl, use_aws
 from datetime import datetime
 import json
+import re
+from typing import Dict, Optional
 import config
+from .agent_factory import checkout_agent
+from .budget import BudgetExhausted, enforce_stage_budget
+from .error_classifier import pop_failures
+from .terraform_runner import terraform
+from .fixtures import prepare_workspace
+from .terraform_workspace import workspace_pool, extract_provider_version, extract_resource_name, extract_work_dir
+from .terraform_agent import WORKSPACE_PROMPT_TEMPLATE
+from .hcl import extract_terraform_code
+from .validation_cache import validation_cache
 
 VALIDATION_SYSTEM_PROMPT = """
 You are an independent validation agent that reviews terraform agent's work.
@@ -38,14 +49,14 @@ CRITICAL REQUIREMENTS:
 VALIDATION STEPS:
 1. Extract terraform code and resource name
 2. Verify code contains target resource (e.g., "awscc_s3_bucket")
-3. Create test directory and main.tf
+3. Write main.tf into the pre-initialized working directory given in the input
 4. terraform init
 5. terraform validate
 6. terraform plan
 7. terraform apply -auto-approve (create real resources) - DO NOT MODIFY THE CODE, test it exactly as provided
 8. terraform destroy -auto-approve (clean up)
 9. Store detailed results in S3
-10. Clean up test directory completely
+10. Leave the working directory in place (it is removed automatically)
 11. Return validation status
 
 OUTPUT FORMAT:
@@ -103,6 +114,30 @@ Return JSON with validation status:
 }
 """
 
+def parse_validation_result(response: str) -> Optional[Dict]:
+    """Parse the validation JSON object out of the agent's response."""
+    for candidate in reversed(re.findall(r'\{[^{}]*"validation_result"[^{}]*\}', response)):
+        try:
+            return json.loads(re.sub(r',\s*\}', '}', candidate))
+        except ValueError:
+            continue
+    return None
+
+def _cached_validation(terraform_code: str, resource_name: Optional[str], provider_version: str) -> Optional[Dict]:
+    """Return a cached passed validation for this exact code, provider version and region."""
+    if not resource_name or f'resource "{resource_name}"' not in terraform_code:
+        return None
+    entry = validation_cache.get(terraform_code, provider_version)
+    if not entry or entry.get('resource_name') != resource_name:
+        return None
+    return {
+        "validation_result": "success",
+        "resource_name": resource_name,
+        "s3_path": entry["s3_path"],
+        "target_resource_confirmed": True,
+        "cached": True
+    }
+
 @tool
 def validation_agent(terraform_code_and_resource: str) -> str:
     """
@@ -122,21 +157,45 @@ def validation_agent(terraform_code_and_resource: str) -> str:
             "{config.S3_BUCKET}", config.S3_BUCKET
         )
         
-        agent = Agent(
-            system_prompt=system_prompt,
-            tools=[shell, python_repl, use_aws]
-        )
+        provider_version = extract_provider_version(terraform_code_and_resource)
+        terraform_code = extract_terraform_code(terraform_code_and_resource)
+        resource_name = extract_resource_name(terraform_code_and_resource, terraform_code)
         
-        validation_query = f"""
-        Perform independent validation of the terraform agent's work.
+        # Identical code already passed with this provider version and region
+        cached = _cached_validation(terraform_code, resource_name, provider_version)
+        if cached:
+            print(f"♻️ Reusing cached validation for {resource_name}: {cached['s3_path']}")
+            return json.dumps(cached)
         
-        Input from terraform agent:
-        {terraform_code_and_resource}
-        """
+        with workspace_pool.checkout(provider_version, extract_work_dir(terraform_code_and_resource)) as work_dir:
+            validation_query = f"""
+            Perform independent validation of the terraform agent's work.
+            
+            Input from terraform agent:
+            {terraform_code_and_resource}
+            {WORKSPACE_PROMPT_TEMPLATE.format(work_dir=work_dir, provider_version=provider_version)}
+            {prepare_workspace(work_dir, resource_name, provider_version)}
+            """
+            
+            try:
+                with enforce_stage_budget("validation_agent", work_dir):
+                    with checkout_agent("validation", system_prompt, [terraform, python_repl, use_aws]) as agent:
+                        response = agent(validation_query)
+            finally:
+                classification = pop_failures(work_dir)
         
-        response = agent(validation_query)
+        result = parse_validation_result(str(response))
+        if classification and result and result.get("validation_result") != "success":
+            result["error"] = f"{result.get('error') or 'Validation failed'}\n{classification.format()}"
+            return json.dumps(result)
+        if result and result.get("validation_result") == "success" and resource_name:
+            s3_path = result.get("s3_path")
+            if s3_path and s3_path != "none":
+                validation_cache.put(terraform_code, provider_version, resource_name, s3_path)
         return str(response)
         
+    except BudgetExhausted:
+        raise
     except Exception as e:
         return json.dumps({
             "validation_result": "failed",
@@ -0,0 +1,130 @@
+"""
+TANGO Multi-Agent Pipeline - Validation Cache
+Content-addressed cache of passed validations, keyed by normalized code hash,
+provider version and region
+"""
+
+import hashlib
+import os
+import re
+import time
+from typing import Dict, Optional
+import config
+from .hcl import HCLParseError, strip_comments
+from .local_store import load_json, save_json
+
+def normalize_code(terraform_code: str) -> str:
+    """Normalize code so comment and whitespace-only changes hash the same."""
+    try:
+        code = strip_comments(terraform_code)
+    except HCLParseError:
+        code = terraform_code
+    lines = (re.sub(r'\s+', ' ', line).strip() for line in code.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+def cache_key(terraform_code: str, provider_version: str, region: str) -> str:
+    """Build the cache key for code validated with a provider version in a region."""
+    digest = hashlib.sha256()
+    for part in (normalize_code(terraform_code), provider_version, region):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class ValidationCache:
+    """
+    Cache of validations that passed a full apply/destroy lifecycle.
+    
+    Entries are stored as one JSON file per key and, when a table is configured,
+    mirrored to DynamoDB so other machines can reuse them.
+    """
+    
+    def __init__(self, cache_dir: str, ttl_seconds: int, table_name: str = ""):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.table_name = table_name
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+    
+    def _get_remote(self, key: str) -> Optional[Dict]:
+        from .agent_factory import get_client
+        
+        response = get_client('dynamodb').get_item(
+            TableName=self.table_name,
+            Key={'cache_key': {'S': key}},
+            ConsistentRead=False
+        )
+        item = response.get('Item')
+        if not item:
+            return None
+        return {
+            'resource_name': item['resource_name']['S'],
+            'provider_version': item['provider_version']['S'],
+            'region': item['region']['S'],
+            's3_path': item['s3_path']['S'],
+            'validated_at': int(item['validated_at']['N'])
+        }
+    
+    def get(self, terraform_code: str, provider_version: str, region: Optional[str] = None) -> Optional[Dict]:
+        """Return the cached validation for this code, or None on a miss or expired entry."""
+        if not self.enabled:
+            return None
+        key = cache_key(terraform_code, provider_version, region or config.AWS_REGION)
+        
+        entry = load_json(self._path(key))
+        if entry is None and self.table_name:
+            try:
+                entry = self._get_remote(key)
+            except Exception as e:
+                print(f"Warning: Could not read validation cache table: {e}")
+            if entry:
+                save_json(self._path(key), entry)
+        
+        if not entry or time.time() - entry.get('validated_at', 0) > self.ttl_seconds:
+            return None
+        return entry
+    
+    def put(self, terraform_code: str, provider_version: str, resource_name: str, s3_path: str,
+            region: Optional[str] = None) -> None:
+        """Record a passed validation."""
+        if not self.enabled:
+            return
+        region = region or config.AWS_REGION
+        key = cache_key(terraform_code, provider_version, region)
+        entry = {
+            'resource_name': resource_name,
+            'provider_version': provider_version,
+            'region': region,
+            's3_path': s3_path,
+            'validated_at': int(time.time())
+        }
+        save_json(self._path(key), entry)
+        
+        if self.table_name:
+            from .agent_factory import get_client
+            
+            try:
+                get_client('dynamodb').put_item(
+                    TableName=self.table_name,
+                    Item={
+                        'cache_key': {'S': key},
+                        'resource_name': {'S': resource_name},
+                        'provider_version': {'S': provider_version},
+                        'region': {'S': region},
+                        's3_path': {'S': s3_path},
+                        'validated_at': {'N': str(entry['validated_at'])},
+                        'expires_at': {'N': str(entry['validated_at'] + self.ttl_seconds)}
+                    }
+                )
+            except Exception as e:
+                print(f"Warning: Could not write validation cache table: {e}")
+
+validation_cache = ValidationCache(
+    config.VALIDATION_CACHE_DIR,
+    config.VALIDATION_CACHE_TTL_SECONDS,
+    config.VALIDATION_CACHE_TABLE
+)
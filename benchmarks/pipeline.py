@@ -0,0 +1,432 @@
+"""
+TANGO Multi-Agent Pipeline - Offline Pipeline Benchmark
+Runs `run_pipeline()` and `process_resource()` end to end without Bedrock or real AWS:
+a scripted stub model, moto-backed S3/DynamoDB, a fake `terraform` binary with
+configurable latencies and a local GitHub releases fixture. Reports per-stage
+timings from the pipeline traces plus end-to-end timings per entry point.
+
+Requires moto (`pip install "moto[s3,dynamodb]"`) in addition to requirements.txt.
+
+Usage:
+    python benchmarks/pipeline.py [--runs N] [--targets N] [--model-latency S]
+                                  [--terraform-latency init=0.5,apply=2] [--json PATH]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Marker text identifying each scripted agent by its system prompt
+AGENT_MARKERS = {
+    'documentation': 'Terraform documentation generator',
+    'terraform': 'specialized Terraform validation agent',
+    'validation': 'independent validation agent',
+}
+
+# Terraform commands the scripted terraform and validation agents run, in order
+LIFECYCLE_COMMANDS = ('init', 'validate', 'plan', 'apply', 'destroy')
+
+FAKE_TERRAFORM = '''#!{python}
+"""Fake terraform binary for offline benchmarks. Latencies come from FAKE_TERRAFORM_LATENCY."""
+import json, os, re, sys, time
+
+args = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
+command = args[0] if args else 'version'
+latencies = dict(item.split('=') for item in os.environ.get('FAKE_TERRAFORM_LATENCY', '').split(',') if '=' in item)
+time.sleep(float(latencies.get(command, latencies.get('default', 0))))
+
+def resources():
+    found = []
+    for name in sorted(os.listdir('.')):
+        if name.endswith('.tf'):
+            with open(name, encoding='utf-8') as f:
+                found += re.findall(r'resource\\s+"([^"]+)"\\s+"([^"]+)"', f.read())
+    return [{{'mode': 'managed', 'type': t, 'name': n, 'instances': [{{}}]}} for t, n in found]
+
+def write_state(items):
+    with open('terraform.tfstate', 'w', encoding='utf-8') as f:
+        json.dump({{'version': 4, 'resources': items}}, f)
+
+if command == 'init':
+    os.makedirs('.terraform/providers', exist_ok=True)
+    if not os.path.exists('.terraform.lock.hcl'):
+        with open('.terraform.lock.hcl', 'w', encoding='utf-8') as f:
+            f.write('# fake lock file\\n')
+    print('Terraform has been successfully initialized!')
+elif command == 'fmt' and sys.argv[-1] == '-':
+    sys.stdout.write(sys.stdin.read())
+elif command == 'validate':
+    print('Success! The configuration is valid.')
+elif command == 'plan':
+    print(f'Plan: {{len(resources())}} to add, 0 to change, 0 to destroy.')
+elif command == 'apply':
+    items = resources()
+    write_state(items)
+    print(f'Apply complete! Resources: {{len(items)}} added, 0 changed, 0 destroyed.')
+elif command == 'destroy':
+    write_state([])
+    print('Destroy complete! Resources destroyed.')
+elif command == 'providers' and 'schema' in args:
+    # Every benchmark resource type takes the tags the scripted agents write
+    tags = {{
+        'optional': True,
+        'nested_type': {{'nesting_mode': 'list', 'attributes': {{
+            'key': {{'type': 'string', 'required': True}}, 'value': {{'type': 'string', 'required': True}}
+        }}}}
+    }}
+    resource_schemas = {{
+        resource_type: {{'version': 1, 'block': {{'attributes': {{'id': {{'type': 'string', 'computed': True}}, 'tags': tags}}}}}}
+        for resource_type in os.environ.get('FAKE_TERRAFORM_RESOURCE_TYPES', '').split(',') if resource_type
+    }}
+    print(json.dumps({{'format_version': '1.0', 'provider_schemas': {{
+        'registry.terraform.io/hashicorp/awscc': {{'resource_schemas': resource_schemas}}
+    }}}}))
+elif command == 'version':
+    print('Terraform v1.9.0 (fake)')
+'''
+
+def write_fake_terraform(bin_dir: str) -> None:
+    """Install the fake terraform binary into bin_dir."""
+    os.makedirs(bin_dir, exist_ok=True)
+    path = os.path.join(bin_dir, 'terraform')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(FAKE_TERRAFORM.format(python=sys.executable))
+    os.chmod(path, 0o755)
+
+def write_aws_config(config_dir: str) -> Tuple[str, str]:
+    """
+    Write AWS config and credentials files with a dummy default profile.
+
+    The pipeline modules set AWS_PROFILE (to "default" unless configured), which boto3
+    rejects with ProfileNotFound on machines without ~/.aws/config.
+    """
+    os.makedirs(config_dir, exist_ok=True)
+    config_path = os.path.join(config_dir, 'config')
+    credentials_path = os.path.join(config_dir, 'credentials')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        f.write('[default]\nregion = us-west-2\n')
+    with open(credentials_path, 'w', encoding='utf-8') as f:
+        f.write('[default]\naws_access_key_id = testing\naws_secret_access_key = testing\n')
+    return config_path, credentials_path
+
+def build_releases(targets: int, per_release: int = 5) -> List[Dict]:
+    """Build GitHub release fixtures announcing `targets` new resources, newest first."""
+    releases = []
+    published = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    count = (targets + per_release - 1) // per_release
+    for index in range(count):
+        names = [f"awscc_benchmark_service{index}_{n}" for n in range(per_release)][:targets - index * per_release]
+        releases.append({
+            'tag_name': f"v1.{index + 1}.0",
+            'draft': False,
+            'published_at': (published + timedelta(days=index)).isoformat(),
+            'body': '\n'.join(f"**New Resource:** `{name}`" for name in names)
+        })
+    return list(reversed(releases))
+
+def start_github_fixture(releases: List[Dict]) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve the releases list (with ETag support) on a local port."""
+    body = json.dumps(releases).encode('utf-8')
+    etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+
+    class ReleasesHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ReleasesHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/repos/hashicorp/terraform-provider-awscc/releases"
+    return server, url
+
+def _message_text(message: Dict) -> str:
+    return '\n'.join(block['text'] for block in message.get('content', []) if 'text' in block)
+
+def _fixture_code(resource_name: str) -> str:
+    return (
+        f'resource "{resource_name}" "example" {{\n'
+        '  tags = [{\n'
+        '    key   = "Environment"\n'
+        '    value = "benchmark"\n'
+        '  }]\n'
+        '}\n'
+    )
+
+def create_scripted_model(latency: float):
+    """Create a strands model that plays scripted agent turns with Bedrock-style stream events."""
+    from strands.models import Model
+    from agents.hcl import extract_terraform_code
+
+    class ScriptedModel(Model):
+        """
+        Stub model with one script per agent.
+
+        The terraform and validation agents write main.tf with python_repl and run the
+        lifecycle through the real terraform tool (so the runner and the fake terraform
+        binary are exercised); every other agent gets its input echoed.
+        """
+
+        def __init__(self, latency: float):
+            self.latency = latency
+            self.config = {'model_id': 'scripted'}
+
+        def update_config(self, **model_config):
+            self.config.update(model_config)
+
+        def get_config(self):
+            return self.config
+
+        def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+            raise NotImplementedError("The scripted model does not support structured output")
+
+        def _respond(self, system_prompt: str, messages: List[Dict]) -> Tuple[Optional[Dict], str]:
+            """Return (tool use or None, text) for the next assistant turn."""
+            agent = next((name for name, marker in AGENT_MARKERS.items() if marker in (system_prompt or '')), None)
+            request = _message_text(messages[0])
+            tool_results = sum(1 for message in messages for block in message['content'] if 'toolResult' in block)
+            resource = re.search(r'(awscc_\w+)', request)
+            resource_name = resource.group(1) if resource else 'awscc_benchmark_resource'
+
+            if agent == 'documentation':
+                return None, f"```hcl\n{_fixture_code(resource_name)}```"
+
+            if agent in ('terraform', 'validation'):
+                code = extract_terraform_code(request)
+                work_dir = re.search(r'Pre-initialized working directory:\s*(\S+)', request).group(1)
+                if tool_results == 0:
+                    return {'name': 'python_repl', 'input': {
+                        'code': f"open({os.path.join(work_dir, 'main.tf')!r}, 'w').write({code!r})"
+                    }}, "Writing main.tf."
+                if tool_results <= len(LIFECYCLE_COMMANDS):
+                    command = LIFECYCLE_COMMANDS[tool_results - 1]
+                    return {'name': 'terraform', 'input': {'work_dir': work_dir, 'command': command}}, \
+                        f"Running terraform {command}."
+                lifecycle_results = len(LIFECYCLE_COMMANDS) + 1
+                if agent == 'terraform':
+                    return None, f"```hcl\n{code}```"
+
+                s3_path = f"analysis/resource/{resource_name}/benchmark.txt"
+                if tool_results == lifecycle_results:
+                    return {'name': 'use_aws', 'input': {
+                        'service_name': 's3',
+                        'operation_name': 'put_object',
+                        'parameters': {'Bucket': os.environ['S3_BUCKET'], 'Key': s3_path, 'Body': 'RESULT: PASSED'},
+                        'region': os.environ['AWS_REGION'],
+                        'label': 'Store validation report'
+                    }}, "Storing the validation report."
+                return None, json.dumps({
+                    'validation_result': 'success',
+                    'resource_name': resource_name,
+                    's3_path': s3_path
+                })
+
+            return None, _message_text(messages[-1]) or 'OK'
+
+        async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            tool_use, text = self._respond(system_prompt, messages)
+
+            yield {'messageStart': {'role': 'assistant'}}
+            yield {'contentBlockStart': {'start': {}}}
+            yield {'contentBlockDelta': {'delta': {'text': text}}}
+            yield {'contentBlockStop': {}}
+            if tool_use:
+                tool_use_id = f"tooluse_{hashlib.sha1(repr(messages).encode('utf-8')).hexdigest()[:12]}"
+                yield {'contentBlockStart': {'start': {'toolUse': {'toolUseId': tool_use_id, 'name': tool_use['name']}}}}
+                yield {'contentBlockDelta': {'delta': {'toolUse': {'input': json.dumps(tool_use['input'])}}}}
+                yield {'contentBlockStop': {}}
+            yield {'messageStop': {'stopReason': 'tool_use' if tool_use else 'end_turn'}}
+
+            input_tokens = (len(system_prompt or '') + len(json.dumps(messages, default=str))) // 4
+            output_tokens = (len(text) + len(json.dumps(tool_use or ''))) // 4
+            yield {'metadata': {
+                'usage': {'inputTokens': input_tokens, 'outputTokens': output_tokens, 'totalTokens': input_tokens + output_tokens},
+                'metrics': {'latencyMs': int(self.latency * 1000)}
+            }}
+
+    return ScriptedModel(latency)
+
+def create_aws_fixtures() -> None:
+    """Create the pipeline's S3 bucket and DynamoDB table inside the active moto mock."""
+    import config
+    from agents.agent_factory import get_client
+    from agents.storage_agent import GENERIC_TEMPLATE_KEY
+
+    s3 = get_client('s3')
+    s3.create_bucket(Bucket=config.S3_BUCKET, CreateBucketConfiguration={'LocationConstraint': config.AWS_REGION})
+    with open(os.path.join(REPO_ROOT, GENERIC_TEMPLATE_KEY), 'rb') as f:
+        s3.put_object(Bucket=config.S3_BUCKET, Key=GENERIC_TEMPLATE_KEY, Body=f.read())
+
+    get_client('dynamodb').create_table(
+        TableName=config.DYNAMODB_TABLE,
+        AttributeDefinitions=[
+            {'AttributeName': 'resource_name', 'AttributeType': 'S'},
+            {'AttributeName': 'timestamp', 'AttributeType': 'N'},
+            {'AttributeName': 'item_type', 'AttributeType': 'S'},
+            {'AttributeName': 'last_timestamp', 'AttributeType': 'N'}
+        ],
+        KeySchema=[
+            {'AttributeName': 'resource_name', 'KeyType': 'HASH'},
+            {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': config.DYNAMODB_LATEST_INDEX,
+            'KeySchema': [
+                {'AttributeName': 'item_type', 'KeyType': 'HASH'},
+                {'AttributeName': 'last_timestamp', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+def _stats(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        'count': len(ordered),
+        'median_ms': round(statistics.median(ordered), 1),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        'max_ms': round(ordered[-1], 1),
+        'total_ms': round(sum(ordered), 1)
+    }
+
+def summarize_traces(trace_file: str) -> Dict[str, Dict]:
+    """Aggregate stage spans per stage, and model/terraform spans per kind, from a trace file."""
+    stages: Dict[str, List[float]] = {}
+    kinds: Dict[str, List[float]] = {}
+    with open(trace_file, encoding='utf-8') as f:
+        for line in f:
+            span = json.loads(line)
+            if span['kind'] == 'stage':
+                stages.setdefault(span['name'], []).append(span['wall_ms'])
+            elif span['kind'] in ('model', 'terraform', 'tool'):
+                kinds.setdefault(span['kind'], []).append(span['wall_ms'])
+    return {
+        'stages': {name: _stats(values) for name, values in stages.items()},
+        'calls': {kind: _stats(values) for kind, values in kinds.items()}
+    }
+
+def run_benchmark(runs: int, targets: int) -> Dict[str, Dict]:
+    """Run the entry points against the offline fixtures and return the timing report."""
+    import config
+    from agents.orchestrator_agent import run_pipeline
+    from target_resource import process_resource
+
+    end_to_end: Dict[str, List[float]] = {'run_pipeline': [], 'process_resource': []}
+    for _ in range(runs):
+        start = time.perf_counter()
+        run_pipeline()
+        end_to_end['run_pipeline'].append((time.perf_counter() - start) * 1000)
+    for index in range(targets):
+        start = time.perf_counter()
+        process_resource(f"awscc_benchmark_target_{index}", config.DEFAULT_PROVIDER_VERSION)
+        end_to_end['process_resource'].append((time.perf_counter() - start) * 1000)
+
+    report = summarize_traces(config.TRACE_FILE)
+    report['end_to_end'] = {name: _stats(values) for name, values in end_to_end.items() if values}
+    return report
+
+def print_report(report: Dict[str, Dict]) -> None:
+    for section, title in (('end_to_end', 'entry point'), ('stages', 'stage'), ('calls', 'call kind')):
+        print(f"\n{title:<26} {'count':>6} {'median ms':>10} {'p95 ms':>9} {'max ms':>9} {'total ms':>10}")
+        print("-" * 76)
+        for name, stats in report[section].items():
+            print(f"{name:<26} {stats['count']:>6} {stats['median_ms']:>10.1f} {stats['p95_ms']:>9.1f} "
+                  f"{stats['max_ms']:>9.1f} {stats['total_ms']:>10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the TANGO pipeline offline against stub services")
+    parser.add_argument('--runs', type=int, default=3, help="run_pipeline() calls, one discovered resource each (default: 3)")
+    parser.add_argument('--targets', type=int, default=1, help="process_resource() calls (default: 1)")
+    parser.add_argument('--model-latency', type=float, default=0.0, help="Seconds per scripted model call (default: 0)")
+    parser.add_argument('--terraform-latency', default='',
+                        help="Fake terraform latencies, e.g. 'init=0.5,apply=2,default=0.1' (default: none)")
+    parser.add_argument('--json', help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    try:
+        from moto import mock_aws
+    except ImportError:
+        print("❌ The pipeline benchmark needs moto: pip install \"moto[s3,dynamodb]\"")
+        sys.exit(1)
+
+    work_root = tempfile.mkdtemp(prefix='tango-bench-')
+    releases = build_releases(args.runs)
+    server, releases_url = start_github_fixture(releases)
+    resource_types = [
+        name for release in releases for name in re.findall(r'`(awscc_[a-z0-9_]+)`', release['body'])
+    ] + [f"awscc_benchmark_target_{index}" for index in range(args.targets)]
+    bin_dir = os.path.join(work_root, 'bin')
+    write_fake_terraform(bin_dir)
+    aws_config_file, aws_credentials_file = write_aws_config(os.path.join(work_root, 'aws'))
+
+    # Configuration is read at import time, so everything is pointed at the fixtures first
+    os.environ.update({
+        'PATH': bin_dir + os.pathsep + os.environ.get('PATH', ''),
+        'TANGO_CACHE_DIR': os.path.join(work_root, 'cache'),
+        'WORKSPACE_ROOT': os.path.join(work_root, 'workspaces'),
+        'TRACE_FILE': os.path.join(work_root, 'traces.jsonl'),
+        'GITHUB_RELEASES_URL': releases_url,
+        'GITHUB_TOKEN': '',
+        'FAKE_TERRAFORM_LATENCY': args.terraform_latency,
+        'FAKE_TERRAFORM_RESOURCE_TYPES': ','.join(resource_types),
+        'AWS_REGION': 'us-west-2',
+        'AWS_DEFAULT_REGION': 'us-west-2',
+        # The profile must exist in the benchmark's own config files, not the user's
+        'AWS_PROFILE': 'default',
+        'AWS_CONFIG_FILE': aws_config_file,
+        'AWS_SHARED_CREDENTIALS_FILE': aws_credentials_file,
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'AWS_SESSION_TOKEN': 'testing',
+        'S3_BUCKET': 'tango-benchmark',
+        'DYNAMODB_TABLE': 'tango-benchmark-state',
+        'ORCHESTRATOR_MODE': 'code',
+        'VALIDATION_CACHE_TABLE': '',
+        'TERRAFORM_PROVIDER_MIRROR_DIR': '',
+        'BYPASS_TOOL_CONSENT': 'true',
+    })
+    sys.path.insert(0, REPO_ROOT)
+
+    print(f"🏁 Benchmarking the pipeline offline in {work_root}")
+    with mock_aws():
+        from agents.agent_factory import set_model
+
+        set_model(create_scripted_model(args.model_latency))
+        create_aws_fixtures()
+        report = run_benchmark(args.runs, args.targets)
+    server.shutdown()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Report written to {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+TANGO Multi-Agent Pipeline - Startup Benchmark
+Measures import time of the CLI entry points with `python -X importtime`
+and reports which heavy dependencies each one loads at startup.
+
+Usage:
+    python benchmarks/startup.py [--repeat N] [--top N] [--strict]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules imported by each CLI entry point (the scripts guard their work behind __main__)
+ENTRY_POINTS = ['config', 'agents', 'main', 'target_resource', 'evaluation_agent']
+
+# Packages that should only be loaded once an agent actually runs
+HEAVY_PACKAGES = ['strands', 'strands_tools', 'boto3', 'botocore', 'requests']
+
+def measure_import(module: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+    
+    Returns:
+        Tuple of (total microseconds, cumulative microseconds per top-level package)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    
+    total = 0
+    packages: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        total += int(self_us)
+        if not name.startswith(' '):
+            # Top-level import (not indented): cumulative time covers its whole subtree
+            top = name.split('.')[0]
+            packages[top] = packages.get(top, 0) + int(cumulative_us)
+    return total, packages
+
+def run_benchmark(repeat: int, top: int) -> List[str]:
+    """Benchmark every entry point, print a report and return entries that load heavy packages."""
+    offenders = []
+    print(f"{'entry point':<20} {'median ms':>10} {'min ms':>8}  heavy packages loaded")
+    print("-" * 80)
+    for module in ENTRY_POINTS:
+        totals = []
+        packages: Dict[str, int] = {}
+        for _ in range(repeat):
+            total, packages = measure_import(module)
+            totals.append(total)
+        
+        heavy = [package for package in HEAVY_PACKAGES if package in packages]
+        if heavy:
+            offenders.append(module)
+        print(f"{module:<20} {statistics.median(totals) / 1000:>10.1f} {min(totals) / 1000:>8.1f}  {', '.join(heavy) or '-'}")
+        
+        slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        for package, cumulative in slowest:
+            print(f"    {package:<30} {cumulative / 1000:>8.1f} ms")
+    return offenders
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure startup import time of the TANGO entry points")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per entry point (default: 5)")
+    parser.add_argument('--top', type=int, default=5, help="Slowest top-level imports to show (default: 5)")
+    parser.add_argument('--strict', action='store_true', help="Exit non-zero if an entry point loads heavy packages")
+    args = parser.parse_args()
+    
+    offenders = run_benchmark(args.repeat, args.top)
+    if args.strict and offenders:
+        print(f"\n❌ Heavy packages loaded at startup by: {', '.join(offenders)}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,8 @@ Uses environment variables with sensible defaults.
 """
 import os
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # AWS Configuration
 AWS_REGION = os.environ.get("AWS_REGION", "us-west-2")
 AWS_PROFILE = os.environ.get("AWS_PROFILE", "default")
@@ -16,3 +18,117 @@ DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "tango-pipeline-state")
 
 # Provider Configuration
 DEFAULT_PROVIDER_VERSION = os.environ.get("DEFAULT_PROVIDER_VERSION", "1.53.0")
+
+# Batch Configuration
+PIPELINE_WORKERS = int(os.environ.get("PIPELINE_WORKERS", "1"))
+WORKSPACE_ROOT = os.environ.get("WORKSPACE_ROOT", os.path.join(BASE_DIR, "workspaces"))
+
+# Local Cache Configuration
+CACHE_DIR = os.environ.get("TANGO_CACHE_DIR", os.path.join(BASE_DIR, ".tango-cache"))
+
+# Discovery Configuration
+DYNAMODB_SCAN_SEGMENTS = int(os.environ.get("DYNAMODB_SCAN_SEGMENTS", "4"))
+# Sparse GSI over the latest status items; empty scans the table instead
+DYNAMODB_LATEST_INDEX = os.environ.get("DYNAMODB_LATEST_INDEX", "latest-index")
+PROCESSED_INDEX_PATH = os.environ.get("PROCESSED_INDEX_PATH", os.path.join(CACHE_DIR, "processed_resources.json"))
+PROCESSED_INDEX_OVERLAP_SECONDS = int(os.environ.get("PROCESSED_INDEX_OVERLAP_SECONDS", "3600"))
+GITHUB_RELEASES_URL = os.environ.get(
+    "GITHUB_RELEASES_URL", "https://api.github.com/repos/hashicorp/terraform-provider-awscc/releases"
+)
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")
+RELEASE_INDEX_PATH = os.environ.get("RELEASE_INDEX_PATH", os.path.join(CACHE_DIR, "release_index.json"))
+
+# Terraform Configuration
+TERRAFORM_PLUGIN_CACHE_DIR = os.environ.get("TERRAFORM_PLUGIN_CACHE_DIR", os.path.join(CACHE_DIR, "terraform-plugins"))
+TERRAFORM_PROVIDER_MIRROR_DIR = os.environ.get("TERRAFORM_PROVIDER_MIRROR_DIR", "")
+WORKSPACE_SEED_DIR = os.environ.get("WORKSPACE_SEED_DIR", os.path.join(CACHE_DIR, "workspace-seeds"))
+
+# Cleanup Configuration
+CLEANUP_LLM_POLISH = os.environ.get("CLEANUP_LLM_POLISH", "true").lower() == "true"
+
+# Model and Client Configuration
+BEDROCK_MODEL_ID = os.environ.get("BEDROCK_MODEL_ID", "")
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50"))
+
+# Validation Cache Configuration
+VALIDATION_CACHE_TTL_SECONDS = int(os.environ.get("VALIDATION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+VALIDATION_CACHE_DIR = os.environ.get("VALIDATION_CACHE_DIR", os.path.join(CACHE_DIR, "validation-cache"))
+VALIDATION_CACHE_TABLE = os.environ.get("VALIDATION_CACHE_TABLE", "")
+
+# Orchestrator Configuration ("code": deterministic stage runner, "llm": orchestrator agent)
+ORCHESTRATOR_MODE = os.environ.get("ORCHESTRATOR_MODE", "code").lower()
+
+# Tracing Configuration (empty TRACE_FILE disables writing spans)
+TRACE_FILE = os.environ.get("TRACE_FILE", os.path.join(CACHE_DIR, "traces.jsonl"))
+
+# Model Record/Replay Configuration ("record", "replay" or "passthrough")
+MODEL_REPLAY_MODE = os.environ.get("MODEL_REPLAY_MODE", "passthrough").lower()
+MODEL_REPLAY_DIR = os.environ.get("MODEL_REPLAY_DIR", os.path.join(CACHE_DIR, "model-replay"))
+MODEL_REPLAY_MAX_BYTES = int(os.environ.get("MODEL_REPLAY_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Terraform Output Configuration (terraform tool output longer than the limit is summarized for the model)
+TERRAFORM_OUTPUT_FILTER = os.environ.get("TERRAFORM_OUTPUT_FILTER", "true").lower() == "true"
+TERRAFORM_OUTPUT_MAX_CHARS = int(os.environ.get("TERRAFORM_OUTPUT_MAX_CHARS", "6000"))
+TERRAFORM_LOG_DIR = os.environ.get("TERRAFORM_LOG_DIR", os.path.join(CACHE_DIR, "terraform-logs"))
+
+# Provider Schema Configuration (per-version, per-resource schema summaries)
+PROVIDER_SCHEMA_DIR = os.environ.get("PROVIDER_SCHEMA_DIR", os.path.join(CACHE_DIR, "provider-schemas"))
+PROVIDER_SCHEMA_TIMEOUT_SECONDS = int(os.environ.get("PROVIDER_SCHEMA_TIMEOUT_SECONDS", "300"))
+
+# Shared Fixture Configuration (long-lived dependency resources reused across runs)
+FIXTURES_ENABLED = os.environ.get("FIXTURES_ENABLED", "false").lower() == "true"
+FIXTURE_DIR = os.environ.get("FIXTURE_DIR", os.path.join(CACHE_DIR, "fixtures"))
+FIXTURE_STACK_NAME = os.environ.get("FIXTURE_STACK_NAME", "tango-fixtures")
+FIXTURE_MAX_IDLE_SECONDS = int(os.environ.get("FIXTURE_MAX_IDLE_SECONDS", str(7 * 24 * 3600)))
+
+# Terraform Runner Configuration (seconds per command; 0 disables a timeout)
+TERRAFORM_TIMEOUTS = os.environ.get(
+    "TERRAFORM_TIMEOUTS", "init=600,validate=120,plan=900,apply=3600,destroy=3600,default=600"
+)
+TERRAFORM_INTERRUPT_GRACE_SECONDS = int(os.environ.get("TERRAFORM_INTERRUPT_GRACE_SECONDS", "120"))
+
+# Terraform Retry Configuration (automatic retries of init/plan/apply/destroy on retryable errors, doubling the backoff)
+TERRAFORM_RETRY_ATTEMPTS = int(os.environ.get("TERRAFORM_RETRY_ATTEMPTS", "2"))
+TERRAFORM_RETRY_BACKOFF_SECONDS = float(os.environ.get("TERRAFORM_RETRY_BACKOFF_SECONDS", "15"))
+
+# Budget Configuration (per stage as stage=limit lists and per resource; 0 or a missing stage disables a limit)
+BUDGET_STAGE_SECONDS = os.environ.get("BUDGET_STAGE_SECONDS", "terraform_agent=1800,validation_agent=900")
+BUDGET_STAGE_TOKENS = os.environ.get("BUDGET_STAGE_TOKENS", "terraform_agent=1500000,validation_agent=600000")
+BUDGET_STAGE_APPLY_ATTEMPTS = os.environ.get("BUDGET_STAGE_APPLY_ATTEMPTS", "terraform_agent=5,validation_agent=2")
+BUDGET_RESOURCE_SECONDS = float(os.environ.get("BUDGET_RESOURCE_SECONDS", "3600"))
+BUDGET_RESOURCE_TOKENS = int(os.environ.get("BUDGET_RESOURCE_TOKENS", "2500000"))
+BUDGET_RESOURCE_APPLY_ATTEMPTS = int(os.environ.get("BUDGET_RESOURCE_APPLY_ATTEMPTS", "8"))
+
+# Scheduler Configuration (resource starts per minute per AWS service and per region; 0 disables a limit)
+SCHEDULER_SERVICE_RATES = os.environ.get("SCHEDULER_SERVICE_RATES", "iam=2,ec2=4,default=6")
+SCHEDULER_REGION_RATE = float(os.environ.get("SCHEDULER_REGION_RATE", "20"))
+SCHEDULER_BURST = float(os.environ.get("SCHEDULER_BURST", "2"))
+
+# Work Lease Configuration (empty LEASE_TABLE disables leasing; LEASE_OWNER defaults to <hostname>-<pid>)
+LEASE_TABLE = os.environ.get("LEASE_TABLE", "")
+LEASE_TTL_SECONDS = int(os.environ.get("LEASE_TTL_SECONDS", "600"))
+LEASE_HEARTBEAT_SECONDS = int(os.environ.get("LEASE_HEARTBEAT_SECONDS", "60"))
+LEASE_OWNER = os.environ.get("LEASE_OWNER", "")
+
+# Sweeper Configuration (deletes Environment=example resources left behind by runs)
+SWEEP_REGIONS = os.environ.get("SWEEP_REGIONS", AWS_REGION)
+SWEEP_CONCURRENCY = int(os.environ.get("SWEEP_CONCURRENCY", "8"))
+SWEEP_MAX_ATTEMPTS = int(os.environ.get("SWEEP_MAX_ATTEMPTS", "5"))
+SWEEP_DELETE_TIMEOUT_SECONDS = int(os.environ.get("SWEEP_DELETE_TIMEOUT_SECONDS", "900"))
+SWEEP_LEDGER_FILE = os.environ.get("SWEEP_LEDGER_FILE", os.path.join(CACHE_DIR, "sweep-ledger.jsonl"))
+# Resources first seen less than this long ago may belong to a deployment still in flight
+SWEEP_MIN_AGE_SECONDS = int(os.environ.get("SWEEP_MIN_AGE_SECONDS", "7200"))
+SWEEP_SIGHTINGS_FILE = os.environ.get("SWEEP_SIGHTINGS_FILE", os.path.join(CACHE_DIR, "sweep-sightings.json"))
+
+# Evaluation Configuration (batch mode compares stored code with a local snapshot of the official examples)
+EXAMPLES_TARBALL_URL = os.environ.get(
+    "EXAMPLES_TARBALL_URL", "https://api.github.com/repos/hashicorp/terraform-provider-awscc/tarball/main"
+)
+EXAMPLES_SNAPSHOT_DIR = os.environ.get("EXAMPLES_SNAPSHOT_DIR", os.path.join(CACHE_DIR, "awscc-examples"))
+EXAMPLES_SNAPSHOT_MAX_AGE_SECONDS = int(os.environ.get("EXAMPLES_SNAPSHOT_MAX_AGE_SECONDS", str(24 * 3600)))
+EVALUATION_WORKERS = int(os.environ.get("EVALUATION_WORKERS", "8"))
+EVALUATION_REPORT_DIR = os.environ.get("EVALUATION_REPORT_DIR", os.path.join(BASE_DIR, "evaluation-reports"))
+
+# Pre-flight Configuration (local checks on generated code before any real deployment)
+PREFLIGHT_ENABLED = os.environ.get("PREFLIGHT_ENABLED", "true").lower() == "true"
+PREFLIGHT_MAX_REGENERATIONS = int(os.environ.get("PREFLIGHT_MAX_REGENERATIONS", "2"))
@@ -1,13 +1,17 @@
 """
 TANGO Multi-Agent Pipeline - Standalone Evaluation Agent
 Evaluates Terraform code quality and documentation alignment for a single resource
-by retrieving the code from S3 and comparing with official GitHub examples
+by retrieving the code from S3 and comparing with official GitHub examples, or for
+many resources at once against a local snapshot of the official examples
 """
 
+import json
 import os
+import re
 import sys
-from strands import Agent
-from strands_tools import python_repl, use_aws
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 os.environ['BYPASS_TOOL_CONSENT'] = 'true'
 
@@ -48,6 +52,10 @@ def evaluate_resource(resource_name):
     service_name = resource_name.replace("awscc_", "")
     
     try:
+        # Imported here so the CLI starts without loading strands for usage errors
+        from strands import Agent
+        from strands_tools import python_repl, use_aws
+        
         agent = Agent(
             system_prompt=EVALUATION_SYSTEM_PROMPT,
             tools=[python_repl, use_aws]
@@ -91,12 +99,181 @@ def evaluate_resource(resource_name):
     except Exception as e:
         return f"Error in evaluation agent: {str(e)}\n\nPlease ensure you have run 'mwinit' to authenticate with AWS before running this script."
 
+BATCH_EVALUATION_PROMPT = """
+Evaluate the Terraform code for the {resource_name} resource.
+
+OUR CODE ({s3_key}):
+```hcl
+{code}
+```
+
+OFFICIAL EXAMPLES (terraform-provider-awscc/examples/resources/{resource_name}):
+{examples}
+
+Compare the code with the official examples and assess its quality, completeness and adherence to
+best practices. Keep the evaluation short: strengths, areas for improvement and specific recommendations.
+End with a line of the form "QUALITY_SCORE: <0-100>".
+"""
+
+QUALITY_SCORE = re.compile(r'QUALITY_SCORE:\s*(\d{1,3})')
+
+def _stored_code_key(resource_name: str) -> str:
+    return f"examples/resources/{resource_name}/{resource_name.replace('awscc_', '', 1)}.tf"
+
+def list_stored_resources() -> List[str]:
+    """List every resource with stored example code in the pipeline bucket."""
+    import config
+    from agents.agent_factory import get_client
+    
+    paginator = get_client('s3').get_paginator('list_objects_v2')
+    resources = []
+    for page in paginator.paginate(Bucket=config.S3_BUCKET, Prefix='examples/resources/', Delimiter='/'):
+        for prefix in page.get('CommonPrefixes', []):
+            resources.append(prefix['Prefix'].rstrip('/').rsplit('/', 1)[-1])
+    return sorted(resources)
+
+def download_stored_code(resource_names: List[str]) -> Dict[str, Optional[str]]:
+    """Download the stored .tf file of every resource concurrently (None when missing)."""
+    import config
+    from agents.agent_factory import get_client
+    
+    s3 = get_client('s3')
+    
+    def download(resource_name: str) -> Optional[str]:
+        try:
+            response = s3.get_object(Bucket=config.S3_BUCKET, Key=_stored_code_key(resource_name))
+            return response['Body'].read().decode('utf-8')
+        except s3.exceptions.NoSuchKey:
+            return None
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(config.AWS_MAX_POOL_CONNECTIONS, len(resource_names)))) as executor:
+        return dict(zip(resource_names, executor.map(download, resource_names)))
+
+def evaluate_code(resource_name: str, code: str, examples: Dict[str, str]) -> Dict:
+    """Evaluate one resource's code against its official examples with a single model call."""
+    from agents.agent_factory import checkout_agent
+    
+    example_text = "\n".join(
+        f"--- {file_name} ---\n{content}" for file_name, content in examples.items()
+    ) or "(no official examples exist for this resource)"
+    prompt = BATCH_EVALUATION_PROMPT.format(
+        resource_name=resource_name, s3_key=_stored_code_key(resource_name), code=code, examples=example_text
+    )
+    with checkout_agent("evaluation", EVALUATION_SYSTEM_PROMPT) as agent:
+        report = str(agent(prompt))
+    match = QUALITY_SCORE.search(report)
+    return {
+        "resource_name": resource_name,
+        "score": min(100, int(match.group(1))) if match else None,
+        "official_examples": sorted(examples),
+        "report": report
+    }
+
+def evaluate_batch(resource_names: Optional[List[str]] = None, workers: Optional[int] = None) -> Dict:
+    """
+    Evaluate many resources in parallel and write one consolidated report.
+    
+    Official examples come from the local examples snapshot (one tarball fetch) and
+    our code from concurrent S3 downloads, so each evaluation is a single model call.
+    
+    Args:
+        resource_names: Resources to evaluate (defaults to every resource stored in S3)
+        workers: Concurrent evaluations (defaults to EVALUATION_WORKERS)
+    
+    Returns:
+        The consolidated report, also written as JSON and Markdown to EVALUATION_REPORT_DIR
+    """
+    import config
+    from agents.examples_snapshot import get_snapshot, read_examples
+    
+    start = time.time()
+    snapshot = get_snapshot()
+    resource_names = resource_names or list_stored_resources()
+    print(f"📥 Downloading stored code for {len(resource_names)} resources...")
+    code = download_stored_code(resource_names)
+    
+    missing = sorted(name for name, content in code.items() if content is None)
+    to_evaluate = [name for name in resource_names if code.get(name) is not None]
+    
+    def evaluate(resource_name: str) -> Dict:
+        try:
+            result = evaluate_code(resource_name, code[resource_name], read_examples(resource_name, snapshot))
+        except Exception as e:
+            result = {"resource_name": resource_name, "score": None, "official_examples": [], "error": str(e)}
+        score = f"{result['score']}%" if result.get("score") is not None else "no score"
+        print(f"{'✅' if 'error' not in result else '❌'} {resource_name}: {score}")
+        return result
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers or config.EVALUATION_WORKERS)) as executor:
+        results = list(executor.map(evaluate, to_evaluate))
+    
+    scores = [result["score"] for result in results if result.get("score") is not None]
+    report = {
+        "generated_at": int(time.time()),
+        "duration_seconds": round(time.time() - start, 1),
+        "evaluated": len(results),
+        "average_score": round(sum(scores) / len(scores), 1) if scores else None,
+        "without_official_examples": sorted(r["resource_name"] for r in results if not r["official_examples"]),
+        "missing_code": missing,
+        "results": sorted(results, key=lambda result: (result.get("score") is None, result.get("score") or 0))
+    }
+    report["paths"] = write_batch_report(report)
+    return report
+
+def write_batch_report(report: Dict) -> List[str]:
+    """Write the consolidated report as JSON and as a Markdown summary, lowest scores first."""
+    import config
+    
+    os.makedirs(config.EVALUATION_REPORT_DIR, exist_ok=True)
+    base = os.path.join(config.EVALUATION_REPORT_DIR, f"evaluation-{time.strftime('%Y%m%d-%H%M%S')}")
+    with open(f"{base}.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    
+    lines = [
+        "# AWSCC Example Evaluation",
+        "",
+        f"- Resources evaluated: {report['evaluated']}",
+        f"- Average quality score: {report['average_score']}%",
+        f"- Without official examples: {len(report['without_official_examples'])}",
+        f"- Stored code missing: {', '.join(report['missing_code']) or 'none'}",
+        "",
+        "| Resource | Score | Official examples |",
+        "|----------|-------|-------------------|",
+    ]
+    for result in report["results"]:
+        score = f"{result['score']}%" if result.get("score") is not None else result.get("error", "no score")[:80]
+        lines.append(f"| {result['resource_name']} | {score} | {len(result['official_examples'])} |")
+    for result in report["results"]:
+        if result.get("report"):
+            lines.extend(["", f"## {result['resource_name']}", "", result["report"].strip()])
+    with open(f"{base}.md", "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return [f"{base}.json", f"{base}.md"]
+
+def _batch_main(args: List[str]) -> None:
+    workers = None
+    if "--workers" in args:
+        position = args.index("--workers")
+        workers = int(args[position + 1])
+        args = args[:position] + args[position + 2:]
+    
+    report = evaluate_batch(args or None, workers)
+    print("=" * 80)
+    print(f"Evaluated {report['evaluated']} resources in {report['duration_seconds']}s, average score {report['average_score']}%")
+    for path in report["paths"]:
+        print(f"Report: {path}")
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python evaluation_agent.py <resource_name>")
+        print("       python evaluation_agent.py --batch [resource_name ...] [--workers N]")
         print("Example: python evaluation_agent.py awscc_s3_bucket")
         sys.exit(1)
     
+    if sys.argv[1] == "--batch":
+        _batch_main(sys.argv[2:])
+        sys.exit(0)
+    
     resource_name = sys.argv[1]
     
     print(f"Evaluating {resource_name} (comparing with official GitHub examples)...")
@@ -3,9 +3,10 @@ TANGO Multi-Agent Pipeline - Main Entry Point
 Executes the complete multi-agent pipeline for AWS CloudControl resource validation
 """
 
+import argparse
 import sys
 import os
-from agents.orchestrator_agent import run_pipeline
+from agents.orchestrator_agent import run_pipeline, run_batch, run_status
 import config
 
 # Set environment variables from config
@@ -13,26 +14,65 @@ os.environ['AWS_PROFILE'] = config.AWS_PROFILE
 os.environ['AWS_REGION'] = config.AWS_REGION
 os.environ['BYPASS_TOOL_CONSENT'] = 'true'
 
+# Exit code when discovery finds no unprocessed resources
+EXIT_NO_RESOURCES = 3
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="TANGO Multi-Agent Pipeline")
+    parser.add_argument(
+        "--max-resources", type=int, default=1,
+        help="Maximum number of resources to process (default: 1)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=config.PIPELINE_WORKERS,
+        help=f"Number of resources processed concurrently (default: {config.PIPELINE_WORKERS})"
+    )
+    return parser.parse_args(argv)
+
 def main():
     """Main entry point for the TANGO multi-agent pipeline"""
+    args = parse_args()
+    
     print("🎯 TANGO Multi-Agent Pipeline")
     print("Automated AWS CloudControl Resource Validation")
     print("=" * 60)
     
     try:
+        if args.max_resources > 1:
+            # Drain the backlog with a pool of workers
+            results = run_batch(args.max_resources, args.workers)
+            
+            if not results:
+                print("\nℹ️ No unprocessed resources left")
+                sys.exit(EXIT_NO_RESOURCES)
+            if all(result["success"] for result in results):
+                print("\n✅ Batch execution completed successfully!")
+                sys.exit(0)
+            else:
+                print("\n❌ Batch execution finished with failures")
+                sys.exit(1)
+        
         # Execute the multi-agent pipeline
-        result = run_pipeline()
+        status = run_status(run_pipeline())
         
-        if result:
+        if status == "success":
             print("\n✅ Pipeline execution completed successfully!")
             print("🔄 Run again to process the next resource")
             sys.exit(0)
+        elif status == "no_resources":
+            print("\nℹ️ No unprocessed resources left")
+            sys.exit(EXIT_NO_RESOURCES)
         else:
             print("\n❌ Pipeline execution failed")
             sys.exit(1)
             
     except KeyboardInterrupt:
         print("\n❌ Pipeline interrupted by user")
+        # Interrupt running terraform commands and destroy what interrupted applies created
+        runner = sys.modules.get("agents.terraform_runner")
+        if runner and runner.terraform_runner.cancel_all(wait_seconds=config.TERRAFORM_INTERRUPT_GRACE_SECONDS):
+            print("🛑 Interrupted running terraform commands")
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ Pipeline error: {e}")
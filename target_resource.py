@@ -5,7 +5,7 @@ Processes a specific AWSCC resource through the full orchestration pipeline
 
 import sys
 import os
-from agents.orchestrator_agent import orchestrator
+from agents.orchestrator_agent import run_resource, run_status
 import config
 
 # Set environment variables from config
@@ -23,25 +23,12 @@ def process_resource(resource_name, provider_version=None):
     print(f"Using provider version: {provider_version}")
     print("=" * 60)
     
-    processing_prompt = f"""
-    Execute the complete pipeline workflow for the AWS CloudControl resource: {resource_name}
-    
-    IMPORTANT: Skip the discovery step and use this resource information directly:
-    {{
-      "resource_name": "{resource_name}",
-      "provider_version": "{provider_version}"
-    }}
-    
-    Continue with the normal workflow from there:
-    1. Generate Terraform code using the documentation_agent
-    2. Validate with the terraform_agent
-    3. Clean up the Terraform code with the terraform_cleanup_agent
-    4. Store results with the storage_agent
-    """
-    
     try:
-        # Execute the orchestrator with our processing prompt
-        result = orchestrator(processing_prompt)
+        # Execute the orchestrator for this resource
+        result = run_resource(resource_name, provider_version)
+        if run_status(result) != "success":
+            print("\n❌ Resource processing failed")
+            return False
         print("\n✅ Resource processing completed!")
         return True
     except Exception as e:
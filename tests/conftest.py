@@ -0,0 +1,69 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the agents package and config from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def aws(monkeypatch):
+    """Mock AWS with moto and give the shared client factory a fresh session."""
+    moto = pytest.importorskip('moto')
+    import config
+    from agents import agent_factory
+
+    for name in ('AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_SECURITY_TOKEN', 'AWS_SESSION_TOKEN'):
+        monkeypatch.setenv(name, 'testing')
+    monkeypatch.delenv('AWS_PROFILE', raising=False)
+    monkeypatch.setenv('AWS_DEFAULT_REGION', config.AWS_REGION)
+    monkeypatch.setattr(agent_factory, '_session', None)
+    monkeypatch.setattr(agent_factory, '_clients', {})
+    with moto.mock_aws():
+        yield
+
+@pytest.fixture
+def state_table(aws):
+    """The pipeline state table with its latest-index GSI, as in dynamodb-schema.md."""
+    import config
+    from agents.agent_factory import get_client
+
+    get_client('dynamodb').create_table(
+        TableName=config.DYNAMODB_TABLE,
+        AttributeDefinitions=[
+            {'AttributeName': 'resource_name', 'AttributeType': 'S'},
+            {'AttributeName': 'timestamp', 'AttributeType': 'N'},
+            {'AttributeName': 'item_type', 'AttributeType': 'S'},
+            {'AttributeName': 'last_timestamp', 'AttributeType': 'N'}
+        ],
+        KeySchema=[
+            {'AttributeName': 'resource_name', 'KeyType': 'HASH'},
+            {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': config.DYNAMODB_LATEST_INDEX,
+            'KeySchema': [
+                {'AttributeName': 'item_type', 'KeyType': 'HASH'},
+                {'AttributeName': 'last_timestamp', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    return config.DYNAMODB_TABLE
+
+@pytest.fixture
+def history(state_table):
+    """Return (timestamp, status) of every history row of a resource, oldest first."""
+    from agents.agent_factory import get_client
+
+    def rows(resource_name):
+        items = get_client('dynamodb').query(
+            TableName=state_table,
+            KeyConditionExpression='resource_name = :name AND #ts > :zero',
+            ExpressionAttributeNames={'#ts': 'timestamp'},
+            ExpressionAttributeValues={':name': {'S': resource_name}, ':zero': {'N': '0'}}
+        )['Items']
+        return [(int(item['timestamp']['N']), item['status']['S']) for item in items]
+
+    return rows
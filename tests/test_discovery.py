@@ -0,0 +1,126 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import config
+from agents import discovery_agent
+
+PAGE_SIZE = 2
+
+def release(number, draft=False):
+    return {
+        'tag_name': f"v1.{number}.0",
+        'published_at': f"2025-01-{number:02d}T00:00:00Z",
+        'draft': draft,
+        'body': f"**New Resource:** `awscc_example_thing_{number}`"
+    }
+
+class FakeGitHub(BaseHTTPRequestHandler):
+    """Serves the release list newest first, PAGE_SIZE per page, with an ETag and Link headers."""
+    releases = []
+    requests = []
+    fail = False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        page = int(parse_qs(url.query).get('page', ['1'])[0])
+        type(self).requests.append({'page': page, 'if_none_match': self.headers.get('If-None-Match')})
+        if type(self).fail:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        body = json.dumps(self.releases).encode()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        items = self.releases[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', etag)
+        if page * PAGE_SIZE < len(self.releases):
+            host, port = self.server.server_address
+            self.send_header('Link', f'<http://{host}:{port}/releases?page={page + 1}>; rel="next"')
+        self.end_headers()
+        self.wfile.write(json.dumps(items).encode())
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def github(tmp_path, monkeypatch):
+    FakeGitHub.releases = [release(number) for number in range(5, 0, -1)]
+    FakeGitHub.requests = []
+    FakeGitHub.fail = False
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitHub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    monkeypatch.setattr(config, 'GITHUB_RELEASES_URL', f"http://{host}:{port}/releases")
+    monkeypatch.setattr(config, 'RELEASE_INDEX_PATH', str(tmp_path / 'release_index.json'))
+    monkeypatch.setattr(config, 'GITHUB_TOKEN', '')
+    yield FakeGitHub
+    server.shutdown()
+    server.server_close()
+
+def tags(index):
+    return [entry['tag_name'] for entry in index['releases']]
+
+def test_first_refresh_follows_every_page(github):
+    github.releases.insert(0, release(6, draft=True))
+
+    index = discovery_agent.refresh_release_index()
+
+    assert tags(index) == ['v1.5.0', 'v1.4.0', 'v1.3.0', 'v1.2.0', 'v1.1.0']
+    assert index['releases'][0]['resources'] == ['awscc_example_thing_5']
+    assert [request['page'] for request in github.requests] == [1, 2, 3]
+    assert github.requests[0]['if_none_match'] is None
+    with open(config.RELEASE_INDEX_PATH, encoding='utf-8') as f:
+        assert json.load(f) == index
+
+def test_unchanged_releases_cost_one_not_modified_request(github):
+    index = discovery_agent.refresh_release_index()
+    github.requests.clear()
+
+    assert discovery_agent.refresh_release_index() == index
+    assert github.requests == [{'page': 1, 'if_none_match': index['etag']}]
+
+def test_new_releases_stop_at_the_first_known_release(github):
+    first = discovery_agent.refresh_release_index()
+    github.releases.insert(0, release(6))
+    github.requests.clear()
+
+    index = discovery_agent.refresh_release_index()
+
+    assert tags(index)[0] == 'v1.6.0' and len(index['releases']) == 6
+    assert index['etag'] != first['etag']
+    assert [request['page'] for request in github.requests] == [1]
+    assert github.requests[0]['if_none_match'] == first['etag']
+
+def test_etag_is_ignored_without_indexed_releases(github):
+    with open(config.RELEASE_INDEX_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'etag': '"stale"', 'releases': []}, f)
+
+    index = discovery_agent.refresh_release_index()
+
+    assert len(index['releases']) == 5
+    assert github.requests[0]['if_none_match'] is None
+
+def test_releases_fall_back_to_the_saved_index_when_github_fails(github):
+    index = discovery_agent.refresh_release_index()
+    github.fail = True
+
+    assert discovery_agent.get_github_releases() == index['releases']
+
+def test_agent_submodules_are_modules():
+    import agents.discovery_agent as module
+
+    assert module is discovery_agent
+    assert callable(module.refresh_release_index)
@@ -0,0 +1,59 @@
+import pytest
+from agents.error_classifier import (
+    FIXABLE, RETRYABLE, TERMINAL, Classification, classify, classify_failure, pop_failures, record_failure,
+    terminal_failure
+)
+
+@pytest.mark.parametrize('output, error_class, code', [
+    # Throttling is retryable, even when reported as a LimitExceededException
+    ('Error: LimitExceededException: Rate exceeded', RETRYABLE, 'Throttling'),
+    ('api error ThrottlingException: Rate exceeded', RETRYABLE, 'Throttling'),
+    ('RequestLimitExceeded: Request limit exceeded.', RETRYABLE, 'Throttling'),
+    ('InternalFailure: An internal error occurred', RETRYABLE, 'ServiceUnavailable'),
+    # Quotas are terminal only with quota wording
+    ('ServiceQuotaExceededException: quota exceeded for resource type', TERMINAL, 'QuotaExceeded'),
+    ('LimitExceededException: The maximum number of VPCs has been reached', TERMINAL, 'QuotaExceeded'),
+    ('TypeNotFoundException: The type AWS::Foo::Bar cannot be found', TERMINAL, 'TypeNotFound'),
+    ('UnsupportedActionException: Resource type does not support LIST action', TERMINAL, 'UnsupportedAction'),
+    ('OptInRequired: You are not subscribed to this service', TERMINAL, 'OptInRequired'),
+    ('User: arn:aws:sts::1:assumed-role/ci/x is not authorized to perform: ec2:CreateVpc', TERMINAL, 'AccessDenied'),
+    # Permission problems caused by the example's own IAM resources can be fixed in code
+    ('User: arn:aws:sts::1:assumed-role/ci/x is not authorized to perform: iam:PassRole on resource: '
+     'arn:aws:iam::1:role/example', FIXABLE, 'PolicyConfiguration'),
+    ('AccessDeniedException: User is not authorized to perform: kms:CreateGrant because no resource-based '
+     'policy allows the kms:CreateGrant action', FIXABLE, 'PolicyConfiguration'),
+    ('InvalidParameterValueException: The role defined for the function cannot be assumed by Lambda.',
+     FIXABLE, 'PolicyConfiguration'),
+    ('MalformedPolicyDocument: Invalid principal in policy', FIXABLE, 'PolicyConfiguration'),
+    ('Error: Unsupported argument', FIXABLE, 'InvalidConfiguration'),
+    ("InvalidVpcID.NotFound: The vpc ID 'vpc-123' does not exist", FIXABLE, 'DependencyNotFound'),
+    ('something unexpected happened', FIXABLE, 'Unclassified'),
+])
+def test_classify(output, error_class, code):
+    classification = classify(output)
+    assert (classification.error_class, classification.code) == (error_class, code)
+
+def test_terminal_line_outranks_other_lines():
+    output = '\n'.join([
+        'Error: ThrottlingException: Rate exceeded',
+        '│ Error: Unsupported argument',
+        '│ Error: TypeNotFoundException: The type AWS::Foo::Bar cannot be found',
+    ])
+    classification = classify(output)
+    assert classification.code == 'TypeNotFound'
+    assert classification.evidence.startswith('Error: TypeNotFoundException')
+
+def test_classify_failure_prefers_reported_classification():
+    reported = classify('TypeNotFoundException: The type AWS::Foo::Bar cannot be found')
+    details = f"TERRAFORM_LIFECYCLE_FAILED: Unsupported argument\n{reported.format()}"
+    assert classify_failure(details).code == 'TypeNotFound'
+    assert classify_failure('Error: Unsupported argument').code == 'InvalidConfiguration'
+
+def test_failure_registry(tmp_path):
+    work_dir = str(tmp_path)
+    record_failure(work_dir, Classification(RETRYABLE, 'Throttling', '', ''))
+    assert terminal_failure(work_dir) is None
+    record_failure(work_dir, Classification(TERMINAL, 'TypeNotFound', '', ''))
+    assert terminal_failure(work_dir).code == 'TypeNotFound'
+    assert pop_failures(work_dir).code == 'TypeNotFound'
+    assert pop_failures(work_dir) is None
@@ -0,0 +1,133 @@
+import pytest
+
+from agents.hcl import (
+    Attribute, HCLParseError, extract_terraform_code, parse, parse_blocks, remove_spans,
+    rewrite_strings, strip_comments, walk
+)
+
+NESTED = '''# The example bucket
+resource "awscc_s3_bucket" "example" {
+  bucket_name = "example-bucket"
+
+  versioning_configuration {
+    status = "Enabled"
+  }
+
+  lifecycle_configuration {
+    rules = [{
+      id     = "expire"
+      status = "Enabled"
+    }]
+  }
+
+  tags = [{
+    key   = "Name"
+    value = "example-${var.suffix}"
+  }]
+}
+
+output "arn" {
+  value = awscc_s3_bucket.example.arn
+}
+'''
+
+HEREDOC = '''resource "awscc_iam_role" "example" {
+  role_name = "example-role"
+  assume_role_policy_document = <<EOF
+{
+  "Statement": [{ "Effect": "Allow" }]
+}
+# not a comment
+EOF
+  description = "after the heredoc"
+}
+
+resource "awscc_lambda_function" "example" {
+  code = {
+    zip_file = <<-PY
+      def handler(event, context):
+          return {"ok": "}"}
+      PY
+  }
+}
+'''
+
+def test_nested_blocks_keep_their_structure():
+    bucket, output = parse_blocks(NESTED)
+
+    assert (bucket.type, bucket.labels) == ('resource', ['awscc_s3_bucket', 'example'])
+    assert (output.type, output.labels) == ('output', ['arn'])
+    assert [block.type for block in bucket.blocks] == ['versioning_configuration', 'lifecycle_configuration']
+    assert [attribute.name for attribute in bucket.attributes] == ['bucket_name', 'tags']
+    assert bucket.blocks[0].attributes[0].value == '"Enabled"'
+
+def test_multiline_values_span_their_brackets():
+    tags = parse_blocks(NESTED)[0].attributes[1]
+
+    assert tags.value.startswith('[{') and tags.value.endswith('}]')
+    assert 'example-${var.suffix}' in tags.value
+    assert NESTED[tags.value_start:tags.value_end] == tags.value
+
+def test_block_spans_cover_leading_comments_and_trailing_newline():
+    bucket = parse_blocks(NESTED)[0]
+
+    assert NESTED[bucket.start:].startswith('# The example bucket\n')
+    assert NESTED[bucket.end - 2:bucket.end] == '}\n'
+    assert remove_spans(NESTED, [(bucket.start, bucket.end)]).lstrip().startswith('output "arn"')
+
+def test_walk_visits_nested_items_depth_first():
+    names = [item.name if isinstance(item, Attribute) else item.type for item in walk(parse(NESTED))]
+
+    assert names == ['resource', 'bucket_name', 'versioning_configuration', 'status',
+                     'lifecycle_configuration', 'rules', 'tags', 'output', 'value']
+
+def test_heredocs_are_opaque_to_the_parser():
+    role = parse_blocks(HEREDOC)[0]
+
+    assert [attribute.name for attribute in role.attributes] == [
+        'role_name', 'assume_role_policy_document', 'description'
+    ]
+    policy = role.attributes[1].value
+    assert policy.startswith('<<EOF\n') and policy.endswith('EOF')
+    assert '# not a comment' in policy
+    assert role.attributes[2].value == '"after the heredoc"'
+
+def test_indented_heredoc_with_braces_in_a_nested_object():
+    code = parse_blocks(HEREDOC)[1].attributes[0]
+
+    assert code.name == 'code'
+    assert 'return {"ok": "}"}' in code.value
+    assert code.value.endswith('}')
+
+def test_strip_comments_keeps_heredocs_and_strings():
+    text = 'a = "x # y" # drop me\nb = <<EOF\n# keep me\nEOF\n// drop me too\n'
+
+    assert strip_comments(text) == 'a = "x # y" \nb = <<EOF\n# keep me\nEOF\n\n'
+
+def test_rewrite_strings_skips_heredocs_and_comments():
+    text = 'a = "example"\n# "example"\nb = <<EOF\n"example"\nEOF\nc = "${var.x}-example"\n'
+
+    rewritten = rewrite_strings(text, lambda s: s.replace('example', 'sample'))
+
+    assert rewritten == 'a = "sample"\n# "example"\nb = <<EOF\n"example"\nEOF\nc = "${var.x}-sample"\n'
+
+def test_extract_terraform_code_drops_trailing_prose():
+    text = 'Here is the code:\n\n' + NESTED + '\nThis creates a bucket.\n'
+
+    assert extract_terraform_code(text) == NESTED.removeprefix('# The example bucket\n')
+
+def test_extract_terraform_code_prefers_the_longest_fence():
+    text = '```hcl\nlocals {}\n```\nand\n```terraform\n' + NESTED + '```\n'
+
+    assert extract_terraform_code(text) == NESTED
+
+@pytest.mark.parametrize('text', [
+    'resource "a" "b" {\n  x = 1\n',
+    'x = <<EOF\nnever closed\n',
+    'x = "unterminated\n',
+    '/* open comment',
+    'x = [1, 2\n',
+])
+def test_malformed_code_raises(text):
+    with pytest.raises(HCLParseError):
+        parse(text)
@@ -0,0 +1,46 @@
+from agents import latest_status
+from agents.agent_factory import get_client
+
+def write(resource_name, timestamp, status):
+    record = {'resource_name': resource_name, 'timestamp': timestamp, 'status': status}
+    item = {'resource_name': {'S': resource_name}, 'timestamp': {'N': str(timestamp)}, 'status': {'S': status}}
+    return latest_status.write_with_history(item, record)
+
+def test_pointer_follows_the_newest_run(history):
+    assert write('awscc_s3_bucket', 100, 'failed') is True
+    assert write('awscc_s3_bucket', 200, 'success') is True
+
+    latest = latest_status.get_latest('awscc_s3_bucket', consistent=True)
+    assert (latest['status'], latest['last_timestamp']) == ('success', 200)
+    assert history('awscc_s3_bucket') == [(100, 'failed'), (200, 'success')]
+
+def test_a_slow_older_write_keeps_its_history_row_but_not_the_pointer(history):
+    write('awscc_s3_bucket', 200, 'success')
+
+    assert write('awscc_s3_bucket', 100, 'failed') is False
+
+    latest = latest_status.get_latest('awscc_s3_bucket', consistent=True)
+    assert (latest['status'], latest['last_timestamp']) == ('success', 200)
+    assert history('awscc_s3_bucket') == [(100, 'failed'), (200, 'success')]
+
+def test_unprocessed_resources_have_no_latest_status(state_table):
+    assert latest_status.get_latest('awscc_ec2_vpc', consistent=True) is None
+
+def test_latest_index_lists_each_resource_once(state_table):
+    write('awscc_s3_bucket', 100, 'failed')
+    write('awscc_s3_bucket', 300, 'success')
+    write('awscc_ec2_vpc', 200, 'success')
+
+    assert latest_status.query_processed_resources() == ({'awscc_s3_bucket', 'awscc_ec2_vpc'}, 300)
+    assert [entry['resource_name'] for entry in latest_status.query_latest(since=250)] == ['awscc_s3_bucket']
+
+def test_backfill_points_at_the_newest_history_row(state_table):
+    dynamodb = get_client('dynamodb')
+    for timestamp, status in ((100, 'failed'), (200, 'success')):
+        dynamodb.put_item(TableName=state_table, Item={
+            'resource_name': {'S': 'awscc_s3_bucket'}, 'timestamp': {'N': str(timestamp)}, 'status': {'S': status}
+        })
+
+    assert latest_status.backfill() == 1
+    assert latest_status.get_latest('awscc_s3_bucket', consistent=True)['status'] == 'success'
+    assert latest_status.backfill() == 0
@@ -0,0 +1,109 @@
+import pytest
+
+from agents.agent_factory import get_client
+from agents.leases import LeaseLost, LeaseManager
+
+TABLE = 'tango-leases'
+
+@pytest.fixture
+def managers(aws):
+    """Two workers sharing a lease table, as in dynamodb-schema.md."""
+    get_client('dynamodb').create_table(
+        TableName=TABLE,
+        AttributeDefinitions=[{'AttributeName': 'resource_name', 'AttributeType': 'S'}],
+        KeySchema=[{'AttributeName': 'resource_name', 'KeyType': 'HASH'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    created = []
+
+    def manager(owner, ttl_seconds=600):
+        lease_manager = LeaseManager(TABLE, ttl_seconds, heartbeat_seconds=3600, owner=owner)
+        created.append(lease_manager)
+        return lease_manager
+
+    yield manager
+    for lease_manager in created:
+        lease_manager.release_all()
+
+def lease(resource_name):
+    item = get_client('dynamodb').get_item(TableName=TABLE, Key={'resource_name': {'S': resource_name}}).get('Item')
+    return item and {'owner': item['owner']['S'], 'claims': int(item['claims']['N'])}
+
+def test_a_resource_is_leased_to_one_worker_at_a_time(managers):
+    first, second = managers('worker-a'), managers('worker-b')
+
+    assert first.claim('awscc_s3_bucket') is True
+    assert second.claim('awscc_s3_bucket') is False
+    assert first.claim('awscc_s3_bucket') is True
+    assert first.held() == ['awscc_s3_bucket'] and second.held() == []
+    assert lease('awscc_s3_bucket') == {'owner': 'worker-a', 'claims': 1}
+
+def test_released_leases_can_be_claimed_again(managers):
+    first, second = managers('worker-a'), managers('worker-b')
+    first.claim('awscc_s3_bucket')
+
+    first.release('awscc_s3_bucket')
+
+    assert lease('awscc_s3_bucket') is None
+    assert second.claim('awscc_s3_bucket') is True
+
+def test_expired_leases_are_taken_over(managers):
+    crashed, survivor = managers('worker-a', ttl_seconds=-10), managers('worker-b')
+    crashed.claim('awscc_s3_bucket')
+
+    assert survivor.claim('awscc_s3_bucket') is True
+    assert lease('awscc_s3_bucket') == {'owner': 'worker-b', 'claims': 2}
+
+def test_release_never_deletes_another_workers_lease(managers):
+    crashed, survivor = managers('worker-a', ttl_seconds=-10), managers('worker-b')
+    crashed.claim('awscc_s3_bucket')
+    survivor.claim('awscc_s3_bucket')
+
+    crashed.release('awscc_s3_bucket')
+
+    assert lease('awscc_s3_bucket')['owner'] == 'worker-b'
+
+def test_renew_extends_held_leases(managers):
+    worker = managers('worker-a')
+    worker.claim('awscc_s3_bucket')
+
+    assert worker.renew() == []
+    assert not worker.lost('awscc_s3_bucket')
+    worker.check('awscc_s3_bucket')
+
+def test_a_lease_lost_on_renewal_is_remembered_until_claimed_again(managers):
+    crashed, survivor = managers('worker-a', ttl_seconds=-10), managers('worker-b')
+    crashed.claim('awscc_s3_bucket')
+    survivor.claim('awscc_s3_bucket')
+
+    assert crashed.renew() == ['awscc_s3_bucket']
+    assert crashed.held() == [] and crashed.lost('awscc_s3_bucket')
+    with pytest.raises(LeaseLost):
+        crashed.check('awscc_s3_bucket')
+
+    survivor.release('awscc_s3_bucket')
+    crashed.ttl_seconds = 600
+    assert crashed.claim('awscc_s3_bucket') is True
+    assert not crashed.lost('awscc_s3_bucket')
+
+def test_a_lease_past_its_expiry_counts_as_lost(managers):
+    worker = managers('worker-a', ttl_seconds=-10)
+    worker.claim('awscc_s3_bucket')
+
+    assert worker.lost('awscc_s3_bucket')
+
+def test_resources_that_were_never_leased_always_pass(managers):
+    worker = managers('worker-a')
+
+    assert not worker.lost('awscc_ec2_vpc')
+    worker.check('awscc_ec2_vpc')
+
+def test_list_leases_marks_expired_leases(managers):
+    managers('worker-a').claim('awscc_s3_bucket')
+    managers('worker-b', ttl_seconds=-10).claim('awscc_ec2_vpc')
+
+    leases = {entry['resource_name']: entry for entry in managers('worker-c').list_leases()}
+
+    assert leases['awscc_s3_bucket']['expired'] is False
+    assert leases['awscc_ec2_vpc']['expired'] is True
+    assert leases['awscc_ec2_vpc']['owner'] == 'worker-b'
@@ -0,0 +1,67 @@
+import importlib
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+import config
+from agents import latest_status, orchestrator_agent
+
+RESOURCE = {'resource_name': 'awscc_s3_bucket', 'provider_version': '1.49.0'}
+
+@pytest.fixture
+def llm_mode(state_table, tmp_path, monkeypatch):
+    """Run _process_in_workspace with the LLM orchestrator replaced by one that stores a given status."""
+    from agents import agent_factory
+
+    @contextmanager
+    def checkout_agent(*args, **kwargs):
+        yield None
+
+    monkeypatch.setattr(config, 'ORCHESTRATOR_MODE', 'llm')
+    monkeypatch.setattr(config, 'WORKSPACE_ROOT', str(tmp_path))
+    monkeypatch.setattr(agent_factory, 'checkout_agent', checkout_agent)
+    monkeypatch.setattr(orchestrator_agent, 'orchestrator_tools', lambda: [])
+
+    def orchestrate(status):
+        def run_resource(resource_name, provider_version, work_dir, agent=None):
+            if status:
+                record = {'resource_name': resource_name, 'timestamp': 4102444800, 'status': status}
+                item = {'resource_name': {'S': resource_name}, 'timestamp': {'N': '4102444800'},
+                        'status': {'S': status}}
+                latest_status.write_with_history(item, record)
+            return "Pipeline finished"
+
+        monkeypatch.setattr(orchestrator_agent, 'run_resource', run_resource)
+        return orchestrator_agent._process_in_workspace(RESOURCE)
+
+    return orchestrate
+
+def test_llm_run_succeeds_only_when_a_success_was_stored(llm_mode, tmp_path):
+    result = llm_mode('success')
+
+    assert result['success'] is True and result['error'] is None
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.parametrize('status, error', [
+    ('failed', 'Pipeline stored status failed'),
+    (None, 'Pipeline stored no result'),
+])
+def test_llm_run_without_a_stored_success_keeps_its_work_dir(llm_mode, tmp_path, status, error):
+    result = llm_mode(status)
+
+    assert result['success'] is False and result['error'] == error
+    assert [str(path) for path in tmp_path.iterdir()] == [result['work_dir']]
+
+def test_an_empty_backlog_exits_like_a_single_run(monkeypatch):
+    # main sets these at import
+    for name in ('AWS_PROFILE', 'AWS_REGION', 'BYPASS_TOOL_CONSENT'):
+        monkeypatch.setenv(name, 'unset')
+    main = importlib.import_module('main')
+    monkeypatch.setattr(main, 'run_batch', lambda max_resources, workers: [])
+    monkeypatch.setattr(sys, 'argv', ['main.py', '--max-resources', '5'])
+
+    with pytest.raises(SystemExit) as exit_info:
+        main.main()
+
+    assert exit_info.value.code == main.EXIT_NO_RESOURCES
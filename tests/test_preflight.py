@@ -0,0 +1,79 @@
+import pytest
+
+from agents import provider_schema
+from agents.hcl import parse_blocks
+from agents.preflight import check_schema
+
+SCHEMA = provider_schema.summarize_resource_schema('awscc_example_firewall', {'block': {
+    'attributes': {
+        'name': {'type': 'string', 'required': True},
+        'id': {'type': 'string', 'computed': True}
+    },
+    'block_types': {
+        'rule': {'nesting_mode': 'list', 'min_items': 1, 'block': {
+            'attributes': {'port': {'type': 'number', 'required': True}}
+        }}
+    }
+}})
+
+@pytest.fixture(autouse=True)
+def schema(monkeypatch):
+    monkeypatch.setattr(provider_schema, 'get_resource_schema',
+                        lambda resource_type, provider_version: SCHEMA if resource_type == SCHEMA['resource_type'] else None)
+
+def findings(code):
+    return [finding.message for finding in check_schema(code, parse_blocks(code), '1.49.0')]
+
+def test_valid_arguments_pass():
+    assert findings('''
+resource "awscc_example_firewall" "example" {
+  name = "example"
+  rule {
+    port = 443
+  }
+}
+''') == []
+
+def test_dynamic_blocks_are_checked_under_their_label():
+    assert findings('''
+resource "awscc_example_firewall" "example" {
+  name = "example"
+  dynamic "rule" {
+    for_each = [80, 443]
+    content {
+      port = rule.value
+    }
+  }
+}
+''') == []
+
+def test_unknown_dynamic_blocks_are_reported_by_name():
+    assert findings('''
+resource "awscc_example_firewall" "example" {
+  name = "example"
+  rule {
+    port = 443
+  }
+  dynamic "rules" {
+    for_each = []
+    content {}
+  }
+}
+''') == ['awscc_example_firewall has no argument "rules"']
+
+def test_unknown_read_only_and_missing_arguments_are_errors():
+    assert findings('''
+resource "awscc_example_firewall" "example" {
+  id   = "fw-1"
+  size = 3
+}
+
+resource "awscc_example_unknown" "example" {
+}
+''') == [
+        'awscc_example_firewall.id is read-only and cannot be set',
+        'awscc_example_firewall has no argument "size"',
+        'awscc_example_firewall is missing required argument "name"',
+        'awscc_example_firewall is missing required argument "rule"',
+        'awscc_example_unknown is not a resource type of awscc 1.49.0',
+    ]
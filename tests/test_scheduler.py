@@ -0,0 +1,92 @@
+import pytest
+
+from agents.scheduler import ResourceScheduler, TokenBucket, parse_rates, service_prefix
+
+def resources(*names, region='us-east-1'):
+    return [{'resource_name': name, 'region': region} for name in names]
+
+def run_in_order(scheduler, items):
+    started = []
+
+    def worker(resource):
+        started.append(resource['resource_name'])
+        return {'resource_name': resource['resource_name'], 'success': True}
+
+    results = scheduler.run(items, worker)
+    return started, results
+
+def test_service_prefix_and_rates():
+    assert service_prefix('awscc_ec2_vpc') == 'ec2'
+    assert service_prefix('awscc_s3_bucket') == 's3'
+    assert service_prefix('aws_instance') == 'default'
+    assert parse_rates('iam=2, ec2=4,,default=6') == {'iam': 2.0, 'ec2': 4.0, 'default': 6.0}
+
+def test_token_bucket_allows_a_burst_then_refills_at_the_rate():
+    bucket = TokenBucket(rate_per_minute=60, burst=2)
+    now = bucket.updated
+
+    for _ in range(2):
+        assert bucket.wait_time(now) == 0
+        bucket.take(now)
+    assert bucket.wait_time(now) == pytest.approx(1.0)
+    assert bucket.wait_time(now + 0.5) == pytest.approx(0.5)
+    assert bucket.wait_time(now + 1.0) == 0
+
+def test_token_bucket_never_holds_more_than_its_burst():
+    bucket = TokenBucket(rate_per_minute=60, burst=2)
+    now = bucket.updated + 3600
+
+    for _ in range(2):
+        bucket.take(now)
+    assert bucket.wait_time(now) == pytest.approx(1.0)
+
+def test_zero_rate_is_unlimited():
+    bucket = TokenBucket(rate_per_minute=0, burst=1)
+    now = bucket.updated
+
+    for _ in range(100):
+        bucket.take(now)
+    assert bucket.wait_time(now) == 0
+
+def test_services_are_taken_round_robin():
+    scheduler = ResourceScheduler(workers=1, service_rates={}, region_rate=0, burst=1)
+    items = resources('awscc_ec2_vpc', 'awscc_ec2_subnet', 'awscc_ec2_eip',
+                      'awscc_iam_role', 'awscc_iam_user', 'awscc_s3_bucket')
+
+    started, _ = run_in_order(scheduler, items)
+
+    assert started == ['awscc_ec2_vpc', 'awscc_iam_role', 'awscc_s3_bucket',
+                       'awscc_ec2_subnet', 'awscc_iam_user', 'awscc_ec2_eip']
+
+def test_a_limited_service_does_not_block_the_others():
+    scheduler = ResourceScheduler(workers=1, service_rates={'iam': 600}, region_rate=0, burst=1)
+    items = resources('awscc_iam_role', 'awscc_iam_user', 'awscc_ec2_vpc', 'awscc_ec2_subnet', 'awscc_ec2_eip')
+
+    started, results = run_in_order(scheduler, items)
+
+    assert started == ['awscc_iam_role', 'awscc_ec2_vpc', 'awscc_ec2_subnet', 'awscc_ec2_eip', 'awscc_iam_user']
+    report = scheduler.report()
+    assert report['iam']['service_limited'] == 1
+    assert report['ec2']['service_limited'] == 0
+    assert report['iam']['completed'] == 2 and report['ec2']['completed'] == 3
+    assert {result['service'] for result in results} == {'iam', 'ec2'}
+
+def test_region_limits_apply_across_services():
+    scheduler = ResourceScheduler(workers=2, service_rates={}, region_rate=600, burst=1)
+    items = resources('awscc_ec2_vpc', 'awscc_iam_role') + resources('awscc_s3_bucket', region='eu-west-1')
+
+    started, _ = run_in_order(scheduler, items)
+
+    assert started.index('awscc_s3_bucket') < started.index('awscc_iam_role')
+    assert scheduler.report()['iam']['region_limited'] == 1
+
+def test_worker_errors_become_failed_results():
+    scheduler = ResourceScheduler(workers=2, service_rates={}, region_rate=0, burst=1)
+
+    def worker(resource):
+        raise RuntimeError('boom')
+
+    results = scheduler.run(resources('awscc_ec2_vpc'), worker)
+
+    assert results[0]['success'] is False and results[0]['error'] == 'boom'
+    assert scheduler.report()['ec2']['failed'] == 1
@@ -0,0 +1,53 @@
+import pytest
+
+import config
+from agents import latest_status, storage_agent
+from agents.agent_factory import get_client
+from agents.leases import LeaseLost, lease_manager
+
+CODE = 'resource "awscc_s3_bucket" "example" {}\n'
+
+@pytest.fixture
+def bucket(state_table, monkeypatch):
+    s3 = get_client('s3')
+    location = {} if config.AWS_REGION == 'us-east-1' else {
+        'CreateBucketConfiguration': {'LocationConstraint': config.AWS_REGION}
+    }
+    s3.create_bucket(Bucket=config.S3_BUCKET, **location)
+    storage_agent.load_generic_template.cache_clear()
+    monkeypatch.setattr(storage_agent.time, 'time', lambda: 1700000000)
+    yield config.S3_BUCKET
+    storage_agent.load_generic_template.cache_clear()
+
+def test_store_results_uploads_files_and_updates_the_pointer(bucket, history):
+    record = storage_agent.store_results(
+        'awscc_s3_bucket', 'success', CODE, provider_version='1.49.0',
+        trace_summary={'terraform_agent': {'tokens': 42}}
+    )
+
+    s3 = get_client('s3')
+    assert record['s3_terraform_link'] == 'examples/resources/awscc_s3_bucket/s3_bucket.tf'
+    assert s3.get_object(Bucket=bucket, Key=record['s3_terraform_link'])['Body'].read().decode() == CODE
+    template = s3.get_object(Bucket=bucket, Key=record['s3_template_link'])['Body'].read().decode()
+    assert 'Basic example' in template
+    latest = latest_status.get_latest('awscc_s3_bucket', consistent=True)
+    assert latest['last_timestamp'] == 1700000000
+    assert latest['provider_version'] == '1.49.0'
+    assert latest['s3_terraform_link'] == record['s3_terraform_link']
+    assert history('awscc_s3_bucket') == [(1700000000, 'success')]
+
+def test_failed_runs_are_stored_under_the_failed_prefix(bucket):
+    record = storage_agent.store_results('awscc_s3_bucket', 'error', CODE)
+
+    assert record['status'] == 'failed'
+    assert record['s3_terraform_link'] == 'failed/resources/awscc_s3_bucket/s3_bucket.tf'
+    assert latest_status.get_latest('awscc_s3_bucket', consistent=True)['status'] == 'failed'
+
+def test_nothing_is_stored_after_the_lease_is_lost(bucket, monkeypatch):
+    monkeypatch.setattr(lease_manager, '_lost', {'awscc_s3_bucket'})
+
+    with pytest.raises(LeaseLost):
+        storage_agent.store_results('awscc_s3_bucket', 'success', CODE)
+
+    assert get_client('s3').list_objects_v2(Bucket=bucket).get('KeyCount') == 0
+    assert latest_status.get_latest('awscc_s3_bucket', consistent=True) is None
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+import config
+from agents import sweeper
+from agents.agent_factory import get_client
+from agents.fixtures import FIXTURE_TAG_KEY
+from agents.sweeper import Candidate, deletion_waves, find_candidates, hold_back
+from agents.terraform_workspace import workspace_pool
+
+def example_tags(name, **extra):
+    tags = {'Environment': 'example', 'Name': name, **extra}
+    return [{'Key': key, 'Value': value} for key, value in tags.items()]
+
+@pytest.fixture
+def network(aws):
+    """A tagged example VPC with subnets and security groups, plus a fixture and an untagged VPC."""
+    ec2 = get_client('ec2', config.AWS_REGION)
+    vpc = ec2.create_vpc(CidrBlock='10.0.0.0/16')['Vpc']['VpcId']
+    ec2.create_tags(Resources=[vpc], Tags=example_tags('example-vpc'))
+    subnets = []
+    for index in range(3):
+        subnet = ec2.create_subnet(VpcId=vpc, CidrBlock=f"10.0.{index}.0/24")['Subnet']['SubnetId']
+        ec2.create_tags(Resources=[subnet], Tags=example_tags(f"example-subnet-{index}"))
+        subnets.append(subnet)
+    group = ec2.create_security_group(GroupName='example-sg', Description='example', VpcId=vpc)['GroupId']
+    ec2.create_tags(Resources=[group], Tags=example_tags('example-sg'))
+
+    fixture_vpc = ec2.create_vpc(CidrBlock='10.1.0.0/16')['Vpc']['VpcId']
+    ec2.create_tags(Resources=[fixture_vpc], Tags=example_tags('example-fixture-vpc', **{FIXTURE_TAG_KEY: 'vpc'}))
+    other_vpc = ec2.create_vpc(CidrBlock='10.2.0.0/16')['Vpc']['VpcId']
+    ec2.create_tags(Resources=[other_vpc], Tags=[{'Key': 'Name', 'Value': 'example-untagged'}])
+    return {'vpc': vpc, 'subnets': subnets, 'group': group, 'fixture_vpc': fixture_vpc, 'other_vpc': other_vpc}
+
+def test_find_candidates_follows_every_page(network, monkeypatch):
+    monkeypatch.setattr(sweeper, 'RESOURCES_PER_PAGE', 2)
+
+    identifiers = {c.identifier for c in find_candidates(config.AWS_REGION)}
+
+    assert identifiers == {network['vpc'], network['group'], *network['subnets']}
+
+def test_find_candidates_skips_fixtures_and_untagged_resources(network):
+    identifiers = {c.identifier for c in find_candidates(config.AWS_REGION)}
+
+    assert network['fixture_vpc'] not in identifiers
+    assert network['other_vpc'] not in identifiers
+
+def test_find_candidates_maps_types_and_ranks(network):
+    candidates = {c.identifier: c for c in find_candidates(config.AWS_REGION)}
+
+    assert candidates[network['vpc']].type_name == 'AWS::EC2::VPC'
+    assert candidates[network['subnets'][0]].type_name == 'AWS::EC2::Subnet'
+    assert candidates[network['group']].type_name == 'AWS::EC2::SecurityGroup'
+    assert all(c.status == 'pending' for c in candidates.values())
+
+def test_deletion_waves_delete_dependents_before_the_vpc(network):
+    waves = deletion_waves(find_candidates(config.AWS_REGION))
+
+    assert [{c.type_name for c in wave} for wave in waves] == [
+        {'AWS::EC2::Subnet', 'AWS::EC2::SecurityGroup'},
+        {'AWS::EC2::VPC'}
+    ]
+
+def test_deletion_waves_order_by_rank_and_skip_settled_candidates():
+    def candidate(name, rank, status='pending'):
+        return Candidate(arn=f"arn:aws:ec2:us-east-1:123456789012:thing/{name}", region='us-east-1',
+                         tags={}, rank=rank, status=status)
+
+    candidates = [candidate('vpc', 3), candidate('instance', 0), candidate('eni', 1),
+                  candidate('subnet', 2), candidate('held', 0, 'too_recent'), candidate('bucket', 0, 'unsupported')]
+
+    waves = deletion_waves(candidates)
+
+    assert [[c.arn.rsplit('/', 1)[1] for c in wave] for wave in waves] == [['instance'], ['eni'], ['subnet'], ['vpc']]
+
+@pytest.fixture
+def sightings(tmp_path, monkeypatch):
+    path = tmp_path / 'sightings.json'
+    monkeypatch.setattr(config, 'SWEEP_SIGHTINGS_FILE', str(path))
+    monkeypatch.setattr(config, 'SWEEP_MIN_AGE_SECONDS', 3600)
+    return path
+
+def test_hold_back_waits_for_the_minimum_age(network, sightings):
+    candidates = find_candidates(config.AWS_REGION)
+    hold_back(candidates, [config.AWS_REGION], now=1000.0)
+    assert {c.status for c in candidates} == {'too_recent'}
+
+    candidates = find_candidates(config.AWS_REGION)
+    hold_back(candidates, [config.AWS_REGION], now=1000.0 + 3600)
+    assert {c.status for c in candidates} == {'pending'}
+
+def test_hold_back_forgets_resources_that_are_gone(sightings):
+    gone = 'arn:aws:ec2:us-east-1:123456789012:vpc/vpc-gone'
+    elsewhere = 'arn:aws:ec2:eu-west-1:123456789012:vpc/vpc-elsewhere'
+    sightings.write_text(json.dumps({gone: 1.0, elsewhere: 1.0}))
+
+    hold_back([], ['us-east-1'], now=5000.0)
+
+    assert json.loads(sightings.read_text()) == {elsewhere: 1.0}
+
+def test_hold_back_keeps_resources_of_checked_out_workspaces(network, sightings, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'SWEEP_MIN_AGE_SECONDS', 0)
+    work_dir = tmp_path / 'workspace'
+    work_dir.mkdir()
+    (work_dir / 'terraform.tfstate').write_text(json.dumps({'resources': [{
+        'type': 'awscc_ec2_subnet',
+        'instances': [{'attributes': {'id': network['subnets'][0], 'vpc_id': network['vpc']}}]
+    }]}))
+    monkeypatch.setattr(workspace_pool, 'active', lambda: [str(work_dir)])
+    candidates = {c.identifier: c for c in find_candidates(config.AWS_REGION)}
+
+    hold_back(list(candidates.values()), [config.AWS_REGION], now=1000.0)
+
+    assert candidates[network['subnets'][0]].status == 'in_use'
+    assert candidates[network['vpc']].status == 'in_use'
+    assert candidates[network['subnets'][1]].status == 'pending'
@@ -0,0 +1,44 @@
+import config
+from agents.terraform_output import filter_terraform_output, summarize_terraform_output
+
+PLAN = '\n'.join(
+    ['Initializing the backend...'] * 200 + [
+        '  # awscc_s3_bucket.example will be created',
+        'awscc_s3_bucket.example: Still creating... [10s elapsed]',
+        'awscc_s3_bucket.example: Creation complete after 12s',
+        'Apply complete! Resources: 1 added, 0 changed, 0 destroyed.'
+    ]
+)
+
+def test_summary_keeps_resource_lines_and_drops_progress():
+    summary = summarize_terraform_output(PLAN, max_chars=6000)
+
+    assert '# awscc_s3_bucket.example will be created' in summary
+    assert 'Creation complete after 12s' in summary
+    assert 'Apply complete!' in summary
+    assert 'Still creating' not in summary
+    assert '[200 lines omitted]' in summary
+
+def test_short_output_is_returned_unchanged(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'TERRAFORM_LOG_DIR', str(tmp_path))
+
+    assert filter_terraform_output('Success! The configuration is valid.', max_chars=100) == \
+        'Success! The configuration is valid.'
+    assert list(tmp_path.iterdir()) == []
+
+def test_an_existing_log_is_referenced_instead_of_written_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'TERRAFORM_LOG_DIR', str(tmp_path))
+
+    filtered = filter_terraform_output(PLAN, max_chars=500, log_path='/logs/apply.log')
+
+    assert filtered.endswith('full log: /logs/apply.log]')
+    assert list(tmp_path.iterdir()) == []
+
+def test_output_without_a_log_is_saved(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'TERRAFORM_LOG_DIR', str(tmp_path))
+
+    filtered = filter_terraform_output(PLAN, max_chars=500)
+
+    [log] = tmp_path.iterdir()
+    assert log.read_text() == PLAN
+    assert filtered.endswith(f"full log: {log}]")